@@ -0,0 +1,93 @@
+"""
+인라인 자동완성 접두 인덱스 벤치마크 (Firestore 불필요)
+
+합성 품목명 N건으로 PrefixIndex 구축 → 사용자가 이름을 한 글자씩 입력하는 질의열
+("벽" → "벽면" → "벽면실" ...)을 최근 질의 캐시 사용/미사용으로 측정. 증분 갱신 비용도 출력.
+
+사용법:
+  python bench/bench_autocomplete.py [--items 100000] [--sessions 500]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_search import make_name, percentile  # noqa: E402
+from utils import search  # noqa: E402
+from utils.search import PrefixIndex, chosung  # noqa: E402
+
+
+def arg(name, default):
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def typing_sessions(rng, names, n):
+    """이름 앞부분을 한 글자씩 입력 (일부는 둘째 단어부터, 일부는 초성)"""
+    sessions = []
+    for _ in range(n):
+        name = rng.choice(names)
+        r = rng.random()
+        if r < 0.2:
+            name = name.split(" ", 1)[1]
+        elif r < 0.3:
+            name = chosung(name)
+        text = name[:rng.randint(3, 8)]
+        sessions.append([text[:i] for i in range(1, len(text) + 1)])
+    return sessions
+
+
+def run(index, sessions, recent: bool):
+    latencies = []
+    for session in sessions:
+        for q in session:
+            if not recent:
+                index._recent.clear()
+            t = time.perf_counter()
+            index.complete(q)
+            latencies.append((time.perf_counter() - t) * 1000)
+    return latencies
+
+
+def main():
+    n_items = arg("--items", 100_000)
+    n_sessions = arg("--sessions", 500)
+    rng = random.Random(42)
+    names = [make_name(rng) for _ in range(n_items)]
+
+    index = PrefixIndex()
+    t0 = time.perf_counter()
+    for i, name in enumerate(names):
+        index.add(f"item-{i}", name)
+    index.flush()
+    print(f"접두 인덱스 구축: {n_items:,}건 → 항목 {index.stats()['entries']:,}개 "
+          f"{time.perf_counter() - t0:.2f}s")
+
+    sessions = typing_sessions(rng, names, n_sessions)
+    n_queries = sum(len(s) for s in sessions)
+    print(f"입력 세션 {n_sessions}개 · 질의 {n_queries:,}건 (글자마다 1건)\n")
+    print(f"{'모드':<14} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}")
+    for label, recent in (("캐시 없음", False), ("최근 질의 캐시", True)):
+        lat = run(index, sessions, recent)
+        print(f"{label:<14} {percentile(lat, 0.5):>9.3f} {percentile(lat, 0.95):>9.3f} "
+              f"{percentile(lat, 0.99):>9.3f} {max(lat):>9.3f}")
+    s = index.stats()
+    print(f"\n(캐시 모드 누적) 재사용 {s['hits']:,} · 좁히기 {s['narrowed']:,} · 배열 탐색 {s['scans']:,}")
+
+    # 증분 갱신: 이름 변경 1건 + 바로 다음 질의 (대기 변경 반영 포함)
+    lat = []
+    for i in range(min(1000, n_items)):
+        doc_id = f"item-{rng.randrange(n_items)}"
+        index.add(doc_id, make_name(rng))
+        t = time.perf_counter()
+        index.complete(rng.choice(names)[:2])
+        lat.append((time.perf_counter() - t) * 1000)
+    print(f"변경 직후 질의 (insort 반영 포함, 1,000회): p50 {percentile(lat, 0.5):.3f}ms · "
+          f"p99 {percentile(lat, 0.99):.3f}ms (재구성 기준 {search.PREFIX_REBUILD}건)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+동시 명령 지연 벤치마크: 블로킹 기준선(원래 핸들러) vs 현재 핸들러
+
+N개 명령(/p, /s, /c)을 한꺼번에 투입해 명령별 완료 지연(투입 → 응답, 앞 명령에 막혀 기다린 시간 포함)
+p50/p99를 비교한다. 메모리 백엔드(loadgen.seed)라 Firebase 불필요.
+
+before: 원래 핸들러의 Firestore 왕복을 루프 스레드에서 동기 실행 — /p, /s 정확명 조회 1회
+        (없으면 전체 스캔 +1), /c 견적·입금·전체견적 3회, 명령마다 system_logs 기록 1회.
+        왕복 지연은 평균 --query-ms 지수분포 샘플 (time.sleep).
+after:  현재 handle_price / handle_stock / handle_client (레플리카·원장에서 응답, 로그는 log_sink 스레드)
+
+사용법:
+  python bench/bench_concurrency.py [--parallel 32] [--query-ms 40] [--rounds 5] [--items 2000] [--seed 7]
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+from bench_search import percentile  # noqa: E402
+from loadgen import FakeContext, FakeUpdate, arg, make_queries, seed  # noqa: E402
+from utils.memory_db import MemoryClient  # noqa: E402
+
+MIX = {"p": 4, "s": 4, "c": 2}
+LOG_WRITES = 1  # 원래 log_command는 명령마다 동기 add 1회
+
+
+def baseline_round_trips(cmd, keyword, names) -> int:
+    if cmd == "c":
+        return 3 + LOG_WRITES
+    return (1 if keyword in names else 2) + LOG_WRITES
+
+
+def make_baseline(names, query_ms, rng):
+    async def command(cmd, keyword):
+        for _ in range(baseline_round_trips(cmd, keyword, names)):
+            time.sleep(rng.expovariate(1 / query_ms) / 1000)  # 루프 스레드에서 블로킹 → 다른 명령 전부 대기
+    return command
+
+
+def make_current(handlers):
+    async def command(cmd, keyword):
+        await handlers[cmd](FakeUpdate(config.MASTER_CHAT_ID), FakeContext(keyword.split()))
+    return command
+
+
+async def run_round(command, queries):
+    # 지연 = 동시 투입 시점 → 명령 완료
+    async def timed(cmd, keyword):
+        await command(cmd, keyword)
+        return (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(timed(cmd, keyword) for cmd, keyword in queries))
+    return results, time.perf_counter() - t0
+
+
+async def bench(modes, rounds):
+    results = {}
+    for label, command in modes:
+        lat, elapsed = [], 0.0
+        for queries in rounds:
+            res, t = await run_round(command, queries)
+            lat.extend(res)
+            elapsed += t
+        results[label] = lat, elapsed
+    return results
+
+
+def main():
+    parallel = arg("--parallel", 32)
+    query_ms = arg("--query-ms", 40.0)
+    n_rounds = arg("--rounds", 5)
+    n_items = arg("--items", 2000)
+    rng = random.Random(arg("--seed", 7))
+
+    client = MemoryClient()
+    config.set_db(client)
+    names, clients = seed(client, rng, n_items, 200, 20_000, 5_000)
+
+    from utils.ledger import start_ledger
+    from utils.log_sink import log_sink
+    from utils.replica import start_replicas
+    watches = start_replicas() + start_ledger()
+    log_sink.start()
+
+    from handlers.client import handle_client
+    from handlers.price import handle_price
+    from handlers.stock import handle_stock
+    from utils.result_cache import result_cache
+    handlers = {"p": handle_price, "s": handle_stock, "c": handle_client}
+
+    rounds = [make_queries(rng, names, clients, MIX, parallel) for _ in range(n_rounds)]
+    name_set = set(names)
+    modes = [("before", make_baseline(name_set, query_ms, random.Random(rng.random()))),
+             ("after", make_current(handlers))]
+    result_cache.clear()
+    results = asyncio.run(bench(modes, rounds))
+
+    print(f"동시 명령 {parallel}개 × {n_rounds}회 (/p:/s:/c = 4:4:2), "
+          f"기준선 Firestore 왕복 평균 {query_ms:g}ms\n")
+    print(f"{'모드':<10} {'p50(ms)':>9} {'p99(ms)':>9} {'처리량(cmd/s)':>14}")
+    for label, (lat, elapsed) in results.items():
+        print(f"{label:<10} {statistics.median(lat):>9.1f} {percentile(lat, 0.99):>9.1f} "
+              f"{len(lat) / elapsed:>14.1f}")
+
+    for w in watches:
+        w.unsubscribe()
+    log_sink.stop()
+
+
+if __name__ == "__main__":
+    main()
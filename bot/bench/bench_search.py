@@ -0,0 +1,88 @@
+"""
+품목 검색 인덱스 벤치마크 (Firestore 불필요)
+
+합성 품목명 N건으로 SearchIndex 구축 후 질의 유형별 지연시간 측정.
+목표: 10만건에서 질의 유형별 p99 1ms 미만 — 결과 표의 "목표" 열에 충족 여부 표시.
+부분 질의는 단어별 첫 조회(길이 버킷 교집합, 캐시 전)도 p99에 포함됨 (단어 20개 × 1회).
+
+사용법:
+  python bench/bench_search.py [--items 100000] [--queries 2000]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.search import SearchIndex, chosung  # noqa: E402
+
+TARGET_P99_MS = 1.0
+
+WORDS = ["벽면", "실험대", "중앙", "흄후드", "시약장", "SUS", "카트", "절연", "테이프", "라텍스",
+         "장갑", "하구병", "비커", "플라스크", "피펫", "원심분리기", "건조기", "항온수조", "3M", "스카치"]
+
+
+def make_name(rng):
+    # 일반명 2~3개 + 모델코드 (예: "벽면 실험대 KS-3021")
+    parts = rng.sample(WORDS, rng.randint(2, 3))
+    code = "".join(rng.choice("ABCDEFGHJKLMNPRSTUVWXYZ") for _ in range(2))
+    return " ".join(parts) + f" {code}-{rng.randint(100, 9999)}"
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    n_items = 100_000
+    n_queries = 2000
+    if "--items" in sys.argv:
+        n_items = int(sys.argv[sys.argv.index("--items") + 1])
+    if "--queries" in sys.argv:
+        n_queries = int(sys.argv[sys.argv.index("--queries") + 1])
+
+    rng = random.Random(42)
+    names = [make_name(rng) for _ in range(n_items)]
+
+    t0 = time.perf_counter()
+    index = SearchIndex()
+    for i, name in enumerate(names):
+        index.add(f"item-{i}", name)
+    print(f"인덱스 구축: {n_items:,}건 {time.perf_counter() - t0:.2f}s")
+
+    def typo(name):
+        chars = list(name.replace(" ", ""))
+        chars[rng.randrange(len(chars))] = "가"
+        return "".join(chars)
+
+    kinds = {
+        "정확명": lambda: rng.choice(names),
+        "부분": lambda: rng.choice(names).split()[0],
+        "띄어쓰기": lambda: rng.choice(names).replace(" ", ""),
+        "오타": lambda: typo(rng.choice(names)),
+        "초성": lambda: chosung(rng.choice(names).split()[0]),
+    }
+
+    print(f"\n{'유형':<8} {'p50(ms)':>8} {'p99(ms)':>8} {'평균결과':>8} {'목표':>6}")
+    missed = []
+    for kind, gen in kinds.items():
+        queries = [gen() for _ in range(n_queries)]
+        lat, hits = [], []
+        for q in queries:
+            t = time.perf_counter()
+            res = index.search(q)
+            lat.append((time.perf_counter() - t) * 1000)
+            hits.append(len(res))
+        p99 = percentile(lat, 0.99)
+        if p99 >= TARGET_P99_MS:
+            missed.append(kind)
+        print(f"{kind:<8} {statistics.median(lat):>8.3f} {p99:>8.3f} "
+              f"{statistics.mean(hits):>8.1f} {'충족' if p99 < TARGET_P99_MS else '미달':>6}")
+    print(f"\n목표 p99 < {TARGET_P99_MS:g}ms: " + (f"미달 — {', '.join(missed)}" if missed else "전 유형 충족"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+폴링 vs 웹훅 — 업데이트 주입 → 응답(sendMessage) 도착 지연 비교 (E2E, 오프라인)
+
+로컬 가짜 Bot API(bench/fake_telegram.py) + 메모리 백엔드로 실제 Application(main.build_app)을 구동.
+/p 요청을 포아송 도착(--rate/s)으로 주입하고 가짜 API가 sendMessage를 받은 시각까지를 잰다.
+--latency-ms: Telegram ↔ 봇 단방향 지연 모사. 웹훅 모드는 잘못된 시크릿 → 403도 확인.
+
+사용법:
+  python bench/bench_webhook.py [--requests 300] [--rate 10] [--latency-ms 20] [--items 2000] [--seed 7]
+"""
+import asyncio
+import logging
+import os
+import random
+import socket
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_STATE_DIR", tempfile.mkdtemp(prefix="golab-webhook-"))
+os.environ.setdefault("MASTER_CHAT_ID", "1000")
+os.environ["UPDATE_CANCEL_SUPERSEDED"] = "0"  # 주입한 요청마다 응답 1건 (취소 없음)
+
+import httpx  # noqa: E402
+
+import config  # noqa: E402
+from fake_telegram import FakeTelegram  # noqa: E402
+from loadgen import arg, make_queries, seed  # noqa: E402
+from main import build_app  # noqa: E402
+from bench_search import percentile  # noqa: E402
+from utils.memory_db import MemoryClient  # noqa: E402
+from utils.webhook import SECRET_HEADER, WebhookServer, serve_webhook  # noqa: E402
+
+TOKEN = "123456:BENCH"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def inject(fake: FakeTelegram, queries, rate, rng) -> list[float]:
+    """포아송 도착으로 주입 → 전 응답 도착 후 요청별 지연(ms)"""
+    base = len(fake.replies)
+    sent = []
+    for _, keyword in queries:
+        sent.append(fake.push(config.MASTER_CHAT_ID, f"/p {keyword}"))
+        await asyncio.sleep(rng.expovariate(rate))
+    await fake.wait_replies(base + len(queries))
+    # 같은 채팅은 도착 순서대로 처리 → i번째 응답 = i번째 요청
+    return [(r[0] - t) * 1000 for r, t in zip(fake.replies[base:], sent)]
+
+
+async def run_polling(fake, queries, rate, rng):
+    app, _ = build_app(TOKEN, fake.base_url)
+    async with app:
+        await app.post_init(app)
+        await app.start()
+        await app.updater.start_polling(poll_interval=0, timeout=10)
+        try:
+            await inject(fake, queries[:5], rate, rng)  # 워밍업
+            latencies = await inject(fake, queries, rate, rng)
+        finally:
+            await app.updater.stop()
+            await app.stop()
+    await app.post_shutdown(app)
+    return latencies
+
+
+async def run_webhook(fake, queries, rate, rng):
+    app, _ = build_app(TOKEN, fake.base_url)
+    port = free_port()
+    server = WebhookServer(app, "bench-secret", port=port)
+    url = f"http://127.0.0.1:{port}{server.path}"
+    stop = asyncio.Event()
+    task = asyncio.create_task(serve_webhook(app, server, url=url, stop=stop))
+    while fake.webhook_url != url:
+        await asyncio.sleep(0.01)
+    try:
+        async with httpx.AsyncClient() as http:
+            res = await http.post(url, json={"update_id": 0}, headers={SECRET_HEADER: "wrong"})
+            assert res.status_code == 403, res.status_code
+            res = await http.post(url, json={"update_id": 0})
+            assert res.status_code == 403, res.status_code
+        await inject(fake, queries[:5], rate, rng)
+        return await inject(fake, queries, rate, rng)
+    finally:
+        stop.set()
+        await task
+        assert server.rejected == 2, server.stats()
+
+
+async def bench(n_requests, rate, latency_ms, n_items, rng):
+    client = MemoryClient()
+    config.set_db(client)
+    names, clients = seed(client, rng, n_items, 50, 0, 0)
+
+    from utils.ledger import start_ledger
+    from utils.replica import start_replicas
+    from utils.result_cache import result_cache
+    watches = start_replicas() + start_ledger()
+
+    queries = make_queries(rng, names, clients, {"p": 1}, n_requests)
+    results = {}
+    for mode, run in (("polling", run_polling), ("webhook", run_webhook)):
+        fake = FakeTelegram(latency_ms)
+        await fake.start()
+        result_cache.clear()
+        try:
+            results[mode] = await run(fake, queries, rate, random.Random(rng.random()))
+        finally:
+            await fake.stop()
+        print(f"{mode}: API 호출 {dict(fake.calls)}")
+
+    for w in watches:
+        w.unsubscribe()
+    return results
+
+
+def main():
+    n_requests = arg("--requests", 300)
+    rate = arg("--rate", 10.0)
+    latency_ms = arg("--latency-ms", 20.0)
+    n_items = arg("--items", 2000)
+    rng = random.Random(arg("--seed", 7))
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    results = asyncio.run(bench(n_requests, rate, latency_ms, n_items, rng))
+
+    print(f"\n/p {n_requests}건 · 도착 {rate:g}/s · 단방향 지연 {latency_ms:g}ms\n")
+    print(f"{'모드':<8} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}")
+    for mode, lat in results.items():
+        print(f"{mode:<8} {percentile(lat, 0.5):>9.1f} {percentile(lat, 0.95):>9.1f} "
+              f"{percentile(lat, 0.99):>9.1f} {max(lat):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
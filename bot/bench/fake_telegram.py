@@ -0,0 +1,173 @@
+"""
+로컬 가짜 Telegram Bot API (벤치/E2E 검증용)
+
+PTB가 사용하는 메서드만: getMe, getUpdates(롱폴링), setWebhook, deleteWebhook,
+sendMessage, sendDocument. 업데이트 주입은 push() — 웹훅이 등록돼 있으면 시크릿 헤더와 함께
+POST로 전달, 아니면 getUpdates 대기열에 넣는다.
+
+latency_ms: 단방향 네트워크 지연 모사 (API 요청 도착·응답 전송, 웹훅 POST 전달에 각각 적용)
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from urllib.parse import parse_qsl
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.webhook import SECRET_HEADER, serve_http  # noqa: E402
+
+BOT_ID = 123456
+
+
+def _decode(value: str):
+    # PTB는 문자열 외 값을 JSON 인코딩해 form으로 보낸다
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+class FakeTelegram:
+    def __init__(self, latency_ms: float = 0.0):
+        self.delay = latency_ms / 1000
+        self.port = None
+        self.webhook_url = None
+        self.webhook_secret = None
+        self.calls = Counter()
+        self.replies: list[tuple[float, int, str]] = []   # (도착 시각, chat_id, text)
+        self._reply_event = asyncio.Event()
+        self._updates: list[dict] = []
+        self._update_event = asyncio.Event()
+        self._next_id = 1
+        self._server = None
+        self._http = None
+        self._deliveries: set[asyncio.Task] = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/bot"
+
+    async def start(self):
+        self._server = await serve_http(self._handle, "127.0.0.1", 0)
+        self.port = self._server.port
+        self._http = httpx.AsyncClient()
+
+    async def stop(self):
+        # 대기 중인 getUpdates 롱폴링 연결까지 취소 후 종료, 웹훅 전달 태스크도 정리
+        for task in self._deliveries:
+            task.cancel()
+        await asyncio.gather(*self._deliveries, return_exceptions=True)
+        await self._server.close()
+        await self._http.aclose()
+
+    # ── 업데이트 주입 ──
+
+    def push(self, chat_id: int, text: str) -> float:
+        """메시지 1건 주입 → 주입 시각 (perf_counter)"""
+        update_id = self._next_id
+        self._next_id += 1
+        command = text.split(maxsplit=1)[0]
+        update = {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "bench"},
+                "text": text,
+                "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}]
+                if command.startswith("/") else [],
+            },
+        }
+        t = time.perf_counter()
+        if self.webhook_url:
+            task = asyncio.create_task(self._deliver(update))
+            self._deliveries.add(task)
+            task.add_done_callback(self._deliveries.discard)
+        else:
+            self._updates.append(update)
+            self._update_event.set()
+        return t
+
+    async def _deliver(self, update: dict):
+        await asyncio.sleep(self.delay)
+        headers = {SECRET_HEADER: self.webhook_secret} if self.webhook_secret else {}
+        res = await self._http.post(self.webhook_url, json=update, headers=headers)
+        res.raise_for_status()
+
+    async def wait_replies(self, n: int, timeout: float = 30):
+        """응답 n건 누적까지 대기"""
+        deadline = time.perf_counter() + timeout
+        while len(self.replies) < n:
+            self._reply_event.clear()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"응답 {len(self.replies)}/{n}건")
+            try:
+                await asyncio.wait_for(self._reply_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    # ── Bot API ──
+
+    async def _handle(self, method, path, headers, body):
+        name = path.split("?")[0].rsplit("/", 1)[-1].lower()
+        ctype = headers.get("content-type", "")
+        if ctype.startswith("application/json"):
+            params = json.loads(body or b"{}")
+        else:
+            params = {k: _decode(v) for k, v in parse_qsl(body.decode("utf-8"))}
+        self.calls[name] += 1
+
+        await asyncio.sleep(self.delay)  # 요청 도착
+        api = getattr(self, f"_api_{name}", None)
+        if api is None:
+            payload = {"ok": False, "error_code": 404, "description": f"Not Found: {name}"}
+        else:
+            payload = {"ok": True, "result": await api(params)}
+        await asyncio.sleep(self.delay)  # 응답 전송
+        return 200, json.dumps(payload).encode("utf-8"), "application/json"
+
+    async def _api_getme(self, params):
+        return {"id": BOT_ID, "is_bot": True, "first_name": "golab", "username": "golab_bench_bot",
+                "can_join_groups": False, "can_read_all_group_messages": False,
+                "supports_inline_queries": True}
+
+    async def _api_setwebhook(self, params):
+        self.webhook_url = params["url"]
+        self.webhook_secret = params.get("secret_token")
+        return True
+
+    async def _api_deletewebhook(self, params):
+        self.webhook_url = None
+        self.webhook_secret = None
+        return True
+
+    async def _api_getupdates(self, params):
+        offset = int(params.get("offset") or 0)
+        timeout = float(params.get("timeout") or 0)
+        self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates and timeout:
+            self._update_event.clear()
+            try:
+                await asyncio.wait_for(self._update_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        limit = int(params.get("limit") or 100)
+        return self._updates[:limit]
+
+    async def _api_sendmessage(self, params):
+        self.replies.append((time.perf_counter(), int(params["chat_id"]), str(params.get("text", ""))))
+        self._reply_event.set()
+        return {"message_id": len(self.replies), "date": int(time.time()),
+                "chat": {"id": int(params["chat_id"]), "type": "private"},
+                "text": str(params.get("text", ""))}
+
+    async def _api_senddocument(self, params):
+        return {"message_id": len(self.replies) + 1, "date": int(time.time()),
+                "chat": {"id": int(params["chat_id"]), "type": "private"}}
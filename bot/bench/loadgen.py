@@ -0,0 +1,224 @@
+"""
+오프라인 부하 생성기 (Firebase 불필요)
+
+메모리 백엔드(utils/memory_db.py)에 합성 items / inventory / quotes / payments 적재 →
+레플리카/원장 적재 → handle_price / handle_stock / handle_client를 가짜 Update로 동시 구동.
+명령별 처리량과 지연 p50/p95/p99, Firestore read 집계를 출력.
+
+질의 구성: /p, /s = 정확명 60% · 부분 20% · 오타 10% · 없음 10%, /c = 거래처명 90% · 없음 10%
+--hot N: 위 구성으로 만든 N개 질의만 반복 (하루 중 같은 질의가 반복되는 패턴 → 응답 캐시 효과)
+--batch N: /p, /s 요청 1건에 품목 N개 ("/p a, b, c" 일괄 조회)
+
+사용법:
+  python bench/loadgen.py [--items 10000] [--clients 500] [--quotes 50000] [--payments 20000]
+                          [--requests 20000] [--concurrency 64] [--mix p=4,s=4,c=2] [--hot 0] [--batch 1] [--seed 7]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+try:
+    import resource  # Unix 전용 — Windows에서는 최대 RSS를 "-"로 표시
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BOT_STATE_DIR", tempfile.mkdtemp(prefix="golab-loadgen-"))
+
+import config  # noqa: E402
+from bench_search import make_name, percentile  # noqa: E402
+from utils import db_cost  # noqa: E402
+from utils.memory_db import MemoryClient  # noqa: E402
+
+CLIENT_WORDS = ["대한", "한국", "서울", "미래", "바이오", "케미칼", "과학", "연구소", "대학교", "병원", "랩", "테크"]
+
+
+def arg(name, default):
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def max_rss_text() -> str:
+    if resource is None:
+        return "-"
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return f"{rss / (1 << 20) if sys.platform == 'darwin' else rss / 1024:,.0f}MB"  # macOS는 바이트, Linux는 KB
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    return {k: int(v) for k, v in (p.split("=") for p in spec.split(","))}
+
+
+# ── 합성 데이터 ──
+
+def seed(client: MemoryClient, rng, n_items, n_clients, n_quotes, n_payments):
+    names = list(dict.fromkeys(make_name(rng) for _ in range(n_items)))
+    clients = list(dict.fromkeys(
+        f"{rng.choice(CLIENT_WORDS)}{rng.choice(CLIENT_WORDS)} {i}" for i in range(n_clients)))
+    now = datetime.now(timezone.utc)
+
+    client.load("items", ((f"item-{i}", {
+        "name": name,
+        "base_price": rng.randrange(1_000, 5_000_000, 100),
+        "last_purchase_price": rng.randrange(1_000, 5_000_000, 100),
+        "currency": "KRW",
+        "unit": rng.choice(["EA", "SET", "BOX"]),
+    }) for i, name in enumerate(names)))
+
+    client.load("inventory", ((f"inv-{i}", {
+        "name": name,
+        "current_qty": rng.randint(0, 200),
+        "min_qty": rng.randint(0, 30),
+        "location": rng.choice(["A동", "B동", "창고"]),
+    }) for i, name in enumerate(names)))
+
+    client.load("quotes", ((f"quote-{i}", {
+        "client_name": rng.choice(clients),
+        "total_amount": rng.randrange(100_000, 50_000_000, 1_000),
+        "created_at": now - timedelta(days=rng.uniform(0, 365)),
+        "items_summary": f"{rng.choice(names)} 외 {rng.randint(0, 9)}건",
+    }) for i in range(n_quotes)))
+
+    client.load("payments", ((f"pay-{i}", {
+        "client_name": rng.choice(clients),
+        "amount": rng.randrange(100_000, 30_000_000, 1_000),
+        "created_at": now - timedelta(days=rng.uniform(0, 365)),
+    }) for i in range(n_payments)))
+    return names, clients
+
+
+# ── 가짜 텔레그램 객체 ──
+
+class FakeMessage:
+    def __init__(self):
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        self.replies.append(text)
+
+
+class FakeChat:
+    def __init__(self, chat_id):
+        self.id = chat_id
+
+
+class FakeUpdate:
+    def __init__(self, chat_id):
+        self.effective_chat = FakeChat(chat_id)
+        self.message = FakeMessage()
+
+
+class FakeContext:
+    def __init__(self, args):
+        self.args = args
+
+
+def make_queries(rng, names, clients, mix, n, hot=0, batch=1):
+    def typo(name):
+        chars = list(name.replace(" ", ""))
+        chars[rng.randrange(len(chars))] = "가"
+        return "".join(chars)
+
+    def item_query():
+        r = rng.random()
+        if r < 0.6:
+            return rng.choice(names)
+        if r < 0.8:
+            return rng.choice(names).split()[0]
+        if r < 0.9:
+            return typo(rng.choice(names))
+        return f"없는품목{rng.randint(0, 10**6)}"
+
+    def client_query():
+        return rng.choice(clients) if rng.random() < 0.9 else f"없는거래처{rng.randint(0, 10**6)}"
+
+    def items_query():
+        return ", ".join(item_query() for _ in range(batch)) if batch > 1 else item_query()
+
+    commands = rng.choices(list(mix), weights=list(mix.values()), k=hot or n)
+    queries = [(cmd, client_query() if cmd == "c" else items_query()) for cmd in commands]
+    return [rng.choice(queries) for _ in range(n)] if hot else queries
+
+
+async def drive(handlers, queries, concurrency):
+    latencies = {cmd: [] for cmd in handlers}
+    it = iter(queries)
+
+    async def worker():
+        for cmd, keyword in it:
+            update = FakeUpdate(config.MASTER_CHAT_ID)
+            t = time.perf_counter()
+            await handlers[cmd](update, FakeContext(keyword.split()))
+            latencies[cmd].append((time.perf_counter() - t) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - t0
+
+
+def main():
+    n_items = arg("--items", 10_000)
+    n_clients = arg("--clients", 500)
+    n_quotes = arg("--quotes", 50_000)
+    n_payments = arg("--payments", 20_000)
+    n_requests = arg("--requests", 20_000)
+    concurrency = arg("--concurrency", 64)
+    mix = parse_mix(arg("--mix", "p=4,s=4,c=2"))
+    hot = arg("--hot", 0)
+    batch = arg("--batch", 1)
+    rng = random.Random(arg("--seed", 7))
+
+    client = MemoryClient()
+    config.set_db(client)
+
+    t0 = time.perf_counter()
+    names, clients = seed(client, rng, n_items, n_clients, n_quotes, n_payments)
+    print(f"합성 데이터: 품목 {len(names):,} · 거래처 {len(clients):,} · 견적 {n_quotes:,} · "
+          f"입금 {n_payments:,} ({time.perf_counter() - t0:.1f}s)")
+
+    from utils.ledger import start_ledger
+    from utils.log_sink import log_sink
+    from utils.replica import start_replicas
+
+    t0 = time.perf_counter()
+    watches = start_replicas() + start_ledger()
+    print(f"레플리카/원장 적재: {time.perf_counter() - t0:.1f}s")
+    log_sink.start()
+
+    from handlers.client import handle_client
+    from handlers.price import handle_price
+    from handlers.stock import handle_stock
+    from utils.result_cache import result_cache
+    handlers = {"p": handle_price, "s": handle_stock, "c": handle_client}
+    handlers = {cmd: handlers[cmd] for cmd in mix}
+
+    queries = make_queries(rng, names, clients, mix, n_requests, hot, batch)
+    reads_before = sum(c.reads for src, c in db_cost.totals().items() if src in handlers)
+
+    latencies, elapsed = asyncio.run(drive(handlers, queries, concurrency))
+
+    total = sum(len(v) for v in latencies.values())
+    print(f"\n요청 {total:,}건, 동시 {concurrency}, {elapsed:.2f}s → {total / elapsed:,.0f} req/s\n")
+    print(f"{'명령':<6} {'건수':>8} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9}")
+    for cmd, lat in list(latencies.items()) + [("all", [x for v in latencies.values() for x in v])]:
+        if lat:
+            print(f"{cmd:<6} {len(lat):>8,} {percentile(lat, 0.5):>9.3f} {percentile(lat, 0.95):>9.3f} "
+                  f"{percentile(lat, 0.99):>9.3f} {max(lat):>9.3f}")
+
+    reads = sum(c.reads for src, c in db_cost.totals().items() if src in handlers) - reads_before
+    cache = result_cache.stats()
+    print(f"\n명령 중 Firestore read: {reads:,}건 · 응답 캐시 적중 {cache['hit_ratio']:.0%} "
+          f"({cache['entries']:,}항목) · 최대 RSS {max_rss_text()}")
+
+    for w in watches:
+        w.unsubscribe()
+    log_sink.stop()
+
+
+if __name__ == "__main__":
+    main()
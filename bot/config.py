@@ -1,10 +1,10 @@
 import os
 import json
+import threading
+from functools import cache
 from pathlib import Path
 
 from dotenv import load_dotenv
-import firebase_admin
-from firebase_admin import credentials, firestore
 
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env")
@@ -12,11 +12,51 @@ load_dotenv(BASE_DIR / ".env")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 MASTER_CHAT_ID = int(os.getenv("MASTER_CHAT_ID", "0"))
 
-# Firebase
-_cred = credentials.Certificate(str(BASE_DIR / "service-account.json"))
-firebase_admin.initialize_app(_cred)
-db = firestore.client()
+# 로컬 상태 파일 (spool, 체크포인트 등)
+STATE_DIR = Path(os.getenv("BOT_STATE_DIR", BASE_DIR / "state"))
 
-# commands.json 로드
-with open(BASE_DIR / "commands.json", encoding="utf-8") as f:
-    COMMANDS = json.load(f)["commands"]
+# 데이터 백엔드 — firestore | memory (utils/backend.py)
+# 최초 get_db() 호출 시 초기화 (import만으로는 자격증명 불필요)
+BOT_BACKEND = os.getenv("BOT_BACKEND", "firestore")
+
+_db = None
+_db_lock = threading.Lock()
+
+
+def get_db():
+    """데이터 백엔드 클라이언트 (읽기/쓰기 비용 계측 래퍼, utils/db_cost.py)"""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                from utils import startup
+                from utils.backend import create_backend
+                from utils.db_cost import InstrumentedClient
+                with startup.phase(f"{BOT_BACKEND} 백엔드 초기화"):
+                    _db = InstrumentedClient(create_backend(BOT_BACKEND))
+    return _db
+
+
+def set_db(client):
+    """백엔드 직접 주입 (벤치/도구) — 레플리카 등이 get_db()를 부르기 전에 호출"""
+    global _db
+    from utils.db_cost import InstrumentedClient
+    with _db_lock:
+        _db = InstrumentedClient(client)
+
+
+@cache
+def load_commands() -> dict:
+    with open(BASE_DIR / "commands.json", encoding="utf-8") as f:
+        commands = json.load(f)
+    # {"commands": {...}} 래핑 / 최상위 맵 (JS 봇과 공유하는 현재 형식) 모두 허용
+    return commands.get("commands", commands)
+
+
+def __getattr__(name):
+    # 기존 `from config import db, COMMANDS` 호환 — 접근 시점에 초기화
+    if name == "db":
+        return get_db()
+    if name == "COMMANDS":
+        return load_commands()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,62 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from utils.auth import master_only
+from utils.ledger import AGING_BUCKETS, client_ledger
+from utils.logger import log_command, CommandTimer, timed
+
+DEFAULT_TOP = 10
+MAX_TOP = 50  # 더 큰 N은 50곳으로 제한
+MAX_MESSAGE = 4096  # 텔레그램 메시지 최대 길이 — 거래처명이 길면 50곳 전에 끊음
+
+
+@master_only
+@timed("ar")
+async def handle_ar(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    top = DEFAULT_TOP
+    if context.args:
+        if not context.args[0].isdigit() or int(context.args[0]) < 1:
+            await update.message.reply_text(f"사용법: /ar [상위 N곳] (최대 {MAX_TOP})")
+            return
+        top = min(int(context.args[0]), MAX_TOP)
+
+    if not client_ledger.ready:
+        await update.message.reply_text("거래 데이터 동기화 중입니다. 잠시 후 다시 시도하세요.")
+        return
+
+    with CommandTimer("ar") as timer:
+        summary = client_ledger.receivables()
+
+    if not summary.clients:
+        log_command("ar", str(top), True, timer.elapsed_ms, "none")
+        await update.message.reply_text("미수금이 없습니다.")
+        return
+
+    with timer.phase("format"):
+        lines = [
+            f"[미수금 요약] 기준일 {summary.as_of:%Y-%m-%d}",
+            f"총 미수: {summary.total:,}원 (거래처 {len(summary.clients)}곳)",
+            "",
+            "경과일별",
+        ]
+        for (_, label), amount in zip(AGING_BUCKETS, summary.buckets):
+            lines.append(f"  {label}: {amount:,}원")
+
+        lines.append("")
+        lines.append(f"상위 {min(top, len(summary.clients))}곳")
+        rows = summary.clients[:top]
+        size = sum(len(line) + 1 for line in lines)
+        for i, row in enumerate(rows, 1):
+            overdue = row.buckets[-1]
+            suffix = f" ({AGING_BUCKETS[-1][1]} {overdue:,})" if overdue else ""
+            line = f"{i}. {row.client_name} | {row.outstanding:,}원{suffix}"
+            size += len(line) + 1
+            if size > MAX_MESSAGE - 20:  # "... 외 N곳" 자리
+                lines.append(f"... 외 {len(rows) - i + 1}곳")
+                break
+            lines.append(line)
+
+    log_command("ar", str(top), True, timer.elapsed_ms,
+                f"clients:{len(summary.clients)} total:{summary.total}")
+    with timer.phase("reply"):
+        await update.message.reply_text("\n".join(lines))
@@ -0,0 +1,66 @@
+import os
+
+from telegram import InlineQueryResultArticle, InputTextMessageContent, Update
+from telegram.ext import ContextTypes
+
+from config import MASTER_CHAT_ID
+from utils.autocomplete import clients_prefix, inventory_prefix, items_prefix
+from utils.ledger import client_ledger
+from utils.logger import CommandTimer, timed
+from utils.metrics import metrics
+from utils.replica import inventory_replica, items_replica
+
+# 인라인 모드는 BotFather /setinline으로 켜야 동작. 채팅이 없으므로 사용자 id로 권한 확인
+INLINE_USERS = {MASTER_CHAT_ID} | {int(u) for u in os.getenv("INLINE_USERS", "").split(",") if u.strip()}
+INLINE_LIMIT = int(os.getenv("INLINE_LIMIT", "10"))             # 범위별 결과 수 (텔레그램 상한 50)
+INLINE_CACHE_TIME = int(os.getenv("INLINE_CACHE_TIME", "30"))   # 텔레그램 서버 측 결과 캐시 (초)
+
+INDEXES = {"p": items_prefix, "s": inventory_prefix, "c": clients_prefix}
+
+
+def _parse(query: str) -> tuple[tuple[str, ...], str]:
+    """"s 벽면" → 재고만, "c 대한" → 거래처만, 그 외 → 품목 + 거래처"""
+    head, _, rest = query.strip().partition(" ")
+    if head.lower() in INDEXES and rest.strip():
+        return (head.lower(),), rest
+    return ("p", "c"), query
+
+
+def _describe(scope: str, doc_id: str, name: str) -> str:
+    if scope == "p":
+        item = items_replica.get(doc_id) or {}
+        price = item.get("base_price", "-")
+        unit = f"{item.get('currency', 'KRW')}/{item.get('unit', 'EA')}"
+        return f"단가 {price:,} {unit}" if isinstance(price, (int, float)) else f"단가 {price}"
+    if scope == "s":
+        inv = inventory_replica.get(doc_id) or {}
+        return f"현재고 {inv.get('current_qty', 0)} · 최소 {inv.get('min_qty', 0)}"
+    agg = client_ledger.get(name)
+    return f"미수 추정 {agg.outstanding:,}원" if agg else "거래처"
+
+
+@timed("inline")
+async def handle_inline(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.inline_query
+    if query.from_user.id not in INLINE_USERS:
+        await query.answer([], cache_time=INLINE_CACHE_TIME, is_personal=True)
+        return
+
+    scopes, keyword = _parse(query.query)
+
+    with CommandTimer("inline") as timer:
+        found = [(scope, doc_id, name) for scope in scopes
+                 for doc_id, name in INDEXES[scope].complete(keyword, INLINE_LIMIT)]
+
+    # 선택 시 해당 명령이 채팅에 입력됨 → 기존 /p, /s, /c 핸들러가 응답
+    with timer.phase("format"):
+        results = [InlineQueryResultArticle(
+            id=f"{scope}:{i}",
+            title=name,
+            description=_describe(scope, doc_id, name),
+            input_message_content=InputTextMessageContent(f"/{scope} {name}"),
+        ) for i, (scope, doc_id, name) in enumerate(found)]
+
+    metrics.inc("lookup_total", command="inline", result="search" if results else "not_found")
+    with timer.phase("reply"):
+        await query.answer(results, cache_time=INLINE_CACHE_TIME, is_personal=True)
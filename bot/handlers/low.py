@@ -0,0 +1,54 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from utils.auth import master_only
+from utils.logger import log_command, CommandTimer, timed
+from utils.low_stock import low_stock_board
+
+PAGE_SIZE = 20
+
+
+@master_only
+@timed("low")
+async def handle_low(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    page = 1
+    if context.args:
+        if not context.args[0].isdigit() or int(context.args[0]) < 1:
+            await update.message.reply_text("사용법: /low [페이지]")
+            return
+        page = int(context.args[0])
+
+    if not low_stock_board.ready:
+        await update.message.reply_text("재고 데이터 동기화 중입니다. 잠시 후 다시 시도하세요.")
+        return
+
+    with CommandTimer("low") as timer:
+        items, total = low_stock_board.page(page, PAGE_SIZE)
+
+    if total == 0:
+        log_command("low", str(page), True, timer.elapsed_ms, "none")
+        await update.message.reply_text("부족 품목이 없습니다.")
+        return
+
+    pages = (total + PAGE_SIZE - 1) // PAGE_SIZE
+    if not items:
+        log_command("low", str(page), False, timer.elapsed_ms, f"page_out_of_range total:{total}")
+        await update.message.reply_text(f"페이지 범위 초과 (전체 {pages}페이지)")
+        return
+
+    with timer.phase("format"):
+        lines = [f"[부족 품목] 총 {total}건 ({page}/{pages})", ""]
+        start = (page - 1) * PAGE_SIZE
+        for i, inv in enumerate(items, start + 1):
+            current = inv.get("current_qty", 0)
+            minimum = inv.get("min_qty", 0)
+            lines.append(f"{i}. {inv.get('name', '?')} | 현재 {current} / 최소 {minimum} "
+                         f"(부족 {minimum - current})")
+        if page < pages:
+            lines.append("")
+            lines.append(f"다음: /low {page + 1}")
+
+    log_command("low", str(page), True, timer.elapsed_ms,
+                f"total:{total} page:{page}", [inv["_id"] for inv in items])
+    with timer.phase("reply"):
+        await update.message.reply_text("\n".join(lines))
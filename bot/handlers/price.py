@@ -1,48 +1,47 @@
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from config import db
 from utils.auth import master_only
-from utils.logger import log_command, CommandTimer
+from utils.batch import BATCH_LIMIT, batch_reply, candidates, split_keywords
+from utils.logger import log_command, CommandTimer, timed
+from utils.metrics import metrics
+from utils.replica import items_replica
+from utils.result_cache import NAMES, CachedReply, result_cache
 
 
-@master_only
-async def handle_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    if not context.args:
-        await update.message.reply_text("사용법: /p [품목명]")
-        return
+def _lookup(keyword: str):
+    """→ (결과 라벨, 품목 | None, 검색 결과)"""
+    item = items_replica.find(keyword)
+    if item:
+        return "exact", item, []
+    matches = items_replica.search(keyword)
+    exact = [d for d, contained in matches if contained]
+    if len(exact) == 1:
+        return "search", exact[0], matches
+    if matches:
+        return ("multiple" if exact else "similar"), None, matches
+    return "not_found", None, []
+
+
+def _amount(value, suffix: str) -> str:
+    return f"{value:,} {suffix}" if isinstance(value, (int, float)) else f"{value}"
 
-    keyword = " ".join(context.args)
 
-    with CommandTimer() as timer:
-        docs = db.collection("items").where("name", "==", keyword).limit(1).stream()
-        item = None
-        for doc in docs:
-            item = doc.to_dict()
-            item["_id"] = doc.id
-            break
-
-        if not item:
-            docs = db.collection("items").stream()
-            matches = []
-            for doc in docs:
-                d = doc.to_dict()
-                if keyword in d.get("name", ""):
-                    d["_id"] = doc.id
-                    matches.append(d)
-            if len(matches) == 1:
-                item = matches[0]
-            elif len(matches) > 1:
-                names = "\n".join(f"  - {m['name']}" for m in matches[:10])
-                await update.message.reply_text(f"여러 품목이 검색됨:\n{names}\n\n정확한 품목명을 입력하세요.")
-                log_command("p", keyword, True, timer.elapsed_ms,
-                            f"multiple_matches:{len(matches)}")
-                return
+def _format(keyword: str, result: str, item: dict | None, matches: list) -> CachedReply:
+    # 품목명이 바뀌면 정확 일치/검색 결과가 달라질 수 있으므로 모든 응답이 NAMES에 의존
+    names_tag = ("items", NAMES)
+
+    if not item and matches:
+        exact = [d for d, contained in matches if contained]
+        names = "\n".join(f"  - {d['name']}" for d, _ in matches)
+        header = "여러 품목이 검색됨" if exact else f"'{keyword}' 유사 품목"
+        return CachedReply(f"{header}:\n{names}\n\n정확한 품목명을 입력하세요.", True,
+                           f"multiple_matches:{len(matches)} exact:{len(exact)}", result, [],
+                           frozenset([names_tag]))
 
     if not item:
-        log_command("p", keyword, False, timer.elapsed_ms, "not_found")
-        await update.message.reply_text(f"'{keyword}' 품목을 찾을 수 없습니다.")
-        return
+        return CachedReply(f"'{keyword}' 품목을 찾을 수 없습니다.", False, "not_found", result, [],
+                           frozenset([names_tag]))
 
     name = item.get("name", "?")
     base_price = item.get("base_price", "-")
@@ -52,11 +51,63 @@ async def handle_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     lines = [
         f"[단가 조회] {name}",
-        f"기준단가: {base_price:,} {currency}/{unit}" if isinstance(base_price, (int, float)) else f"기준단가: {base_price}",
+        f"기준단가: {_amount(base_price, f'{currency}/{unit}')}",
     ]
     if last_purchase is not None:
-        lines.append(f"최근 매입가: {last_purchase:,} {currency}" if isinstance(last_purchase, (int, float)) else f"최근 매입가: {last_purchase}")
+        lines.append(f"최근 매입가: {_amount(last_purchase, currency)}")
+
+    return CachedReply("\n".join(lines), True, f"found:{name}", result, [item["_id"]],
+                       frozenset([names_tag, ("items", item["_id"])]))
+
+
+def _row(keyword: str, result: str, item: dict | None, matches: list) -> tuple[str, set]:
+    """일괄 조회 1행 → (텍스트, 의존 태그)"""
+    names_tag = ("items", NAMES)
+    if not item:
+        return f"{keyword} | {candidates(matches) if matches else '없음'}", {names_tag}
+    currency = item.get("currency", "KRW")
+    last_purchase = item.get("last_purchase_price")
+    cells = [item.get("name", "?"),
+             _amount(item.get("base_price", "-"), f"{currency}/{item.get('unit', 'EA')}"),
+             _amount(last_purchase, currency) if last_purchase is not None else "-"]
+    return " | ".join(cells), {names_tag, ("items", item["_id"])}
+
+
+@master_only
+@timed("p")
+async def handle_price(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not context.args:
+        await update.message.reply_text("사용법: /p [품목명] (여러 품목: /p 품목1, 품목2, ...)")
+        return
+
+    keyword = " ".join(context.args)
+    keywords = split_keywords(keyword, items_replica.has_name)
+    if keywords is not None and not keywords:
+        await update.message.reply_text("사용법: /p [품목명] (여러 품목: /p 품목1, 품목2, ...)")
+        return
+    if keywords and len(keywords) > BATCH_LIMIT:
+        await update.message.reply_text(f"한 번에 최대 {BATCH_LIMIT}개 품목까지 조회할 수 있습니다.")
+        return
+
+    if not items_replica.ready:
+        await update.message.reply_text("품목 데이터 동기화 중입니다. 잠시 후 다시 시도하세요.")
+        return
+
+    with CommandTimer("p") as timer:
+        reply = result_cache.get("p", keyword)
+        if reply is None:
+            token = result_cache.token()
+            found = [(k, *_lookup(k)) for k in keywords] if keywords else _lookup(keyword)
+
+    if reply is None:
+        with timer.phase("format"):
+            if keywords:
+                reply = batch_reply("단가 조회", "품목 | 기준단가 | 최근 매입가", found, _row)
+            else:
+                reply = _format(keyword, *found)
+        result_cache.put("p", keyword, reply, token)
 
-    log_command("p", keyword, True, timer.elapsed_ms,
-                f"found:{name}", [item["_id"]])
-    await update.message.reply_text("\n".join(lines))
+    metrics.inc("lookup_total", command="p", result=reply.result)
+    log_command("p", keyword, reply.success, timer.elapsed_ms, reply.summary, reply.doc_refs)
+    with timer.phase("reply"):
+        await update.message.reply_text(reply.text)
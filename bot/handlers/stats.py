@@ -0,0 +1,97 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from utils import db_cost
+from utils.auth import master_only
+from utils.metrics import metrics
+
+PHASES = ("query", "format", "reply")
+
+
+def _fmt_ms(v: float) -> str:
+    return f"{v:.1f}" if v < 100 else f"{v:,.0f}"
+
+
+@master_only
+async def handle_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    lines = ["[봇 성능 지표]", "", "명령별 지연 (ms, p50/p95/p99, 건수)"]
+
+    latency = sorted(metrics.histogram_summary("command_latency_ms"),
+                     key=lambda row: row[0].get("command", ""))
+    if not latency:
+        lines.append("  (기록 없음)")
+
+    phases = {}
+    for labels, s in metrics.histogram_summary("command_phase_ms"):
+        phases.setdefault(labels.get("command"), {})[labels.get("phase")] = s
+
+    for labels, s in latency:
+        cmd = labels.get("command", "?")
+        lines.append(f"/{cmd}: {_fmt_ms(s['p50'])} / {_fmt_ms(s['p95'])} / {_fmt_ms(s['p99'])} ({s['count']}건)")
+        by_phase = phases.get(cmd, {})
+        parts = [f"{p} {_fmt_ms(by_phase[p]['p95'])}" for p in PHASES if p in by_phase]
+        if parts:
+            lines.append(f"  p95 구간: {' · '.join(parts)}")
+
+    lookups = {}
+    for labels, n in metrics.counters("lookup_total"):
+        lookups.setdefault(labels.get("command"), {})[labels.get("result")] = n
+    if lookups:
+        lines.append("")
+        lines.append("조회 결과")
+        for cmd, results in sorted(lookups.items()):
+            total = sum(results.values())
+            found = results.get("exact", 0) + results.get("search", 0)
+            detail = ", ".join(f"{k} {v}" for k, v in sorted(results.items()))
+            lines.append(f"/{cmd}: 적중 {found / total:.0%} ({detail})")
+
+    costs = db_cost.totals()
+    if costs:
+        lines.append("")
+        lines.append("Firestore 누적 (read / write / query)")
+        for source, c in sorted(costs.items(), key=lambda kv: -kv[1].reads):
+            lines.append(f"  {source}: {c.reads:,} / {c.writes:,} / {c.queries:,}")
+        exceeded = sum(n for _, n in metrics.counters("db_budget_exceeded_total"))
+        if exceeded:
+            lines.append(f"  read 예산 초과: {exceeded}회")
+
+    collected = metrics.collect()
+    replicas = [(k, v) for k, v in collected.items() if k.startswith("replica_")]
+    if replicas:
+        lines.append("")
+        lines.append("레플리카 (문서 / 마지막 동기화 경과)")
+        for name, r in replicas:
+            age = f"{r['staleness_s']}s" if r.get("staleness_s") is not None else "-"
+            lines.append(f"  {r['collection']}: {r['docs']:,}건 / {age}"
+                         + ("" if r.get("ready") else " (적재 중)"))
+
+    cache = collected.get("result_cache")
+    if cache:
+        lines.append("")
+        lines.append(f"응답 캐시: 적중 {cache['hit_ratio']:.0%} ({cache['hits']}/{cache['hits'] + cache['misses']}) "
+                     f"항목 {cache['entries']} · {cache['bytes'] / 1024:,.0f}KB "
+                     f"무효화 {cache['invalidated']} 축출 {cache['evictions']}")
+
+    updates = collected.get("updates")
+    if updates:
+        lines.append("")
+        lines.append(f"업데이트 처리: 대기 {updates['pending']} (채팅 {updates['chats']}) "
+                     f"완료 {updates['processed']} 대체 취소 {updates['superseded']}")
+
+    ac = collected.get("autocomplete")
+    if ac:
+        lines.append(f"자동완성: 품목 {ac['items_names']:,} · 거래처 {ac['clients_names']:,} "
+                     f"재사용 {ac['hits']} 좁히기 {ac['narrowed']} 탐색 {ac['scans']}")
+
+    dispatch = collected.get("dispatch")
+    if dispatch:
+        lines.append("")
+        lines.append(f"알림 큐: 대기 {dispatch['depth']} (최대 {dispatch['max_depth']}) "
+                     f"발송 {dispatch['sent']} 실패 {dispatch['failed']} 폐기 {dispatch['dropped']}")
+
+    sink = collected.get("log_sink")
+    if sink:
+        lines.append(f"로그 기록: 대기 {sink['queued']} 기록 {sink['written']} "
+                     f"스풀 {sink['spooled']} 실패 {sink['failures']}")
+
+    await update.message.reply_text("\n".join(lines))
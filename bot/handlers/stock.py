@@ -1,61 +1,59 @@
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from config import db
 from utils.auth import master_only
-from utils.logger import log_command, CommandTimer
+from utils.batch import BATCH_LIMIT, batch_reply, candidates, split_keywords
+from utils.logger import log_command, CommandTimer, timed
+from utils.metrics import metrics
+from utils.replica import inventory_replica
+from utils.result_cache import NAMES, CachedReply, result_cache
 
 
-@master_only
-async def handle_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    if not context.args:
-        await update.message.reply_text("사용법: /s [품목명]")
-        return
+def _lookup(keyword: str):
+    """→ (결과 라벨, 재고 문서 | None, 검색 결과)"""
+    inv = inventory_replica.find(keyword)
+    if inv:
+        return "exact", inv, []
+    matches = inventory_replica.search(keyword)
+    exact = [d for d, contained in matches if contained]
+    if len(exact) == 1:
+        return "search", exact[0], matches
+    if matches:
+        return ("multiple" if exact else "similar"), None, matches
+    return "not_found", None, []
 
-    keyword = " ".join(context.args)
 
-    with CommandTimer() as timer:
-        docs = db.collection("inventory").where("name", "==", keyword).limit(1).stream()
-        inv = None
-        for doc in docs:
-            inv = doc.to_dict()
-            inv["_id"] = doc.id
-            break
-
-        if not inv:
-            docs = db.collection("inventory").stream()
-            matches = []
-            for doc in docs:
-                d = doc.to_dict()
-                if keyword in d.get("name", ""):
-                    d["_id"] = doc.id
-                    matches.append(d)
-            if len(matches) == 1:
-                inv = matches[0]
-            elif len(matches) > 1:
-                names = "\n".join(f"  - {m['name']}" for m in matches[:10])
-                await update.message.reply_text(f"여러 품목이 검색됨:\n{names}\n\n정확한 품목명을 입력하세요.")
-                log_command("s", keyword, True, timer.elapsed_ms,
-                            f"multiple_matches:{len(matches)}")
-                return
+def _status(inv: dict) -> str:
+    tag = inv.get("status_tag", "")
+    if tag:
+        return tag
+    current = inv.get("current_qty", 0)
+    if current <= 0:
+        return "재고없음"
+    if current <= inv.get("min_qty", 0):
+        return "부족"
+    return "정상"
+
+
+def _format(keyword: str, result: str, inv: dict | None, matches: list) -> CachedReply:
+    names_tag = ("inventory", NAMES)
+
+    if not inv and matches:
+        exact = [d for d, contained in matches if contained]
+        names = "\n".join(f"  - {d['name']}" for d, _ in matches)
+        header = "여러 품목이 검색됨" if exact else f"'{keyword}' 유사 품목"
+        return CachedReply(f"{header}:\n{names}\n\n정확한 품목명을 입력하세요.", True,
+                           f"multiple_matches:{len(matches)} exact:{len(exact)}", result, [],
+                           frozenset([names_tag]))
 
     if not inv:
-        log_command("s", keyword, False, timer.elapsed_ms, "not_found")
-        await update.message.reply_text(f"'{keyword}' 재고 정보를 찾을 수 없습니다.")
-        return
+        return CachedReply(f"'{keyword}' 재고 정보를 찾을 수 없습니다.", False, "not_found", result, [],
+                           frozenset([names_tag]))
 
     name = inv.get("name", "?")
     current = inv.get("current_qty", 0)
     minimum = inv.get("min_qty", 0)
-    tag = inv.get("status_tag", "")
-
-    if not tag:
-        if current <= 0:
-            tag = "재고없음"
-        elif current <= minimum:
-            tag = "부족"
-        else:
-            tag = "정상"
+    tag = _status(inv)
 
     lines = [
         f"[재고 조회] {name}",
@@ -63,7 +61,54 @@ async def handle_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"최소재고: {minimum}",
         f"상태: {tag}",
     ]
+    return CachedReply("\n".join(lines), True, f"found:{name} qty:{current}", result, [inv["_id"]],
+                       frozenset([names_tag, ("inventory", inv["_id"])]))
+
+
+def _row(keyword: str, result: str, inv: dict | None, matches: list) -> tuple[str, set]:
+    """일괄 조회 1행 → (텍스트, 의존 태그)"""
+    names_tag = ("inventory", NAMES)
+    if not inv:
+        return f"{keyword} | {candidates(matches) if matches else '없음'}", {names_tag}
+    cells = [inv.get("name", "?"), str(inv.get("current_qty", 0)), str(inv.get("min_qty", 0)), _status(inv)]
+    return " | ".join(cells), {names_tag, ("inventory", inv["_id"])}
+
+
+@master_only
+@timed("s")
+async def handle_stock(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not context.args:
+        await update.message.reply_text("사용법: /s [품목명] (여러 품목: /s 품목1, 품목2, ...)")
+        return
+
+    keyword = " ".join(context.args)
+    keywords = split_keywords(keyword, inventory_replica.has_name)
+    if keywords is not None and not keywords:
+        await update.message.reply_text("사용법: /s [품목명] (여러 품목: /s 품목1, 품목2, ...)")
+        return
+    if keywords and len(keywords) > BATCH_LIMIT:
+        await update.message.reply_text(f"한 번에 최대 {BATCH_LIMIT}개 품목까지 조회할 수 있습니다.")
+        return
+
+    if not inventory_replica.ready:
+        await update.message.reply_text("재고 데이터 동기화 중입니다. 잠시 후 다시 시도하세요.")
+        return
+
+    with CommandTimer("s") as timer:
+        reply = result_cache.get("s", keyword)
+        if reply is None:
+            token = result_cache.token()
+            found = [(k, *_lookup(k)) for k in keywords] if keywords else _lookup(keyword)
+
+    if reply is None:
+        with timer.phase("format"):
+            if keywords:
+                reply = batch_reply("재고 조회", "품목 | 현재고 | 최소재고 | 상태", found, _row)
+            else:
+                reply = _format(keyword, *found)
+        result_cache.put("s", keyword, reply, token)
 
-    log_command("s", keyword, True, timer.elapsed_ms,
-                f"found:{name} qty:{current}", [inv["_id"]])
-    await update.message.reply_text("\n".join(lines))
+    metrics.inc("lookup_total", command="s", result=reply.result)
+    log_command("s", keyword, reply.success, timer.elapsed_ms, reply.summary, reply.doc_refs)
+    with timer.phase("reply"):
+        await update.message.reply_text(reply.text)
@@ -1,15 +1,127 @@
-import asyncio
-from config import db, MASTER_CHAT_ID
+"""
+견적서 생성 알림 — created_at 워터마크 이후 견적만 감시
 
+워터마크는 로컬 파일에 저장되고, 그 시각까지의 견적이 모두 발송된 뒤에만 전진한다
+(발송 실패/큐 폐기된 견적이 있으면 그 앞에서 멈춤 — 뒤의 견적이 먼저 성공해도 넘지 않음).
+재시작/재구독 시 created_at > 워터마크 쿼리로 다시 구독하므로 과거 견적
+전체를 내려받거나 이미 보낸 알림을 반복하지 않는다 (미발송분은 재전달).
+"""
+import heapq
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+
+from config import get_db, MASTER_CHAT_ID, STATE_DIR
+from utils.dispatch import alert_dispatcher
+from utils.watch import SupervisedWatch
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_FILE = STATE_DIR / "quote_watermark.json"
+
+
+class Watermark:
+    """마지막으로 알림을 보낸 견적의 created_at (파일 영속)"""
+
+    def __init__(self, path=WATERMARK_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.value = self._load()
+
+    def _load(self) -> datetime:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return datetime.fromisoformat(json.load(f)["created_at"])
+        except FileNotFoundError:
+            # 첫 기동: 지금 이후 견적만 알림 (과거 견적 전체 재생 방지)
+            value = datetime.now(timezone.utc)
+            self._save(value)
+            return value
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"[quote_alert] 워터마크 파일 무시, 현재 시각부터 감시: {e}")
+            return datetime.now(timezone.utc)
+
+    def _save(self, value: datetime):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"created_at": value.isoformat()}, f)
+        os.replace(tmp, self.path)
+
+    def advance(self, value):
+        if not isinstance(value, datetime):
+            return
+        with self._lock:
+            if value > self.value:
+                self.value = value
+                self._save(value)
+
+
+class DeliveryTracker:
+    """견적별 발송 상태 → 워터마크는 created_at 순으로 연속 발송된 지점까지만 전진
+
+    queued: 발송 큐에 있음 (재구독 ADDED 중복 제출 방지)
+    unacked: 아직 발송 안 됨 (큐 대기 + 실패) — 워터마크가 이 앞에서 멈춤
+    delivered: 발송했지만 앞선 미발송분 때문에 워터마크가 아직 못 넘은 견적 (재구독 시 재발송 방지)
+    """
+
+    def __init__(self, watermark: Watermark):
+        self.watermark = watermark
+        self._lock = threading.Lock()  # watch 스레드(begin) / 루프(done, fail)
+        self.queued: set[str] = set()
+        self.unacked: set[str] = set()
+        self.delivered: set[str] = set()
+        self._heap: list = []  # (created_at, doc_id) — 미발송 + 워터마크 미통과 발송분
+        self._timed: set[str] = set()  # 힙에 있는 doc_id
+
+    def begin(self, doc_id, created_at) -> bool:
+        """제출할 견적이면 True (이미 큐에 있거나 발송 완료면 False)"""
+        with self._lock:
+            if doc_id in self.queued or doc_id in self.delivered:
+                return False
+            self.queued.add(doc_id)
+            if doc_id not in self.unacked:
+                self.unacked.add(doc_id)
+                if isinstance(created_at, datetime):
+                    heapq.heappush(self._heap, (created_at, doc_id))
+                    self._timed.add(doc_id)
+            return True
+
+    def done(self, doc_id):
+        with self._lock:
+            self.queued.discard(doc_id)
+            self.unacked.discard(doc_id)
+            if doc_id not in self._timed:
+                return  # created_at 없는 견적 — 워터마크와 무관
+            self.delivered.add(doc_id)
+            # 가장 오래된 미발송분 앞까지 워터마크 전진
+            while self._heap and self._heap[0][1] in self.delivered:
+                created_at, delivered_id = heapq.heappop(self._heap)
+                self._timed.discard(delivered_id)
+                self.delivered.discard(delivered_id)
+                self.watermark.advance(created_at)
+
+    def fail(self, doc_id):
+        """발송 실패/폐기 → 다음 ADDED(재구독·재시작)에 다시 제출, 워터마크는 계속 이 앞에서 멈춤"""
+        with self._lock:
+            self.queued.discard(doc_id)
+
+
+def start_quote_listener(bot, watermark: Watermark | None = None):
+    watermark = watermark or Watermark()
+    tracker = DeliveryTracker(watermark)
 
-def start_quote_listener(bot):
     def on_snapshot(doc_snapshots, changes, read_time):
         for change in changes:
             if change.type.name == "ADDED":
+                doc_id = change.document.id
                 doc = change.document.to_dict()
                 client = doc.get("client_name", "?")
                 amount = doc.get("total_amount", 0)
-                date = doc.get("created_at", "?")
+                created_at = doc.get("created_at")
+                date = created_at if created_at is not None else "?"
                 if hasattr(date, "strftime"):
                     date = date.strftime("%Y-%m-%d")
                 items = doc.get("items_summary", "")
@@ -23,16 +135,26 @@ def start_quote_listener(bot):
                     f"품목: {items}"
                 )
 
-                loop = asyncio.get_event_loop()
-                coro = bot.send_message(chat_id=MASTER_CHAT_ID, text=text)
+                # 단계별 발송 — 문서에서 flood limit이 나도 메시지는 다시 보내지 않음
+                async def send_text(text=text):
+                    await bot.send_message(chat_id=MASTER_CHAT_ID, text=text)
+
+                async def send_pdf(pdf=pdf):
+                    await bot.send_document(chat_id=MASTER_CHAT_ID, document=pdf)
+
+                send = [send_text, send_pdf] if pdf else [send_text]
 
-                if pdf:
-                    async def send_with_pdf():
-                        await bot.send_message(chat_id=MASTER_CHAT_ID, text=text)
-                        await bot.send_document(chat_id=MASTER_CHAT_ID, document=pdf)
-                    coro = send_with_pdf()
+                if not tracker.begin(doc_id, created_at):
+                    continue
+                if not alert_dispatcher.submit(send, on_done=lambda doc_id=doc_id: tracker.done(doc_id),
+                                               on_fail=lambda doc_id=doc_id: tracker.fail(doc_id)):
+                    tracker.fail(doc_id)
 
-                asyncio.run_coroutine_threadsafe(coro, loop)
+    def subscribe():
+        # 재구독마다 현재 워터마크로 쿼리 재구성 → 끊긴 지점부터 재개
+        query = (get_db().collection("quotes")
+                 .where("created_at", ">", watermark.value)
+                 .order_by("created_at"))
+        return query.on_snapshot(on_snapshot)
 
-    query = db.collection("quotes")
-    return query.on_snapshot(on_snapshot)
+    return SupervisedWatch("quotes", subscribe).start()
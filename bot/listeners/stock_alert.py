@@ -1,28 +1,114 @@
-import asyncio
-from config import db, MASTER_CHAT_ID
+"""
+재고 경고 — 품목별 상태 머신 (OK → LOW → OUT), 상태 전이 시에만 알림
+
+inventory 레플리카의 변경 delta를 구독. 상태는 로컬 파일에 체크포인트되어
+재시작 시 이미 알린 부족 품목을 다시 알리지 않는다. 대량 재고 반영 시에도
+알림 수 = 상태가 나빠진 품목 수 (쓰기 횟수와 무관).
+"""
+import json
+import logging
+import os
+
+from config import MASTER_CHAT_ID, STATE_DIR
+from utils.dispatch import alert_dispatcher
+from utils.replica import inventory_replica
+
+logger = logging.getLogger(__name__)
+
+OK, LOW, OUT = "OK", "LOW", "OUT"
+_SEVERITY = {OK: 0, LOW: 1, OUT: 2}
+_LABEL = {LOW: "부족", OUT: "재고없음"}
+
+# 회복 판정 여유분: LOW → OK는 현재고 > 최소재고 + H, OUT → LOW는 현재고 > H
+STOCK_ALERT_HYSTERESIS = float(os.getenv("STOCK_ALERT_HYSTERESIS", "0"))
+STATE_FILE = STATE_DIR / "stock_alert_state.json"
+
+
+def classify(current, minimum, prev: str | None, hysteresis: float = 0) -> str:
+    """현재고/최소재고 → 상태 (/s 상태 태그와 동일 기준: <=0 재고없음, <=최소 부족)"""
+    if current <= 0 or (prev == OUT and current <= hysteresis):
+        return OUT
+    if current <= minimum or (prev in (LOW, OUT) and current <= minimum + hysteresis):
+        return LOW
+    return OK
+
+
+class StockAlerts:
+    def __init__(self, bot, replica=inventory_replica, state_path=STATE_FILE,
+                 hysteresis: float = STOCK_ALERT_HYSTERESIS):
+        self.bot = bot
+        self.replica = replica
+        self.state_path = state_path
+        self.hysteresis = hysteresis
+        self.states: dict[str, str] = self._load()
+        self._dirty = False
+        self.alerts = 0
+
+    def _load(self) -> dict[str, str]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[stock_alert] 상태 파일 무시: {e}")
+            return {}
+
+    def checkpoint(self, read_time=None):
+        if not self._dirty:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.states, f, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
+        self._dirty = False
+
+    def on_change(self, doc_id, old, new):
+        if new is None:
+            if self.states.pop(doc_id, None) is not None:
+                self._dirty = True
+            return
+
+        prev = self.states.get(doc_id)
+        current = new.get("current_qty", 0)
+        minimum = new.get("min_qty", 0)
+        state = classify(current, minimum, prev, self.hysteresis)
+        if state == prev:
+            return
+        self.states[doc_id] = state
+        self._dirty = True
+
+        # 최초 적재 중 처음 보는 품목은 상태만 기록 (첫 기동 시 기존 부족 품목 일괄 알림 방지)
+        if prev is None and not self.replica.ready:
+            return
+        if _SEVERITY[state] > _SEVERITY[prev or OK]:
+            self._alert(new.get("name", "?"), current, minimum, state)
+
+    def _alert(self, name, current, minimum, state):
+        text = (
+            f"[재고 경고] {_LABEL[state]}\n"
+            f"품목: {name}\n"
+            f"현재고: {current}\n"
+            f"최소재고: {minimum}\n"
+            f"부족수량: {minimum - current}"
+        )
+
+        async def send():
+            await self.bot.send_message(chat_id=MASTER_CHAT_ID, text=text)
+
+        self.alerts += 1
+        alert_dispatcher.submit(send)
+
+    def unsubscribe(self):
+        self.replica.remove_listener(self.on_change)
+        self.replica.remove_listener(self.checkpoint)
+        self.checkpoint()
 
 
 def start_stock_listener(bot):
-    def on_snapshot(doc_snapshots, changes, read_time):
-        for change in changes:
-            if change.type.name == "MODIFIED":
-                doc = change.document.to_dict()
-                name = doc.get("name", "?")
-                current = doc.get("current_qty", 0)
-                minimum = doc.get("min_qty", 0)
-
-                if current < minimum:
-                    text = (
-                        f"[재고 경고]\n"
-                        f"품목: {name}\n"
-                        f"현재고: {current}\n"
-                        f"최소재고: {minimum}\n"
-                        f"부족수량: {minimum - current}"
-                    )
-
-                    loop = asyncio.get_event_loop()
-                    coro = bot.send_message(chat_id=MASTER_CHAT_ID, text=text)
-                    asyncio.run_coroutine_threadsafe(coro, loop)
-
-    query = db.collection("inventory")
-    return query.on_snapshot(on_snapshot)
+    """inventory 레플리카 구독 — 레플리카 시작(start_replicas) 전에 호출해야 최초 적재분을 반영"""
+    alerts = StockAlerts(bot)
+    inventory_replica.add_listener(alerts.on_change)
+    inventory_replica.add_batch_listener(alerts.checkpoint)
+    return alerts
@@ -1,16 +1,30 @@
 import asyncio
-import json
+import importlib
 import logging
-from pathlib import Path
+import os
+import re
+import signal
+import sys
+import threading
 
-from telegram.ext import ApplicationBuilder, CommandHandler
+from utils import startup
 
-from config import TELEGRAM_TOKEN, COMMANDS
-from handlers.price import handle_price
-from handlers.stock import handle_stock
-from handlers.client import handle_client
+startup.install()  # BOT_PROFILE_STARTUP=1 → 이후 import 시간 측정
+
+from telegram.ext import ApplicationBuilder, CommandHandler, InlineQueryHandler
+
+from config import TELEGRAM_TOKEN, load_commands
 from listeners.quote_alert import start_quote_listener
 from listeners.stock_alert import start_stock_listener
+from utils import autocomplete
+from utils.dispatch import alert_dispatcher
+from utils.ledger import client_ledger, payments_replica, quotes_replica, start_ledger
+from utils.log_sink import log_sink
+from utils.metrics import metrics, start_metrics_server
+from utils.replica import inventory_replica, items_replica, start_replicas
+from utils.result_cache import result_cache
+from utils.update_processor import ChatOrderedProcessor
+from utils.webhook import WebhookServer, serve_webhook, webhook_secret
 
 logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s",
@@ -18,31 +32,145 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# handler 키 → "모듈:함수" (첫 호출 시 import)
 HANDLER_MAP = {
-    "price": handle_price,
-    "stock": handle_stock,
-    "client": handle_client,
+    "price": "handlers.price:handle_price",
+    "stock": "handlers.stock:handle_stock",
+    "client": "handlers.client:handle_client",
+    "customer": "handlers.client:handle_client",  # commands.json 키 (JS 봇과 동일)
+    "low": "handlers.low:handle_low",
+    "ar": "handlers.ar:handle_ar",
+    "stats": "handlers.stats:handle_stats",
 }
 
+# 텔레그램 봇 명령어 규칙: 소문자/숫자/_ 1~32자 ("/단가" 등 한글 alias는 등록 불가)
+_VALID_COMMAND = re.compile(r"^[a-z0-9_]{1,32}$")
+
+
+def command_names(cmd_name: str, cmd_cfg: dict) -> list[str]:
+    """명령어 키 + aliases 중 텔레그램에 등록 가능한 이름"""
+    names = [cmd_name] + [a.lstrip("/").lower() for a in cmd_cfg.get("aliases", [])]
+    return list(dict.fromkeys(n for n in names if _VALID_COMMAND.match(n)))
+
+
+def lazy_handler(spec: str):
+    """"모듈:함수" → 첫 호출 시 모듈을 import하는 핸들러"""
+    module, _, attr = spec.partition(":")
+    resolved = None
+
+    async def handler(update, context):
+        nonlocal resolved
+        if resolved is None:
+            resolved = getattr(importlib.import_module(module), attr)
+        return await resolved(update, context)
+
+    handler.__name__ = attr
+    return handler
+
+
+def register_collectors(processor: ChatOrderedProcessor):
+    """기존 모듈 stats() → /stats, /metrics 조회 시점에 수집"""
+    for r in (items_replica, inventory_replica, quotes_replica, payments_replica):
+        metrics.register_collector(f"replica_{r.collection}", r.stats)
+    metrics.register_collector("ledger", client_ledger.stats)
+    metrics.register_collector("dispatch", alert_dispatcher.stats)
+    metrics.register_collector("log_sink", log_sink.stats)
+    metrics.register_collector("result_cache", result_cache.stats)
+    metrics.register_collector("updates", processor.stats)
+    metrics.register_collector("autocomplete", autocomplete.stats)
+
+
+async def _post_init(app):
+    # 애플리케이션 루프 캡처 → watch 스레드 알림을 이 루프에서 발송
+    await alert_dispatcher.start()
 
-def main():
-    app = ApplicationBuilder().token(TELEGRAM_TOKEN).build()
 
-    for cmd_name, cmd_cfg in COMMANDS.items():
+async def _post_shutdown(app):
+    await alert_dispatcher.stop()
+    logger.info(f"알림 발송 큐 종료 {alert_dispatcher.stats()}")
+
+
+def start_data_layer(bot, watches: list):
+    """Firestore 초기화 + 레플리카/리스너 시작 — 별도 스레드 (run_polling을 막지 않음)
+
+    적재 전 명령은 각 핸들러가 "동기화 중"으로 응답한다. 실패 시 프로세스 종료.
+    """
+    try:
+        with startup.phase("레플리카 적재 (items, inventory, quotes, payments)"):
+            watches.extend(start_replicas())
+            watches.extend(start_ledger())
+            autocomplete.warm()
+        logger.info("인메모리 레플리카 적재 완료 (items, inventory, quotes, payments)")
+
+        watches.append(start_quote_listener(bot))
+        logger.info("Firestore 리스너 시작 (quotes, inventory)")
+    except Exception:
+        logger.exception("데이터 계층 시작 실패 — 종료")
+        os.kill(os.getpid(), signal.SIGTERM)
+        return
+    startup.report("데이터 계층 준비")
+
+
+def build_app(token: str = TELEGRAM_TOKEN, base_url: str | None = None):
+    """Application 구성 + 명령어 등록 → (app, processor). base_url: 로컬 가짜 Bot API 등"""
+    # 채팅별 순서 보장 + 동시 처리 (utils/update_processor.py)
+    processor = ChatOrderedProcessor()
+
+    builder = (ApplicationBuilder()
+               .token(token)
+               .concurrent_updates(processor)
+               .post_init(_post_init)
+               .post_shutdown(_post_shutdown))
+    if base_url:
+        builder = builder.base_url(base_url)
+    app = builder.build()
+
+    for cmd_name, cmd_cfg in load_commands().items():
         handler_key = cmd_cfg["handler"]
         if handler_key in HANDLER_MAP:
-            app.add_handler(CommandHandler(cmd_name, HANDLER_MAP[handler_key]))
-            logger.info(f"명령어 등록: /{cmd_name} → {handler_key}")
+            names = command_names(cmd_name, cmd_cfg)
+            app.add_handler(CommandHandler(names, lazy_handler(HANDLER_MAP[handler_key])))
+            logger.info(f"명령어 등록: {', '.join('/' + n for n in names)} → {handler_key}")
+    # 인라인 자동완성 (@봇 벽면) — commands.json 명령이 아니므로 별도 등록
+    app.add_handler(InlineQueryHandler(lazy_handler("handlers.inline:handle_inline")))
+    return app, processor
+
+
+def main(webhook: bool = False):
+    with startup.phase("애플리케이션 구성"):
+        app, processor = build_app()
+        server = WebhookServer(app, webhook_secret()) if webhook else None
+
+    log_sink.start()
+    register_collectors(processor)
+    if server:
+        metrics.register_collector("webhook", server.stats)
+    start_metrics_server()
 
     bot = app.bot
-    quote_unsub = start_quote_listener(bot)
-    stock_unsub = start_stock_listener(bot)
-    logger.info("Firestore 리스너 시작 (quotes, inventory)")
+    # 재고 경고는 inventory 레플리카 구독 → 레플리카 시작 전에 등록
+    stock_alerts = start_stock_listener(bot)
+
+    watches = []
+    threading.Thread(target=start_data_layer, args=(bot, watches),
+                     name="data-layer", daemon=True).start()
 
-    logger.info("GOLAB Bot v1.1 가동")
-    app.run_polling()
+    logger.info(f"GOLAB Bot v1.1 가동 ({'webhook' if webhook else 'polling'})")
+    startup.report("webhook 진입" if webhook else "run_polling 진입")
+    startup.uninstall()
+    try:
+        if server:
+            asyncio.get_event_loop().run_until_complete(serve_webhook(app, server))
+        else:
+            app.run_polling()
+    finally:
+        for w in watches:
+            w.unsubscribe()
+        stock_alerts.unsubscribe()
+        log_sink.stop()
+        logger.info(f"system_logs 기록기 종료 {log_sink.stats()}")
 
 
 if __name__ == "__main__":
     asyncio.set_event_loop(asyncio.new_event_loop())
-    main()
+    main(webhook="--webhook" in sys.argv)
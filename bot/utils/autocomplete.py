@@ -0,0 +1,77 @@
+"""
+인라인 질의 자동완성 인덱스 — 품목(items) / 재고(inventory) / 거래처명
+
+레플리카 listener로 증분 갱신. 거래처명은 별도 컬렉션이 없으므로 견적/입금 문서의
+client_name 참조 수로 추적 (0이 되면 제거). import 시점에 이미 적재된 문서로 시드 →
+lazy import여도 누락 없음.
+"""
+import threading
+
+from utils.ledger import payments_replica, quotes_replica
+from utils.replica import Replica, inventory_replica, items_replica
+from utils.search import PrefixIndex
+
+items_prefix = PrefixIndex()
+inventory_prefix = PrefixIndex()
+clients_prefix = PrefixIndex()  # id = 거래처명
+
+_client_refs: dict[str, int] = {}
+_client_lock = threading.Lock()
+
+
+def _watch_named(replica: Replica, index: PrefixIndex):
+    def on_change(doc_id, old, new):
+        name = (new or {}).get("name")
+        if name:
+            index.add(doc_id, name)
+        else:
+            index.remove(doc_id)
+
+    with replica.lock:
+        for doc in replica.docs():
+            on_change(doc["_id"], None, doc)
+        replica.add_listener(on_change)
+
+
+def _on_client_ref(doc_id, old, new):
+    old_name = (old or {}).get("client_name")
+    new_name = (new or {}).get("client_name")
+    if old_name == new_name:
+        return
+    with _client_lock:
+        if old_name and old_name in _client_refs:
+            _client_refs[old_name] -= 1
+            if not _client_refs[old_name]:
+                del _client_refs[old_name]
+                clients_prefix.remove(old_name)
+        if new_name:
+            _client_refs[new_name] = _client_refs.get(new_name, 0) + 1
+            if _client_refs[new_name] == 1:
+                clients_prefix.add(new_name, new_name)
+
+
+def _watch_clients():
+    with quotes_replica.lock, payments_replica.lock:
+        for replica in (quotes_replica, payments_replica):
+            for doc in replica.docs():
+                _on_client_ref(doc["_id"], None, doc)
+            replica.add_listener(_on_client_ref)
+
+
+def warm():
+    """적재 직후 정렬 배열 구성 (첫 인라인 질의 지연 방지)"""
+    for index in (items_prefix, inventory_prefix, clients_prefix):
+        index.flush()
+
+
+def stats() -> dict:
+    parts = {"items": items_prefix, "inventory": inventory_prefix, "clients": clients_prefix}
+    out = {f"{k}_names": len(v) for k, v in parts.items()}
+    for key in ("hits", "narrowed", "scans"):
+        out[key] = sum(v.stats()[key] for v in parts.values())
+    return out
+
+
+_watch_named(items_replica, items_prefix)
+_watch_named(inventory_replica, inventory_prefix)
+_watch_clients()
@@ -0,0 +1,90 @@
+"""
+데이터 백엔드 인터페이스 — 핸들러/리스너/레플리카가 사용하는 Firestore 부분집합
+
+firestore.Client와 utils.memory_db.MemoryClient가 이 형태를 만족한다.
+config.get_db()가 BOT_BACKEND (firestore | memory)에 따라 생성하고,
+도구/벤치는 config.set_db()로 직접 주입할 수 있다.
+"""
+from typing import Any, Callable, Iterator, Protocol
+
+# callback(doc_snapshots, changes, read_time) — change.type.name: ADDED | MODIFIED | REMOVED
+SnapshotCallback = Callable[[Any, list, Any], None]
+
+
+class Snapshot(Protocol):
+    id: str
+
+    @property
+    def exists(self) -> bool: ...
+
+    def to_dict(self) -> dict | None: ...
+
+
+class Watch(Protocol):
+    @property
+    def is_active(self) -> bool: ...
+
+    def unsubscribe(self) -> None: ...
+
+
+class Query(Protocol):
+    def where(self, field: str, op: str, value) -> "Query": ...
+
+    def order_by(self, field: str, direction: str = "ASCENDING") -> "Query": ...
+
+    def limit(self, n: int) -> "Query": ...
+
+    def stream(self) -> Iterator[Snapshot]: ...
+
+    def get(self) -> list[Snapshot]: ...
+
+    def on_snapshot(self, callback: SnapshotCallback) -> Watch: ...
+
+
+class DocumentRef(Protocol):
+    id: str
+
+    def get(self) -> Snapshot: ...
+
+    def set(self, data: dict, merge: bool = False) -> Any: ...
+
+    def update(self, data: dict) -> Any: ...
+
+    def delete(self) -> Any: ...
+
+
+class Collection(Query, Protocol):
+    def document(self, doc_id: str | None = None) -> DocumentRef: ...
+
+    def add(self, data: dict) -> tuple[Any, DocumentRef]: ...
+
+
+class WriteBatch(Protocol):
+    def set(self, ref: DocumentRef, data: dict, merge: bool = False) -> Any: ...
+
+    def update(self, ref: DocumentRef, data: dict) -> Any: ...
+
+    def delete(self, ref: DocumentRef) -> Any: ...
+
+    def commit(self) -> Any: ...
+
+
+class Backend(Protocol):
+    def collection(self, path: str) -> Collection: ...
+
+    def batch(self) -> WriteBatch: ...
+
+
+def create_backend(name: str) -> Backend:
+    """BOT_BACKEND 값 → 클라이언트 (firestore는 자격증명 필요, memory는 프로세스 내 가짜)"""
+    if name == "memory":
+        from utils.memory_db import MemoryClient
+        return MemoryClient()
+    if name == "firestore":
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+
+        from config import BASE_DIR
+        app = firebase_admin.initialize_app(credentials.Certificate(str(BASE_DIR / "service-account.json")))
+        return firestore.client(app)
+    raise ValueError(f"알 수 없는 BOT_BACKEND: {name}")
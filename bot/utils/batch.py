@@ -0,0 +1,50 @@
+"""
+다품목 일괄 조회 (/p a, b, c · /s a, b, c)
+
+쉼표로 구분된 품목을 레플리카에서 한 번에 조회하고 표 형식 응답 1건으로 돌려준다.
+입력 전체가 품목명과 정확히 같으면 쉼표가 있어도 단건 조회 (쉼표 들어간 품목명 / 인라인 자동완성).
+조회는 인메모리(레플리카)라 품목 수와 무관하게 Firestore 왕복 0회, 응답은 전체 키워드
+문자열 단위로 result_cache에 저장 (태그 = 품목별 태그 합집합).
+"""
+import os
+
+from utils.result_cache import CachedReply
+
+BATCH_LIMIT = int(os.getenv("BATCH_LIMIT", "30"))  # 1회 최대 품목 수 (응답 4096자 제한 고려)
+CANDIDATES_SHOWN = 3
+
+
+def split_keywords(keyword: str, is_name=None) -> list[str] | None:
+    """쉼표 구분 → 품목 목록 (중복 제거, 순서 유지). 쉼표 없으면 None (단건 조회)
+
+    is_name(keyword)가 참이면 (쉼표가 들어간 품목명 정확 일치) 나누지 않고 None.
+    """
+    if "," not in keyword or (is_name and is_name(keyword)):
+        return None
+    keywords = [" ".join(k.split()) for k in keyword.split(",")]
+    return list(dict.fromkeys(k for k in keywords if k))
+
+
+def candidates(matches: list) -> str:
+    names = [d["name"] for d, _ in matches[:CANDIDATES_SHOWN]]
+    more = f" 외 {len(matches) - len(names)}" if len(matches) > len(names) else ""
+    return f"후보: {', '.join(names)}{more}"
+
+
+def batch_reply(title: str, header: str, rows: list, row_fn) -> CachedReply:
+    """rows: [(키워드, 결과 라벨, 문서 | None, 검색 결과)], row_fn(...) → (행 텍스트, 태그 set)"""
+    lines = [f"[{title}] {len(rows)}건", header]
+    tags = set()
+    doc_refs = []
+    for i, (keyword, result, doc, matches) in enumerate(rows, 1):
+        text, row_tags = row_fn(keyword, result, doc, matches)
+        lines.append(f"{i}. {text}")
+        tags |= row_tags
+        if doc:
+            doc_refs.append(doc["_id"])
+
+    found = len(doc_refs)
+    if found < len(rows):
+        lines.append(f"\n찾음 {found} · 확인 필요 {len(rows) - found}")
+    return CachedReply("\n".join(lines), found > 0, f"batch:{len(rows)} found:{found}", "batch",
+                       doc_refs, frozenset(tags))
@@ -0,0 +1,261 @@
+"""
+Firestore 읽기/쓰기 비용 계측
+
+config.db를 얇은 래퍼로 감싸 문서 읽기/쓰기, 쿼리 수를 센다.
+- 명령 실행 중 (timed → track): contextvar의 호출별 Cost에 누적 → log_command 기록 + 명령별 합계
+- 그 외 (watch 스레드, log_sink 등): "listen:<컬렉션>" / "background:<컬렉션>" 출처로 바로 합계
+합계는 metrics 카운터 (db_reads_total 등, 라벨 source)로 노출된다.
+
+Firestore 과금 기준에 맞춰 쿼리는 결과 0건이어도 1 read, 리스너는 스냅샷의 변경 문서 수만큼 read.
+트랜잭션 등 래핑하지 않은 API는 그대로 통과 (계측 안 됨).
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DB_READ_BUDGET = int(os.getenv("DB_READ_BUDGET", "100"))  # 명령 1회당 기본 read 상한 (0 → 무제한)
+
+
+def _parse_budgets(spec: str) -> dict[str, int]:
+    """"p=20,c=200" → {"p": 20, "c": 200}"""
+    out = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        if name.strip() and value.strip().isdigit():
+            out[name.strip()] = int(value)
+    return out
+
+
+DB_READ_BUDGETS = _parse_budgets(os.getenv("DB_READ_BUDGETS", ""))
+
+
+@dataclass(slots=True)
+class Cost:
+    reads: int = 0
+    writes: int = 0
+    queries: int = 0
+
+
+_current: ContextVar[tuple[str, Cost] | None] = ContextVar("db_cost", default=None)
+_lock = threading.Lock()
+
+
+def current() -> Cost | None:
+    """실행 중인 명령의 누적 비용 (명령 밖이면 None)"""
+    entry = _current.get()
+    return entry[1] if entry else None
+
+
+def budget_for(command: str) -> int:
+    return DB_READ_BUDGETS.get(command, DB_READ_BUDGET)
+
+
+@contextmanager
+def track(command: str):
+    """명령 1회 실행 범위 — 같은 태스크의 하위 호출(파생 태스크 포함)이 같은 Cost에 누적 (contextvars)"""
+    cost = Cost()
+    token = _current.set((command, cost))
+    try:
+        yield cost
+    finally:
+        _current.reset(token)
+        _record(command, cost)
+        budget = budget_for(command)
+        if budget and cost.reads > budget:
+            metrics.inc("db_budget_exceeded_total", command=command)
+            logger.warning(f"[db_cost] /{command} read {cost.reads}건 — 예산 {budget}건 초과 "
+                           f"(query {cost.queries}, write {cost.writes})")
+
+
+def charge(scope: str, reads: int = 0, writes: int = 0, queries: int = 0):
+    entry = _current.get()
+    if entry is None:
+        _record(scope, Cost(reads, writes, queries))
+        return
+    cost = entry[1]
+    with _lock:
+        cost.reads += reads
+        cost.writes += writes
+        cost.queries += queries
+
+
+def _record(source: str, cost: Cost):
+    if cost.reads:
+        metrics.inc("db_reads_total", cost.reads, source=source)
+    if cost.writes:
+        metrics.inc("db_writes_total", cost.writes, source=source)
+    if cost.queries:
+        metrics.inc("db_queries_total", cost.queries, source=source)
+
+
+def totals() -> dict[str, Cost]:
+    """출처별 누적 합계"""
+    out: dict[str, Cost] = {}
+    for field in ("reads", "writes", "queries"):
+        for labels, n in metrics.counters(f"db_{field}_total"):
+            cost = out.setdefault(labels.get("source", "?"), Cost())
+            setattr(cost, field, n)
+    return out
+
+
+# ── 래퍼 ──
+
+_QUERY_METHODS = ("where", "order_by", "limit", "limit_to_last", "offset", "select",
+                  "start_at", "start_after", "end_at", "end_before")
+
+
+class _Query:
+    def __init__(self, ref, path: str):
+        self._ref = ref
+        self._path = path
+
+    def __getattr__(self, name):
+        attr = getattr(self._ref, name)
+        if name in _QUERY_METHODS:
+            def chained(*args, **kwargs):
+                return _Query(attr(*args, **kwargs), self._path)
+            return chained
+        return attr
+
+    def stream(self, *args, **kwargs):
+        n = 0
+        try:
+            for snap in self._ref.stream(*args, **kwargs):
+                n += 1
+                yield snap
+        finally:
+            charge(f"background:{self._path}", reads=max(n, 1), queries=1)
+
+    def get(self, *args, **kwargs):
+        docs = self._ref.get(*args, **kwargs)
+        charge(f"background:{self._path}", reads=max(len(docs), 1), queries=1)
+        return docs
+
+    def on_snapshot(self, callback):
+        scope = f"listen:{self._path}"
+
+        def counted(doc_snapshots, changes, read_time):
+            charge(scope, reads=len(changes))
+            return callback(doc_snapshots, changes, read_time)
+        return self._ref.on_snapshot(counted)
+
+
+class _Collection(_Query):
+    def document(self, *args, **kwargs):
+        return _Document(self._ref.document(*args, **kwargs), self._path)
+
+    def add(self, *args, **kwargs):
+        charge(f"background:{self._path}", writes=1)
+        return self._ref.add(*args, **kwargs)
+
+
+class _Document:
+    def __init__(self, ref, path: str):
+        self._ref = ref
+        self._path = path
+
+    def __getattr__(self, name):
+        return getattr(self._ref, name)
+
+    def get(self, *args, **kwargs):
+        charge(f"background:{self._path}", reads=1)
+        return self._ref.get(*args, **kwargs)
+
+    def _write(self, method, *args, **kwargs):
+        charge(f"background:{self._path}", writes=1)
+        return getattr(self._ref, method)(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        return self._write("set", *args, **kwargs)
+
+    def create(self, *args, **kwargs):
+        return self._write("create", *args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        return self._write("update", *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        return self._write("delete", *args, **kwargs)
+
+    def collection(self, name: str):
+        return _Collection(self._ref.collection(name), f"{self._path}/{name}")
+
+    def on_snapshot(self, callback):
+        scope = f"listen:{self._path}"
+
+        def counted(doc_snapshots, changes, read_time):
+            charge(scope, reads=max(len(changes), 1))
+            return callback(doc_snapshots, changes, read_time)
+        return self._ref.on_snapshot(counted)
+
+
+def _unwrap(ref):
+    return ref._ref if isinstance(ref, (_Document, _Query)) else ref
+
+
+class _Batch:
+    """쓰기는 commit 시점에 건수만큼 집계 (실패 시 미집계)"""
+
+    def __init__(self, batch):
+        self._batch = batch
+        self._pending: dict[str, int] = {}
+
+    def __getattr__(self, name):
+        return getattr(self._batch, name)
+
+    def _stage(self, method, ref, *args, **kwargs):
+        path = ref._path if isinstance(ref, _Document) else "?"
+        self._pending[path] = self._pending.get(path, 0) + 1
+        return getattr(self._batch, method)(_unwrap(ref), *args, **kwargs)
+
+    def set(self, ref, *args, **kwargs):
+        return self._stage("set", ref, *args, **kwargs)
+
+    def create(self, ref, *args, **kwargs):
+        return self._stage("create", ref, *args, **kwargs)
+
+    def update(self, ref, *args, **kwargs):
+        return self._stage("update", ref, *args, **kwargs)
+
+    def delete(self, ref, *args, **kwargs):
+        return self._stage("delete", ref, *args, **kwargs)
+
+    def commit(self, *args, **kwargs):
+        result = self._batch.commit(*args, **kwargs)
+        for path, n in self._pending.items():
+            charge(f"background:{path}", writes=n)
+        self._pending.clear()
+        return result
+
+
+class InstrumentedClient:
+    """firestore.Client 래퍼 — collection/document/batch/get_all 계측, 나머지는 그대로 위임"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def collection(self, path: str):
+        return _Collection(self._client.collection(path), path)
+
+    def document(self, path: str):
+        return _Document(self._client.document(path), path.rsplit("/", 1)[0])
+
+    def batch(self):
+        return _Batch(self._client.batch())
+
+    def get_all(self, refs, *args, **kwargs):
+        refs = list(refs)
+        paths = [r._path if isinstance(r, _Document) else "?" for r in refs]
+        for snap, path in zip(self._client.get_all([_unwrap(r) for r in refs], *args, **kwargs), paths):
+            charge(f"background:{path}", reads=1)
+            yield snap
@@ -0,0 +1,178 @@
+"""
+알림 발송 큐 (Firestore watch 스레드 → 애플리케이션 이벤트 루프)
+
+watch 콜백은 submit()으로 코루틴 팩토리를 상한 있는 큐에 넣기만 하고,
+post_init에서 캡처한 애플리케이션 루프의 소비 태스크가 토큰 버킷 속도로
+순차 발송한다 → 대량 재고 반영 시에도 텔레그램 flood limit 회피.
+알림 1건이 여러 API 호출(메시지 + 문서)이면 단계 목록으로 넘긴다 — flood limit
+재시도는 실패한 단계부터 (이미 보낸 메시지를 다시 보내지 않음).
+"""
+import asyncio
+import logging
+import os
+import queue
+import time
+from collections import deque
+
+from telegram.error import RetryAfter
+
+logger = logging.getLogger(__name__)
+
+ALERT_RATE = float(os.getenv("ALERT_RATE", "1"))      # 초당 발송 수
+ALERT_BURST = int(os.getenv("ALERT_BURST", "5"))      # 순간 허용량
+ALERT_QUEUE_SIZE = int(os.getenv("ALERT_QUEUE_SIZE", "1000"))
+MAX_RETRIES = 3
+LATENCY_WINDOW = 1000  # 지연 통계 표본 수
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AlertDispatcher:
+    def __init__(self, rate: float = ALERT_RATE, burst: int = ALERT_BURST,
+                 maxsize: int = ALERT_QUEUE_SIZE):
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._bucket = TokenBucket(rate, burst)
+        self._loop = None
+        self._wakeup = None
+        self._task = None
+        self._busy = False  # 꺼낸 알림 발송 중 (stop이 마지막 발송을 끊지 않도록)
+
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._queue_wait_ms = deque(maxlen=LATENCY_WINDOW)  # 큐 대기
+        self._send_ms = deque(maxlen=LATENCY_WINDOW)        # API 호출
+
+    # ── 생산자 (watch 스레드, 어느 스레드든 가능) ──
+
+    def submit(self, send, on_done=None, on_fail=None) -> bool:
+        """send: 인자 없는 async 함수 또는 그 목록 (순서대로 발송하는 단계).
+        on_done / on_fail: 발송 성공 / 최종 실패(재시도 소진 포함) 후 루프에서 호출할 콜백"""
+        try:
+            self._queue.put_nowait((time.monotonic(), send, on_done, on_fail))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"[dispatch] 큐 가득 참 ({self._queue.maxsize}) — 알림 폐기")
+            return False
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        return True
+
+    # ── 소비자 (애플리케이션 루프) ──
+
+    async def start(self):
+        """애플리케이션 루프에서 호출 (post_init) — 시작 전 쌓인 알림도 발송"""
+        # Event를 먼저 만든 뒤 루프 공개 — submit()은 _loop가 보이면 바로 _wakeup.set을 예약
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.create_task(self._run(), name="alert-dispatch")
+        self._wakeup.set()
+
+    async def stop(self, timeout: float = 5):
+        """남은 알림을 timeout 동안 발송 시도 후 종료"""
+        if self._task is None:
+            return
+        deadline = time.monotonic() + timeout
+        while (self._busy or not self._queue.empty()) and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while True:
+                try:
+                    enqueued, send, on_done, on_fail = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                self._busy = True
+                try:
+                    await self._bucket.acquire()
+                    self._queue_wait_ms.append((time.monotonic() - enqueued) * 1000)
+                    await self._send(send, on_done, on_fail)
+                finally:
+                    self._busy = False
+
+    async def _send(self, send, on_done, on_fail):
+        steps = list(send) if isinstance(send, (list, tuple)) else [send]
+        t = time.monotonic()
+        for step in steps:
+            if not await self._send_step(step):
+                self.failed += 1
+                _callback(on_fail, "on_fail")
+                return
+        self._send_ms.append((time.monotonic() - t) * 1000)
+        self.sent += 1
+        _callback(on_done, "on_done")
+
+    async def _send_step(self, step) -> bool:
+        """단계 1개 발송 (flood limit이면 이 단계만 재시도) → 성공 여부"""
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                await step()
+            except RetryAfter as e:
+                delay = e.retry_after
+                logger.warning(f"[dispatch] flood limit — {delay}s 대기 ({attempt}/{MAX_RETRIES})")
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                logger.exception("[dispatch] 알림 발송 실패")
+                return False
+            return True
+        return False
+
+    # ── 지표 ──
+
+    def stats(self) -> dict:
+        return {
+            "depth": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "queue_wait_ms": _percentiles(self._queue_wait_ms),
+            "send_ms": _percentiles(self._send_ms),
+        }
+
+
+def _callback(fn, name):
+    if fn:
+        try:
+            fn()
+        except Exception:
+            logger.exception(f"[dispatch] {name} 콜백 오류")
+
+
+def _percentiles(samples) -> dict:
+    if not samples:
+        return {}
+    values = sorted(samples)
+    return {f"p{int(p * 100)}": round(values[min(len(values) - 1, int(len(values) * p))], 1)
+            for p in (0.5, 0.99)}
+
+
+alert_dispatcher = AlertDispatcher()
@@ -0,0 +1,266 @@
+"""
+거래처별 미수 집계 (견적 발행액 / 입금액 / 마지막 거래일 / 최근 견적 3건)
+
+quotes / payments 레플리카의 스냅샷 delta로 증분 갱신 → /c는 O(1) 조회.
+/ar 전사 미수 요약(경과일 구간, 상위 거래처)은 변경이 있을 때만 다시 계산해
+날짜별로 캐시한다. 주기적으로(+ 매일 새벽) 레플리카 전체에서 재계산해
+증분 연산 오차(drift)를 교정한다.
+"""
+import heapq
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from utils.replica import Replica
+
+logger = logging.getLogger(__name__)
+
+RECENT_QUOTES = 3
+RECONCILE_INTERVAL = int(os.getenv("LEDGER_RECONCILE_MIN", "60")) * 60  # 초
+RECONCILE_HOUR = int(os.getenv("LEDGER_RECONCILE_HOUR", "3"))  # 매일 전체 재계산 시각 (로컬)
+
+# 미수 경과일 구간: (상한 일수, 라벨) — 입금은 오래된 견적부터 차감(FIFO)
+AGING_BUCKETS = ((30, "0-30일"), (60, "31-60일"), (90, "61-90일"), (None, "90일+"))
+
+
+def _amount(doc: dict, key: str):
+    v = doc.get(key) or 0
+    return v if isinstance(v, (int, float)) else 0
+
+
+def _ts(doc: dict) -> float:
+    """created_at 정렬 키 (없거나 datetime이 아니면 가장 오래된 것으로 취급)"""
+    v = doc.get("created_at")
+    return v.timestamp() if hasattr(v, "timestamp") else 0.0
+
+
+@dataclass
+class ClientAggregate:
+    client_name: str
+    quoted_total: int | float = 0
+    paid_total: int | float = 0
+    quote_ids: set[str] = field(default_factory=set)
+    payment_ids: set[str] = field(default_factory=set)
+    recent: list[dict] = field(default_factory=list)  # created_at 내림차순
+    open_items: list[tuple[float, float]] | None = None  # 미회수 (created_at ts, 잔액) — None이면 재계산 필요
+
+    @property
+    def outstanding(self):
+        return self.quoted_total - self.paid_total
+
+    @property
+    def last_trade(self):
+        return self.recent[0].get("created_at") if self.recent else None
+
+
+@dataclass
+class ClientReceivable:
+    client_name: str
+    outstanding: int | float
+    buckets: list  # AGING_BUCKETS 순서별 잔액
+
+
+@dataclass
+class ReceivablesSummary:
+    as_of: date
+    total: int | float
+    buckets: list
+    clients: list[ClientReceivable]  # 미수 내림차순
+
+
+def _bucket(age_days: float) -> int:
+    for i, (limit, _) in enumerate(AGING_BUCKETS):
+        if limit is None or age_days <= limit:
+            return i
+    return len(AGING_BUCKETS) - 1
+
+
+class ClientLedger:
+    def __init__(self, quotes: Replica, payments: Replica):
+        self._quotes = quotes
+        self._payments = payments
+        self._clients: dict[str, ClientAggregate] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self._summary = None  # ((기준일, version), ReceivablesSummary)
+        self.reconciles = 0
+        self.last_drift = 0
+        self.last_reconcile = None
+
+        quotes.add_listener(self._on_quote)
+        payments.add_listener(self._on_payment)
+
+    # ── 조회 ──
+
+    @property
+    def ready(self) -> bool:
+        return self._quotes.ready and self._payments.ready
+
+    def get(self, client_name: str) -> ClientAggregate | None:
+        return self._clients.get(client_name)
+
+    # ── 증분 갱신 (watch 스레드) ──
+
+    def _on_quote(self, doc_id, old, new):
+        with self._lock:
+            self._apply_quote(self._clients, doc_id, old, new)
+            self._version += 1
+
+    def _on_payment(self, doc_id, old, new):
+        with self._lock:
+            self._apply_payment(self._clients, doc_id, old, new)
+            self._version += 1
+
+    def _apply_quote(self, clients, doc_id, old, new):
+        if old:
+            agg = clients.get(old.get("client_name", ""))
+            if agg:
+                agg.quoted_total -= _amount(old, "total_amount")
+                agg.quote_ids.discard(doc_id)
+                agg.open_items = None
+                if any(q["_id"] == doc_id for q in agg.recent):
+                    # 최근 3건에서 빠짐 → 해당 거래처 견적에서 다시 선정
+                    docs = (self._quotes.get(i) for i in agg.quote_ids)
+                    agg.recent = heapq.nlargest(RECENT_QUOTES, filter(None, docs), key=_ts)
+                self._drop_if_empty(clients, agg)
+        if new:
+            name = new.get("client_name", "")
+            agg = clients.get(name) or clients.setdefault(name, ClientAggregate(name))
+            agg.quoted_total += _amount(new, "total_amount")
+            agg.quote_ids.add(doc_id)
+            agg.open_items = None
+            if len(agg.recent) < RECENT_QUOTES or _ts(new) > _ts(agg.recent[-1]):
+                agg.recent = [q for q in agg.recent if q["_id"] != doc_id]
+                agg.recent.append(new)
+                agg.recent.sort(key=_ts, reverse=True)
+                del agg.recent[RECENT_QUOTES:]
+
+    def _apply_payment(self, clients, doc_id, old, new):
+        if old:
+            agg = clients.get(old.get("client_name", ""))
+            if agg:
+                agg.paid_total -= _amount(old, "amount")
+                agg.payment_ids.discard(doc_id)
+                agg.open_items = None
+                self._drop_if_empty(clients, agg)
+        if new:
+            name = new.get("client_name", "")
+            agg = clients.get(name) or clients.setdefault(name, ClientAggregate(name))
+            agg.paid_total += _amount(new, "amount")
+            agg.payment_ids.add(doc_id)
+            agg.open_items = None
+
+    @staticmethod
+    def _drop_if_empty(clients, agg):
+        if not agg.quote_ids and not agg.payment_ids:
+            clients.pop(agg.client_name, None)
+
+    # ── 전체 재계산 ──
+
+    def reconcile(self):
+        """레플리카 전체에서 재계산 후 교체 (watch 반영과 원자적)"""
+        with self._quotes.lock, self._payments.lock, self._lock:
+            fresh: dict[str, ClientAggregate] = {}
+            for d in self._quotes.docs():
+                self._apply_quote(fresh, d["_id"], None, d)
+            for d in self._payments.docs():
+                self._apply_payment(fresh, d["_id"], None, d)
+
+            drift = len(self._clients.keys() ^ fresh.keys())
+            for name, agg in fresh.items():
+                cur = self._clients.get(name)
+                if cur and (cur.quoted_total != agg.quoted_total or cur.paid_total != agg.paid_total):
+                    drift += 1
+            self._clients = fresh
+            self._version += 1
+
+        self.reconciles += 1
+        self.last_drift = drift
+        self.last_reconcile = time.time()
+        if drift:
+            logger.warning(f"[ledger] 재계산 drift {drift}건 교정")
+        return drift
+
+    def run_reconcile_loop(self, interval: float = RECONCILE_INTERVAL, nightly_hour: int = RECONCILE_HOUR):
+        """interval마다 + 매일 nightly_hour시에 재계산 (먼저 오는 쪽)"""
+        while True:
+            now = datetime.now()
+            nightly = now.replace(hour=nightly_hour, minute=0, second=0, microsecond=0)
+            if nightly <= now:
+                nightly += timedelta(days=1)
+            time.sleep(min(interval, (nightly - now).total_seconds()))
+            try:
+                self.reconcile()
+            except Exception:
+                logger.exception("[ledger] 재계산 실패")
+
+    # ── 전사 미수 요약 (/ar) ──
+
+    def receivables(self, today: date | None = None) -> ReceivablesSummary:
+        """변경이 없으면 같은 날짜 안에서는 캐시 반환"""
+        today = today or date.today()
+        with self._lock:
+            cache_key = (today, self._version)
+            if self._summary and self._summary[0] == cache_key:
+                return self._summary[1]
+            summary = self._build_summary(today)
+            self._summary = (cache_key, summary)
+            return summary
+
+    def _open_items(self, agg: ClientAggregate) -> list[tuple[float, float]]:
+        """입금액을 오래된 견적부터 차감(FIFO)한 뒤 남은 견적 잔액"""
+        if agg.open_items is None:
+            quotes = sorted(filter(None, (self._quotes.get(i) for i in agg.quote_ids)), key=_ts)
+            remaining = agg.paid_total
+            items = []
+            for q in quotes:
+                amount = _amount(q, "total_amount")
+                if remaining >= amount:
+                    remaining -= amount
+                    continue
+                items.append((_ts(q), amount - remaining))
+                remaining = 0
+            agg.open_items = items
+        return agg.open_items
+
+    def _build_summary(self, today: date) -> ReceivablesSummary:
+        base = datetime.combine(today, datetime.max.time()).timestamp()
+        totals = [0] * len(AGING_BUCKETS)
+        rows = []
+        for agg in self._clients.values():
+            if agg.outstanding <= 0:
+                continue
+            buckets = [0] * len(AGING_BUCKETS)
+            for ts, amount in self._open_items(agg):
+                buckets[_bucket((base - ts) / 86400)] += amount
+            for i, v in enumerate(buckets):
+                totals[i] += v
+            rows.append(ClientReceivable(agg.client_name, agg.outstanding, buckets))
+        rows.sort(key=lambda r: (-r.outstanding, r.client_name))
+        return ReceivablesSummary(today, sum(r.outstanding for r in rows), totals, rows)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self._clients),
+            "reconciles": self.reconciles,
+            "last_drift": self.last_drift,
+        }
+
+
+quotes_replica = Replica("quotes", name_field=None)
+payments_replica = Replica("payments", name_field=None)
+client_ledger = ClientLedger(quotes_replica, payments_replica)
+
+
+def start_ledger():
+    """quotes / payments 레플리카 시작 + 최초 적재 대기 + 주기 재계산 스레드 → watch 리스트 반환"""
+    replicas = [quotes_replica, payments_replica]
+    watches = [r.start() for r in replicas]
+    for r in replicas:
+        r.wait_ready()
+    threading.Thread(target=client_ledger.run_reconcile_loop,
+                     name="ledger-reconcile", daemon=True).start()
+    return watches
@@ -0,0 +1,196 @@
+"""
+system_logs 비동기 배치 기록기
+
+log_command → 메모리 큐(상한 있음)에 넣고 즉시 반환. 백그라운드 스레드가
+WriteBatch(최대 500건)로 모아 기록한다 — 건수 또는 시간 임계치 도달 시 flush.
+Firestore 실패/큐 초과 시 로컬 spool 파일(JSONL, append-only)에 남기고,
+다음 flush 성공 때 재전송한다. 종료 시 stop()으로 잔여분 drain.
+500건 단위 커밋 중 일부만 성공하면 커밋 안 된 나머지만 spool (중복 기록 방지).
+"""
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+
+from config import get_db, STATE_DIR
+
+logger = logging.getLogger(__name__)
+
+BATCH_LIMIT = 500  # Firestore WriteBatch 최대 연산 수
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_FLUSH_SIZE = min(int(os.getenv("LOG_FLUSH_SIZE", "100")), BATCH_LIMIT)
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "2"))  # 초
+
+_TS_KEY = "timestamp"
+
+
+class LogSink:
+    def __init__(self, collection: str = "system_logs", spool_path=None,
+                 maxsize: int = LOG_QUEUE_SIZE, flush_size: int = LOG_FLUSH_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL):
+        self.collection = collection
+        self.spool_path = spool_path or STATE_DIR / f"{collection}.spool.jsonl"
+        self.replay_path = self.spool_path.with_suffix(".replay")  # 재전송 중인 spool
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._spool_lock = threading.Lock()
+        self._thread = None
+
+        self.written = 0   # Firestore 기록 완료
+        self.spooled = 0   # spool 파일로 우회
+        self.flushes = 0
+        self.failures = 0
+
+    # ── 생산자 (핸들러) ──
+
+    def put(self, record: dict):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._spool([record])
+
+    # ── 소비자 (백그라운드 스레드) ──
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        """잔여 큐 drain 후 종료"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            wait = self.flush_interval if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                batch.append(self._queue.get(timeout=wait))
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            except queue.Empty:
+                if self._stop.is_set():
+                    break
+
+            if len(batch) >= self.flush_size or (batch and time.monotonic() >= deadline):
+                self._flush(batch)
+                batch, deadline = [], None
+
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch: list[dict]):
+        try:
+            self._commit(batch)
+        except _CommitError as e:
+            self.failures += 1
+            self.written += e.committed
+            logger.warning(f"[log_sink] Firestore 기록 실패 → spool {len(batch) - e.committed}건: {e.cause}")
+            self._spool(batch[e.committed:])
+            return
+        self.flushes += 1
+        self.written += len(batch)
+        self._replay_spool()
+
+    def _commit(self, records: list[dict]):
+        """BATCH_LIMIT건씩 커밋 — 실패 시 _CommitError(앞서 커밋된 건수)"""
+        committed = 0
+        try:
+            db = get_db()
+            col = db.collection(self.collection)
+            for i in range(0, len(records), BATCH_LIMIT):
+                chunk = records[i:i + BATCH_LIMIT]
+                wb = db.batch()
+                for rec in chunk:
+                    wb.set(col.document(), rec)
+                wb.commit()
+                committed += len(chunk)
+        except Exception as e:
+            raise _CommitError(committed, e) from e
+
+    # ── spool 파일 ──
+
+    def _spool(self, records: list[dict]):
+        with self._spool_lock:
+            self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as f:
+                for rec in records:
+                    f.write(json.dumps(rec, ensure_ascii=False, default=_encode) + "\n")
+            self.spooled += len(records)
+
+    def _replay_spool(self):
+        """spool 파일 재전송 (성공분만 제거)
+
+        재전송 전 .replay로 옮겨 두므로, 재전송 도중 종료돼 남은 .replay도 여기서 함께 보냄.
+        """
+        pending = self.replay_path
+        with self._spool_lock:
+            if self.spool_path.exists():
+                if pending.exists():
+                    with open(self.spool_path, encoding="utf-8") as src, \
+                            open(pending, "a", encoding="utf-8") as dst:
+                        shutil.copyfileobj(src, dst)
+                    self.spool_path.unlink()
+                else:
+                    os.replace(self.spool_path, pending)
+            elif not pending.exists():
+                return
+
+        with open(pending, encoding="utf-8") as f:
+            records = [_decode(json.loads(line)) for line in f if line.strip()]
+        try:
+            self._commit(records)
+        except _CommitError as e:
+            self.written += e.committed
+            logger.warning(f"[log_sink] spool 재전송 실패 ({e.committed}건 기록, "
+                           f"{len(records) - e.committed}건 유지): {e.cause}")
+            self._spool(records[e.committed:])
+        else:
+            self.written += len(records)
+            logger.info(f"[log_sink] spool {len(records)}건 재전송")
+        pending.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "spooled": self.spooled,
+            "flushes": self.flushes,
+            "failures": self.failures,
+        }
+
+
+class _CommitError(Exception):
+    """배치 커밋 실패 — committed: 실패 전까지 커밋된 건수 (이만큼은 spool하지 않음)"""
+
+    def __init__(self, committed: int, cause: Exception):
+        super().__init__(f"{committed}건 커밋 후 실패: {cause}")
+        self.committed = committed
+        self.cause = cause
+
+
+def _encode(v):
+    if isinstance(v, datetime):
+        return v.isoformat()
+    raise TypeError(f"직렬화 불가: {type(v).__name__}")
+
+
+def _decode(rec: dict) -> dict:
+    ts = rec.get(_TS_KEY)
+    if isinstance(ts, str):
+        rec[_TS_KEY] = datetime.fromisoformat(ts)
+    return rec
+
+
+log_sink = LogSink()
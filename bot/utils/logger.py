@@ -1,12 +1,18 @@
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import wraps
 
-from config import db
+from utils import db_cost
+from utils.log_sink import log_sink
+from utils.metrics import metrics
 
 
 def log_command(command: str, args: str, success: bool, latency_ms: int,
                 result_summary: str, doc_refs: list[str] | None = None):
-    db.collection("system_logs").add({
+    """system_logs 기록 — 큐에 넣고 즉시 반환 (배치 기록은 log_sink 스레드)"""
+    cost = db_cost.current() or db_cost.Cost()
+    log_sink.put({
         "timestamp": datetime.now(timezone.utc),
         "command": command,
         "args": args,
@@ -14,13 +20,48 @@ def log_command(command: str, args: str, success: bool, latency_ms: int,
         "latency_ms": latency_ms,
         "result_summary": result_summary,
         "doc_refs": doc_refs or [],
+        "db_reads": cost.reads,
+        "db_writes": cost.writes,
+        "db_queries": cost.queries,
     })
 
 
 class CommandTimer:
+    """with 블록 = 조회(query) 구간. command 지정 시 구간별 지연을 지표에 기록"""
+
+    def __init__(self, command: str | None = None):
+        self.command = command
+
     def __enter__(self):
         self.start = time.perf_counter()
+        self.end = None
         return self
 
     def __exit__(self, *exc):
-        self.elapsed_ms = int((time.perf_counter() - self.start) * 1000)
+        self.end = time.perf_counter()
+        if self.command:
+            metrics.observe("command_phase_ms", (self.end - self.start) * 1000,
+                            command=self.command, phase="query")
+
+    @property
+    def elapsed_ms(self) -> int:
+        """블록 안에서 읽으면 현재까지 경과 시간"""
+        end = self.end if self.end is not None else time.perf_counter()
+        return int((end - self.start) * 1000)
+
+    @contextmanager
+    def phase(self, name: str):
+        """조회 이후 구간 (format, reply 등)"""
+        with metrics.time("command_phase_ms", command=self.command or "?", phase=name):
+            yield
+
+
+def timed(command: str):
+    """핸들러 전체 지연 (command_latency_ms) + Firestore 비용 (db_cost.track) 기록"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(update, context):
+            with db_cost.track(command), metrics.time("command_latency_ms", command=command):
+                return await func(update, context)
+        return wrapper
+    return decorator
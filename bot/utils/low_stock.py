@@ -0,0 +1,58 @@
+"""
+부족 품목 집합 (current_qty <= min_qty) — 부족수량 내림차순 정렬 유지
+
+inventory 레플리카의 변경 delta로 갱신 → /low는 읽기 0건, 슬라이스만.
+"""
+import threading
+from bisect import bisect_left, insort
+
+from utils.replica import Replica, inventory_replica
+
+
+class LowStockBoard:
+    def __init__(self, replica: Replica):
+        self._replica = replica
+        self._order: list[tuple] = []        # (-부족수량, 품목명, doc_id)
+        self._keys: dict[str, tuple] = {}    # doc_id → 정렬 키
+        self._lock = threading.Lock()
+        # 레플리카 적재 이후 생성(핸들러 지연 import)돼도 누락 없도록 등록과 기존 문서 반영을 원자적으로
+        with replica.lock:
+            replica.add_listener(self._on_change)
+            for doc in replica.docs():
+                self._on_change(doc["_id"], None, doc)
+
+    @property
+    def ready(self) -> bool:
+        return self._replica.ready
+
+    def _on_change(self, doc_id, old, new):
+        key = self._key(doc_id, new) if new else None
+        with self._lock:
+            prev = self._keys.pop(doc_id, None)
+            if prev is not None:
+                del self._order[bisect_left(self._order, prev)]
+            if key is not None:
+                self._keys[doc_id] = key
+                insort(self._order, key)
+
+    @staticmethod
+    def _key(doc_id, doc):
+        current = doc.get("current_qty", 0) or 0
+        minimum = doc.get("min_qty", 0) or 0
+        if current > minimum:
+            return None
+        return (current - minimum, doc.get("name", ""), doc_id)
+
+    def __len__(self):
+        return len(self._order)
+
+    def page(self, page: int, size: int) -> tuple[list[dict], int]:
+        """(해당 페이지 품목, 전체 건수)"""
+        with self._lock:
+            total = len(self._order)
+            keys = self._order[(page - 1) * size: page * size]
+        docs = [self._replica.get(doc_id) for _, _, doc_id in keys]
+        return [d for d in docs if d], total
+
+
+low_stock_board = LowStockBoard(inventory_replica)
@@ -0,0 +1,348 @@
+"""
+프로세스 내 가짜 Firestore (BOT_BACKEND=memory, 벤치/부하 생성기용)
+
+utils.backend 인터페이스 구현: collection / where / order_by / limit / stream / get /
+add / document(get, set, update, delete) / batch / on_snapshot.
+
+- 쓰기는 클라이언트 lock 안에서 적용, 스냅샷 콜백은 별도 전달 스레드에서 호출 (Firestore와 동일하게
+  쓰기 스레드와 분리). 커밋 1회 = 감시 1개당 스냅샷 1회.
+- 최초 스냅샷은 현재 결과 전체를 ADDED로 전달.
+- 미지원: limit가 있는 쿼리의 on_snapshot, 트랜잭션, FieldFilter 키워드 인자.
+"""
+import enum
+import logging
+import operator
+import queue
+import threading
+import uuid
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+BATCH_LIMIT = 500  # Firestore WriteBatch 최대 쓰기 수
+
+ChangeType = enum.Enum("ChangeType", "ADDED MODIFIED REMOVED")
+
+_MISSING = object()
+
+_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda v, arg: v in arg,
+    "not-in": lambda v, arg: v not in arg,
+    "array_contains": lambda v, arg: isinstance(v, list) and arg in v,
+    "array_contains_any": lambda v, arg: isinstance(v, list) and any(a in v for a in arg),
+}
+
+
+def _field(doc: dict, path: str):
+    value = doc
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+class MemorySnapshot:
+    def __init__(self, doc_id: str, data: dict | None, reference=None):
+        self.id = doc_id
+        self._data = data
+        self.reference = reference
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> dict | None:
+        return dict(self._data) if self._data is not None else None
+
+    def get(self, field: str):
+        value = _field(self._data or {}, field)
+        return None if value is _MISSING else value
+
+
+class DocumentChange:
+    def __init__(self, type: ChangeType, document: MemorySnapshot):
+        self.type = type
+        self.document = document
+
+
+class MemoryWatch:
+    def __init__(self, client, query, callback):
+        self._client = client
+        self.query = query
+        self.callback = callback
+        self._active = True
+
+    @property
+    def is_active(self) -> bool:
+        return self._active
+
+    def close(self):
+        """서버 측 종료 흉내 (is_active=False, 재구독은 SupervisedWatch 몫)"""
+        self._active = False
+        self._client._detach(self)
+
+    def unsubscribe(self):
+        self.close()
+
+
+class MemoryQuery:
+    def __init__(self, client, path: str, filters=(), orders=(), limit_n=None):
+        self._client = client
+        self._path = path
+        self._filters = filters
+        self._orders = orders
+        self._limit = limit_n
+
+    def _with(self, **kw):
+        args = dict(filters=self._filters, orders=self._orders, limit_n=self._limit)
+        args.update(kw)
+        return MemoryQuery(self._client, self._path, **args)
+
+    def where(self, field: str, op: str, value):
+        if op not in _OPS:
+            raise ValueError(f"지원하지 않는 연산자: {op}")
+        return self._with(filters=self._filters + ((field, _OPS[op], value),))
+
+    def order_by(self, field: str, direction: str = "ASCENDING"):
+        return self._with(orders=self._orders + ((field, direction == "DESCENDING"),))
+
+    def limit(self, n: int):
+        return self._with(limit_n=n)
+
+    def matches(self, doc: dict) -> bool:
+        for field, op, arg in self._filters:
+            value = _field(doc, field)
+            if value is _MISSING:
+                return False
+            try:
+                if not op(value, arg):
+                    return False
+            except TypeError:
+                return False
+        # order_by 필드가 없는 문서는 결과에서 제외 (Firestore 동작)
+        return all(_field(doc, f) is not _MISSING for f, _ in self._orders)
+
+    def _results(self) -> list[tuple[str, dict]]:
+        with self._client._lock:
+            docs = self._client._collections.get(self._path, {})
+            rows = [(doc_id, doc) for doc_id, doc in docs.items() if self.matches(doc)]
+        for field, desc in reversed(self._orders):
+            rows.sort(key=lambda r: _field(r[1], field), reverse=desc)
+        if not self._orders:
+            rows.sort(key=lambda r: r[0])  # 기본 정렬: 문서 id
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return rows
+
+    def _snapshot(self, doc_id, doc):
+        return MemorySnapshot(doc_id, doc, MemoryDocument(self._client, self._path, doc_id))
+
+    def stream(self):
+        for doc_id, doc in self._results():
+            yield self._snapshot(doc_id, doc)
+
+    def get(self):
+        return list(self.stream())
+
+    def on_snapshot(self, callback):
+        if self._limit is not None:
+            raise ValueError("limit 쿼리의 on_snapshot은 지원하지 않음")
+        return self._client._attach(self, callback)
+
+
+class MemoryCollection(MemoryQuery):
+    def __init__(self, client, path: str):
+        super().__init__(client, path)
+
+    @property
+    def id(self) -> str:
+        return self._path.rsplit("/", 1)[-1]
+
+    def document(self, doc_id: str | None = None):
+        return MemoryDocument(self._client, self._path, doc_id or uuid.uuid4().hex[:20])
+
+    def add(self, data: dict):
+        ref = self.document()
+        ref.set(data)
+        return _now(), ref
+
+
+class MemoryDocument:
+    def __init__(self, client, path: str, doc_id: str):
+        self._client = client
+        self._path = path
+        self.id = doc_id
+
+    @property
+    def path(self) -> str:
+        return f"{self._path}/{self.id}"
+
+    def get(self):
+        with self._client._lock:
+            doc = self._client._collections.get(self._path, {}).get(self.id)
+        return MemorySnapshot(self.id, doc, self)
+
+    def set(self, data: dict, merge: bool = False):
+        return self._client._commit([(self, "merge" if merge else "set", data)])[0]
+
+    def create(self, data: dict):
+        return self._client._commit([(self, "create", data)])[0]
+
+    def update(self, data: dict):
+        return self._client._commit([(self, "update", data)])[0]
+
+    def delete(self):
+        return self._client._commit([(self, "delete", None)])[0]
+
+
+class MemoryBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes = []
+
+    def _stage(self, ref, mode, data):
+        if len(self._writes) >= BATCH_LIMIT:
+            raise ValueError(f"WriteBatch 최대 {BATCH_LIMIT}건 초과")
+        self._writes.append((ref, mode, data))
+
+    def set(self, ref, data: dict, merge: bool = False):
+        self._stage(ref, "merge" if merge else "set", data)
+
+    def create(self, ref, data: dict):
+        self._stage(ref, "create", data)
+
+    def update(self, ref, data: dict):
+        self._stage(ref, "update", data)
+
+    def delete(self, ref):
+        self._stage(ref, "delete", None)
+
+    def commit(self):
+        writes, self._writes = self._writes, []
+        return self._client._commit(writes)
+
+
+class MemoryClient:
+    def __init__(self):
+        self._collections: dict[str, dict[str, dict]] = {}
+        self._lock = threading.RLock()
+        self._watches: list[MemoryWatch] = []
+        self._events: queue.Queue = queue.Queue()
+        self._thread = None
+
+    def collection(self, path: str) -> MemoryCollection:
+        return MemoryCollection(self, path)
+
+    def document(self, path: str) -> MemoryDocument:
+        col, _, doc_id = path.rpartition("/")
+        return MemoryDocument(self, col, doc_id)
+
+    def batch(self) -> MemoryBatch:
+        return MemoryBatch(self)
+
+    def load(self, path: str, docs):
+        """대량 적재 (batch 한도 없이 1회 커밋) — docs: [(doc_id, dict)]"""
+        ref = self.collection(path)
+        return self._commit([(ref.document(doc_id), "set", data) for doc_id, data in docs])
+
+    def wait_idle(self):
+        """대기 중인 스냅샷 전달이 모두 끝날 때까지 블록"""
+        self._events.join()
+
+    # ── 쓰기 ──
+
+    def _commit(self, writes) -> list:
+        read_time = _now()
+        applied = []
+        with self._lock:
+            # create/update 전제 조건은 적용 전 일괄 검사 (일부만 반영되지 않도록)
+            for ref, mode, _ in writes:
+                exists = ref.id in self._collections.get(ref._path, {})
+                if mode == "create" and exists:
+                    raise ValueError(f"이미 존재: {ref.path}")
+                if mode == "update" and not exists:
+                    raise KeyError(f"문서 없음: {ref.path}")
+            for ref, mode, data in writes:
+                docs = self._collections.setdefault(ref._path, {})
+                old = docs.get(ref.id)
+                if mode == "delete":
+                    new = None
+                    docs.pop(ref.id, None)
+                else:
+                    new = {**old, **data} if mode in ("merge", "update") and old else dict(data)
+                    docs[ref.id] = new
+                applied.append((ref._path, ref.id, old, new))
+            for watch in self._watches:
+                changes = self._diff(watch.query, applied)
+                if changes:
+                    self._events.put((watch, _LazyResults(watch.query), changes, read_time))
+        return [read_time] * len(writes)
+
+    @staticmethod
+    def _diff(query: MemoryQuery, applied) -> list[DocumentChange]:
+        changes = []
+        for path, doc_id, old, new in applied:
+            if path != query._path:
+                continue
+            was = old is not None and query.matches(old)
+            now = new is not None and query.matches(new)
+            if now:
+                changes.append(DocumentChange(ChangeType.MODIFIED if was else ChangeType.ADDED,
+                                              query._snapshot(doc_id, new)))
+            elif was:
+                changes.append(DocumentChange(ChangeType.REMOVED, query._snapshot(doc_id, old)))
+        return changes
+
+    # ── 감시 ──
+
+    def _attach(self, query: MemoryQuery, callback) -> MemoryWatch:
+        watch = MemoryWatch(self, query, callback)
+        with self._lock:
+            rows = query._results()
+            docs = [query._snapshot(doc_id, doc) for doc_id, doc in rows]
+            self._watches.append(watch)
+            self._events.put((watch, docs, [DocumentChange(ChangeType.ADDED, d) for d in docs], _now()))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._deliver, name="memory-db-watch", daemon=True)
+                self._thread.start()
+        return watch
+
+    def _detach(self, watch: MemoryWatch):
+        with self._lock:
+            if watch in self._watches:
+                self._watches.remove(watch)
+
+    def _deliver(self):
+        while True:
+            watch, docs, changes, read_time = self._events.get()
+            try:
+                if watch.is_active:
+                    watch.callback(docs, changes, read_time)
+            except Exception:
+                logger.exception("[memory_db] 스냅샷 콜백 오류")
+            finally:
+                self._events.task_done()
+
+
+class _LazyResults:
+    """스냅샷의 전체 결과 — 순회할 때 계산 (레플리카 재동기화 때만 사용)"""
+
+    def __init__(self, query: MemoryQuery):
+        self._query = query
+
+    def __iter__(self):
+        return (self._query._snapshot(doc_id, doc) for doc_id, doc in self._query._results())
+
+    def __len__(self):
+        return len(self._query._results())
@@ -0,0 +1,196 @@
+"""
+프로세스 내 지표 레지스트리
+
+- 지연 히스토그램: HDR 방식 로그-선형 버킷 (µs 정수, 2의 거듭제곱 구간마다
+  2^(SUB_BITS-1)등분 → 상대오차 ~1.6%), 메모리는 값 범위에 대해 로그 크기
+- 카운터: 이름 + 라벨
+- 수집기: 기존 모듈의 stats() dict를 조회 시점에 gauge로 노출
+
+/stats 명령과 선택적 로컬 HTTP 엔드포인트(METRICS_PORT, Prometheus 텍스트 형식)가 읽는다.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+SUB_BITS = 7
+QUANTILES = (0.5, 0.95, 0.99)
+PREFIX = "golab_"
+
+
+class Histogram:
+    def __init__(self):
+        self.counts: dict[tuple[int, int], int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, ms: float):
+        us = max(0, int(ms * 1000))
+        shift = max(0, us.bit_length() - SUB_BITS)
+        key = (shift, us >> shift)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.sum += ms
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(p * self.count))
+        seen = 0
+        for shift, sub in sorted(self.counts):
+            seen += self.counts[(shift, sub)]
+            if seen >= target:
+                mid = ((sub << shift) + ((sub + 1) << shift) - 1) / 2 / 1000
+                return min(max(mid, self.min), self.max)
+        return self.max
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, dict[tuple, Histogram]] = {}
+        self._counters: dict[str, dict[tuple, int]] = {}
+        self._collectors: dict[str, object] = {}
+
+    def observe(self, name: str, ms: float, **labels):
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            key = _label_key(labels)
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.record(ms)
+
+    def inc(self, name: str, n: int = 1, **labels):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            key = _label_key(labels)
+            series[key] = series.get(key, 0) + n
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000, **labels)
+
+    def register_collector(self, name: str, fn):
+        """fn() → dict (숫자 값만 gauge로 노출)"""
+        self._collectors[name] = fn
+
+    # ── 조회 ──
+
+    def histogram_summary(self, name: str) -> list[tuple[dict, dict]]:
+        """[(라벨, {count, p50, p95, p99, max})]"""
+        with self._lock:
+            series = list(self._histograms.get(name, {}).items())
+            return [(dict(key), {
+                "count": h.count,
+                **{f"p{int(q * 100)}": h.percentile(q) for q in QUANTILES},
+                "max": h.max,
+            }) for key, h in series]
+
+    def counters(self, name: str) -> list[tuple[dict, int]]:
+        with self._lock:
+            return [(dict(key), v) for key, v in self._counters.get(name, {}).items()]
+
+    def collect(self) -> dict[str, dict]:
+        out = {}
+        for name, fn in self._collectors.items():
+            try:
+                out[name] = fn()
+            except Exception:
+                logger.exception(f"[metrics] 수집기 오류: {name}")
+        return out
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in self._histograms.items():
+                metric = PREFIX + name
+                lines.append(f"# TYPE {metric} summary")
+                for key, h in series.items():
+                    for q in QUANTILES:
+                        lines.append(f"{metric}{_labels(dict(key, quantile=str(q)))} {h.percentile(q):.3f}")
+                    lines.append(f"{metric}_sum{_labels(dict(key))} {h.sum:.3f}")
+                    lines.append(f"{metric}_count{_labels(dict(key))} {h.count}")
+            for name, series in self._counters.items():
+                metric = PREFIX + name
+                lines.append(f"# TYPE {metric} counter")
+                for key, v in series.items():
+                    lines.append(f"{metric}{_labels(dict(key))} {v}")
+        for group, values in self.collect().items():
+            for field, v in _flatten(values):
+                metric = f"{PREFIX}{group}_{field}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {float(v)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items())) + "}"
+
+
+def _flatten(values: dict, prefix: str = ""):
+    """중첩 dict → (a_b, 숫자) — 숫자가 아닌 값은 제외 (bool은 0/1)"""
+    for k, v in values.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            yield from _flatten(v, f"{key}_")
+        elif isinstance(v, (int, float)):
+            yield key, v
+
+
+metrics = MetricsRegistry()
+
+
+# ── 로컬 HTTP 엔드포인트 ──
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0 → 비활성
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = METRICS_HOST):
+    """METRICS_PORT 설정 시 /metrics 서버 시작 → server (미설정이면 None)"""
+    if not port:
+        return None
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"지표 엔드포인트: http://{host}:{port}/metrics")
+    return server
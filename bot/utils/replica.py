@@ -0,0 +1,203 @@
+"""
+items / inventory 컬렉션 인메모리 레플리카
+
+시작 시 on_snapshot 최초 스냅샷으로 전체 적재 → 이후 변경분(delta)만 반영.
+/p, /s 핸들러는 Firestore 왕복 없이 여기서 조회한다.
+"""
+import logging
+import threading
+import time
+
+from config import get_db
+from utils.search import SearchIndex
+from utils.watch import SupervisedWatch
+
+logger = logging.getLogger(__name__)
+
+INITIAL_LOAD_TIMEOUT = 30  # 초
+SEARCH_LIMIT = 10
+
+
+class Replica:
+    """컬렉션 1개의 프로세스 전역 복제본 (watch 스레드가 갱신, 핸들러는 읽기만)"""
+
+    def __init__(self, collection: str, name_field: str | None = "name"):
+        self.collection = collection
+        self.name_field = name_field  # None → 이름 인덱스/검색 비활성 (quotes, payments 등)
+        self._docs: dict[str, dict] = {}
+        self._by_name: dict[str, set[str]] = {}
+        self.index = SearchIndex()
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._listeners = []
+        self._batch_listeners = []
+        self._resync = False
+
+        # 카운터
+        self.hits = 0          # 정확 일치 조회 성공
+        self.misses = 0        # 정확 일치 실패 → 부분 검색
+        self.snapshots = 0     # 수신한 스냅샷 수
+        self.changes = 0       # 반영한 문서 변경 수
+        self.last_sync = None  # 마지막 스냅샷 수신 시각 (time.time)
+        self.last_read_time = None
+
+    # ── 동기화 ──
+
+    def start(self) -> SupervisedWatch:
+        """watch 시작 (끊기면 자동 재구독). unsubscribe 가능한 핸들 반환"""
+        return SupervisedWatch(f"replica:{self.collection}", self._subscribe).start()
+
+    def _subscribe(self):
+        # 재구독 시 첫 스냅샷 = 현재 전체 문서 → 끊긴 사이 삭제된 문서를 정리
+        self._resync = True
+        return get_db().collection(self.collection).on_snapshot(self._on_snapshot)
+
+    def wait_ready(self, timeout: float = INITIAL_LOAD_TIMEOUT) -> bool:
+        """최초 스냅샷(전체 적재) 대기"""
+        if not self._ready.wait(timeout):
+            logger.warning(f"[replica:{self.collection}] 최초 적재 {timeout}s 초과 — 백그라운드 계속")
+            return False
+        logger.info(f"[replica:{self.collection}] {len(self._docs)}건 적재")
+        return True
+
+    def add_listener(self, fn):
+        """변경 구독: fn(doc_id, old, new) — 삭제 시 new=None, 신규 시 old=None"""
+        self._listeners.append(fn)
+
+    def add_batch_listener(self, fn):
+        """스냅샷 1회 반영 완료 후 호출: fn(read_time) — 체크포인트 저장 등"""
+        self._batch_listeners.append(fn)
+
+    def remove_listener(self, fn):
+        for listeners in (self._listeners, self._batch_listeners):
+            if fn in listeners:
+                listeners.remove(fn)
+
+    def _on_snapshot(self, doc_snapshots, changes, read_time):
+        with self._lock:
+            if self._resync:
+                self._resync = False
+                alive = {d.id for d in doc_snapshots}
+                for doc_id in [i for i in self._docs if i not in alive]:
+                    self._apply(doc_id, None)
+
+            for change in changes:
+                doc_id = change.document.id
+                if change.type.name == "REMOVED":
+                    self._apply(doc_id, None)
+                else:
+                    new = change.document.to_dict()
+                    new["_id"] = doc_id
+                    self._apply(doc_id, new)
+
+            self.snapshots += 1
+            self.last_sync = time.time()
+            self.last_read_time = read_time
+
+            for fn in self._batch_listeners:
+                try:
+                    fn(read_time)
+                except Exception:
+                    logger.exception(f"[replica:{self.collection}] batch listener 오류")
+        self._ready.set()
+
+    def _apply(self, doc_id, new):
+        old = self._docs.get(doc_id)
+        if old is None and new is None:
+            return
+        if new is None:
+            self._docs.pop(doc_id, None)
+        else:
+            self._docs[doc_id] = new
+        self._reindex(doc_id, old, new)
+        self.changes += 1
+
+        for fn in self._listeners:
+            try:
+                fn(doc_id, old, new)
+            except Exception:
+                logger.exception(f"[replica:{self.collection}] listener 오류")
+
+    def _reindex(self, doc_id, old, new):
+        if self.name_field is None:
+            return
+        old_name = old.get(self.name_field, "") if old else None
+        new_name = new.get(self.name_field, "") if new else None
+        if old_name == new_name:
+            return
+        if old_name is not None:
+            self.index.remove(doc_id)
+            ids = self._by_name.get(old_name)
+            if ids:
+                ids.discard(doc_id)
+                if not ids:
+                    del self._by_name[old_name]
+        if new_name is not None:
+            self.index.add(doc_id, new_name)
+            self._by_name.setdefault(new_name, set()).add(doc_id)
+
+    # ── 조회 (반환 dict는 읽기 전용으로 취급) ──
+
+    @property
+    def lock(self):
+        """watch 반영과 원자적으로 묶어야 하는 작업용 (파생 집계 재계산 등)"""
+        return self._lock
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def get(self, doc_id: str) -> dict | None:
+        return self._docs.get(doc_id)
+
+    def docs(self) -> list[dict]:
+        """전체 문서 스냅샷 (lock 안에서 복사)"""
+        with self._lock:
+            return list(self._docs.values())
+
+    def find(self, name: str) -> dict | None:
+        """name 정확 일치 (where("name", "==", name).limit(1) 대응)"""
+        with self._lock:
+            ids = self._by_name.get(name)
+            doc = self._docs[min(ids)] if ids else None
+        if doc:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return doc
+
+    def has_name(self, name: str) -> bool:
+        """name 정확 일치 문서 존재 여부 (hits/misses 집계 없음)"""
+        with self._lock:
+            return bool(self._by_name.get(name))
+
+    def search(self, keyword: str, limit: int = SEARCH_LIMIT) -> list[tuple[dict, bool]]:
+        """순위화된 (문서, 부분일치 여부) 상위 limit건 — 자모/초성/오타 허용"""
+        with self._lock:
+            return [(self._docs[m.doc_id], m.exact) for m in self.index.search(keyword, limit)]
+
+    def stats(self) -> dict:
+        age = time.time() - self.last_sync if self.last_sync else None
+        return {
+            "collection": self.collection,
+            "ready": self.ready,
+            "docs": len(self._docs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "snapshots": self.snapshots,
+            "changes": self.changes,
+            "staleness_s": round(age, 1) if age is not None else None,
+        }
+
+
+items_replica = Replica("items")
+inventory_replica = Replica("inventory")
+
+
+def start_replicas():
+    """items / inventory 레플리카 시작 + 최초 적재 대기 → watch 리스트 반환"""
+    replicas = [items_replica, inventory_replica]
+    watches = [r.start() for r in replicas]
+    for r in replicas:
+        r.wait_ready()
+    return watches
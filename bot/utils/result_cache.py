@@ -0,0 +1,168 @@
+"""
+핸들러 응답 캐시 (LRU + TTL) — 레플리카 변경 시 관련 항목만 무효화
+
+키: (명령, 공백 정리한 키워드). 값: 렌더링된 응답 + log_command 기록 내용 + 의존 태그.
+태그 예) ("items", doc_id) — 해당 문서 변경 시 무효화
+        ("items", NAMES)  — 품목명 추가/삭제/변경 시 (검색 결과가 달라질 수 있는 항목 전부)
+        ("client", 거래처명) — 해당 거래처 견적/입금 변경 시
+
+계산 중 무효화 경쟁: token() 이후 같은 태그가 무효화됐으면 put()이 저장하지 않는다.
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+
+from utils.ledger import payments_replica, quotes_replica
+from utils.metrics import metrics
+from utils.replica import Replica, inventory_replica, items_replica
+
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "2000"))        # 최대 항목 수
+RESULT_CACHE_MB = float(os.getenv("RESULT_CACHE_MB", "8"))            # 메모리 상한 (응답 텍스트 기준)
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "600"))        # 초
+INVALIDATION_LOG = 1024  # put() 경쟁 검사용 최근 무효화 기록 수
+
+NAMES = "*names*"
+_ENTRY_OVERHEAD = 200  # 항목당 dict/튜플 등 고정 비용 추정 (바이트)
+
+
+@dataclass(slots=True)
+class CachedReply:
+    text: str
+    success: bool
+    summary: str                # log_command result_summary
+    result: str                 # lookup_total 라벨 (exact, search, not_found ...)
+    doc_refs: list[str]
+    tags: frozenset
+
+
+def normalize_keyword(keyword: str) -> str:
+    # 정확 일치 조회(find)는 대소문자/공백을 구분하므로 연속 공백만 정리
+    return " ".join(keyword.split())
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, max_mb: float = RESULT_CACHE_MB,
+                 ttl: float = RESULT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, int, CachedReply]] = OrderedDict()
+        self._by_tag: dict[tuple, set[tuple]] = {}
+        self._bytes = 0
+        self._seq = 0
+        self._log: deque[tuple[int, tuple]] = deque(maxlen=INVALIDATION_LOG)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self.invalidated = 0
+
+    def get(self, command: str, keyword: str) -> CachedReply | None:
+        key = (command, normalize_keyword(keyword))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] < time.monotonic():
+                self._drop(key)
+                self.expired += 1
+                entry = None
+            if entry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        metrics.inc("result_cache_total", command=command, result="hit" if entry else "miss")
+        return entry[2] if entry else None
+
+    def token(self) -> int:
+        """계산 시작 시점 — put()에 넘겨 그 사이 무효화 여부 확인"""
+        return self._seq
+
+    def put(self, command: str, keyword: str, reply: CachedReply, token: int):
+        key = (command, normalize_keyword(keyword))
+        size = sys.getsizeof(reply.text) + sys.getsizeof(reply.summary) + _ENTRY_OVERHEAD
+        with self._lock:
+            if token != self._seq:
+                if not self._log or token < self._log[0][0] - 1:
+                    return  # 기록 범위 밖 → 보수적으로 저장 안 함
+                if any(seq > token and tag in reply.tags for seq, tag in self._log):
+                    return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, reply)
+            self._bytes += size
+            for tag in reply.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._seq += 1
+                self._log.append((self._seq, tag))
+                for key in self._by_tag.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        self.invalidated += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        _, size, reply = self._entries.pop(key)
+        self._bytes -= size
+        for tag in reply.tags:
+            keys = self._by_tag.get(tag)
+            if keys:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "invalidated": self.invalidated,
+        }
+
+
+result_cache = ResultCache()
+
+
+# ── 무효화 배선 (레플리카 listener — 파생 집계 갱신 뒤에 등록되도록 ledger import 이후) ──
+
+def _watch_named(replica: Replica):
+    def on_change(doc_id, old, new):
+        tags = [(replica.collection, doc_id)]
+        if (old or {}).get("name") != (new or {}).get("name"):
+            tags.append((replica.collection, NAMES))
+        result_cache.invalidate(*tags)
+    replica.add_listener(on_change)
+
+
+def _watch_client(replica: Replica):
+    def on_change(doc_id, old, new):
+        names = {d.get("client_name", "") for d in (old, new) if d}
+        result_cache.invalidate(*(("client", n) for n in names))
+    replica.add_listener(on_change)
+
+
+_watch_named(items_replica)
+_watch_named(inventory_replica)
+_watch_client(quotes_replica)
+_watch_client(payments_replica)
@@ -0,0 +1,398 @@
+"""
+품목명 검색 인덱스 (한글 자모/초성 + trigram) + 자동완성용 접두 인덱스
+
+- 한글 음절 → 자모 분해: "벽면" → "ㅂㅕㄱㅁㅕㄴ" (오타/입력 중 글자 대응)
+- 초성 키: "벽면실험대" → "ㅂㅁㅅㅎㄷ" (초성 검색)
+- 공백 제거 + 소문자화로 띄어쓰기 차이 무시
+- trigram postings로 후보 추림 → 부분일치 우선, 없으면 IDF 가중 gram 커버리지로 순위화
+- 흔한 단어(후보 수천 건)의 부분일치는 짧은 키 길이 버킷부터 postings와 교집합해 검증하고,
+  그렇게 만든 길이순 목록을 gram별로 캐시 → 같은 단어 재질의는 교집합 없이 앞에서부터 검증
+  (변경 시 비움 — 품목명은 거의 바뀌지 않음)
+
+동기화는 호출 측 책임 (Replica가 자체 lock 안에서 호출).
+"""
+import heapq
+import math
+import threading
+from bisect import bisect_left, insort
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+        "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+_SYL_FIRST, _SYL_LAST = 0xAC00, 0xD7A3
+_CHO_SET = set(CHO)
+
+NGRAM = 3
+VERIFY_CAP = 256        # 교집합 후보가 이 이하면 직접 부분일치 검증
+FUZZY_BUDGET = 1_000    # 유사 검색 시 집계할 postings 총량 상한 (4000 대비 10만건 오타 top-1 재현율 -0.3%p)
+SHORTLIST = 20          # 유사도 계산 대상 최대 후보 수 (limit이 더 크면 limit)
+MIN_FUZZY_SCORE = 0.5   # IDF 가중 gram 커버리지 하한
+LENGTH_ORDER_CACHE = 64  # 길이순 postings 캐시 gram 수 (흔한 단어 부분일치)
+
+PREFIX_WORDS = 4        # 접두 키를 만들 단어 시작 위치 수 (이름 앞쪽부터)
+PREFIX_SCAN = 2_000     # 접두 범위 최대 순회 항목 수 ("ㅂ"처럼 짧은 질의)
+PREFIX_REBUILD = 256    # 대기 변경이 이보다 많으면 정렬 배열 재구성 (초기 적재)
+PREFIX_RECENT = 256     # 최근 질의 캐시 항목 수
+PREFIX_TOP = 50         # 질의별로 순위화해 보관할 결과 수 (텔레그램 인라인 결과 상한)
+
+_EMPTY = frozenset()
+
+
+def normalize(text: str) -> str:
+    """소문자화 + 공백 제거"""
+    return "".join(text.lower().split())
+
+
+def decompose(text: str) -> str:
+    """한글 음절을 자모로 분해 (그 외 문자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _SYL_FIRST <= code <= _SYL_LAST:
+            idx = code - _SYL_FIRST
+            out.append(CHO[idx // 588])
+            out.append(JUNG[(idx % 588) // 28])
+            out.append(JONG[idx % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def chosung(text: str) -> str:
+    """한글 음절 → 초성 (그 외 문자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _SYL_FIRST <= code <= _SYL_LAST:
+            out.append(CHO[(code - _SYL_FIRST) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_chosung_query(text: str) -> bool:
+    """완성형 음절 없이 초성 자음만으로 된 질의인지 ("ㅂㅁㅅㅎㄷ", "ㅅㅋ1200")"""
+    has_cho = False
+    for ch in text:
+        if _SYL_FIRST <= ord(ch) <= _SYL_LAST:
+            return False
+        if ch in _CHO_SET:
+            has_cho = True
+    return has_cho
+
+
+def ngrams(text: str, n: int = NGRAM) -> set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+@dataclass(slots=True)
+class Match:
+    doc_id: str
+    score: float
+    exact: bool  # 질의가 이름에 그대로 포함됨 (공백 무시 / 초성 포함)
+
+
+class SearchIndex:
+    def __init__(self):
+        self._keys: dict[str, tuple[str, str]] = {}  # doc_id → (자모 키, 초성 키)
+        self._grams: dict[str, set[str]] = {}
+        self._cho_grams: dict[str, set[str]] = {}
+        self._lens: tuple[dict, dict] = ({}, {})  # 키 길이 → doc_id (자모, 초성)
+        self._length_order: OrderedDict = OrderedDict()  # (slot, gram) → [길이순 doc_id, 남은 키 길이(내림차순)]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, doc_id: str, name: str):
+        if doc_id in self._keys:
+            self.remove(doc_id)
+        self._length_order.clear()
+        norm = normalize(name)
+        jamo, cho = decompose(norm), chosung(norm)
+        self._keys[doc_id] = (jamo, cho)
+        for by_len, key in zip(self._lens, (jamo, cho)):
+            by_len.setdefault(len(key), set()).add(doc_id)
+        for g in ngrams(jamo):
+            self._grams.setdefault(g, set()).add(doc_id)
+        for g in ngrams(cho):
+            self._cho_grams.setdefault(g, set()).add(doc_id)
+
+    def remove(self, doc_id: str):
+        keys = self._keys.pop(doc_id, None)
+        if not keys:
+            return
+        self._length_order.clear()
+        for by_len, key in zip(self._lens, keys):
+            ids = by_len[len(key)]
+            ids.discard(doc_id)
+            if not ids:
+                del by_len[len(key)]
+        for postings, key in ((self._grams, keys[0]), (self._cho_grams, keys[1])):
+            for g in ngrams(key):
+                ids = postings.get(g)
+                if ids:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del postings[g]
+
+    def search(self, query: str, limit: int = 10) -> list[Match]:
+        """순위화된 상위 limit건 (부분일치 우선, 없으면 유사 후보)"""
+        norm = normalize(query)
+        if not norm:
+            return []
+        if is_chosung_query(norm):
+            q, postings, slot = norm, self._cho_grams, 1
+        else:
+            q, postings, slot = decompose(norm), self._grams, 0
+
+        grams = ngrams(q)
+        if not grams:
+            # 3자모 미만 질의: postings 사용 불가 → 키 스캔
+            return self._rank_exact(q, self._keys.keys(), slot, limit)
+
+        grams = sorted(grams, key=lambda g: len(postings.get(g, _EMPTY)))
+        lists = [postings.get(g, _EMPTY) for g in grams]
+
+        # 1) 부분일치: 가장 희소한 gram의 postings를 후보로 직접 검증
+        #    (큰 집합끼리의 교집합보다 길이순 순회 + 조기 종료가 저렴)
+        if lists[0]:
+            hits = self._rank_exact(q, lists[0], slot, limit, grams[0])
+            if hits:
+                return hits
+
+        # 2) 유사 검색: 희소한 gram postings로 후보 수집 → IDF 가중 gram 커버리지로 순위화
+        overlap = Counter()
+        budget = FUZZY_BUDGET
+        for ids in lists:
+            if not ids:
+                continue
+            if overlap and len(ids) > budget:
+                break
+            overlap.update(ids)
+            budget -= len(ids)
+        if not overlap:
+            return []
+
+        n_docs = len(self._keys)
+        weights = [(ids, math.log(1 + n_docs / (1 + len(ids)))) for ids in lists]
+        total = sum(w for _, w in weights)
+        results = []
+        for doc_id, _ in overlap.most_common(max(SHORTLIST, limit)):
+            score = sum(w for ids, w in weights if doc_id in ids) / total
+            if score >= MIN_FUZZY_SCORE:
+                results.append(Match(doc_id, score, False))
+        results.sort(key=lambda m: (-m.score, len(self._keys[m.doc_id][slot]), m.doc_id))
+        return results[:limit]
+
+    def _rank_exact(self, q: str, cand, slot: int, limit: int, gram: str | None = None) -> list[Match]:
+        """후보 중 부분일치 검증 + 순위화: 이름이 짧을수록(질의와 가까울수록) → 접두 일치 우선
+
+        후보가 많으면 짧은 키부터 훑어 limit건이 찬 길이까지만 검증 (gram postings면 캐시된 길이순
+        목록부터, 아니면 키 길이 버킷 순회).
+        """
+        keys = self._keys
+        if len(cand) <= VERIFY_CAP:
+            buckets = [cand]
+        elif gram is not None:
+            ordered, rest = self._by_length(slot, gram)
+            by_len = self._lens[slot]
+            hits, stop_len, i = [], None, 0
+            while True:
+                if i == len(ordered):
+                    # 목록 끝 → 다음 길이 버킷과 교집합해 이어 붙임 (캐시 목록도 그만큼 길어짐)
+                    if not rest or (stop_len is not None and rest[-1] > stop_len):
+                        break
+                    ordered.extend(by_len.get(rest.pop(), _EMPTY) & cand)
+                    continue
+                doc_id = ordered[i]
+                i += 1
+                key = keys[doc_id][slot]
+                if stop_len is not None and len(key) > stop_len:
+                    break
+                if q in key:
+                    hits.append((len(key), not key.startswith(q), doc_id))
+                    if stop_len is None and len(hits) >= limit:
+                        stop_len = len(key)
+            hits.sort()
+            return [Match(doc_id, 1 + len(q) / n, True) for n, _, doc_id in hits[:limit]]
+        else:
+            by_len = self._lens[slot]
+            buckets = (by_len[n] for n in sorted(by_len) if n >= len(q))
+        hits = []
+        for bucket in buckets:
+            if bucket is not cand and isinstance(cand, (set, frozenset)):
+                bucket = bucket & cand
+            for doc_id in bucket:
+                key = keys[doc_id][slot]
+                if q in key:
+                    hits.append((len(key), not key.startswith(q), doc_id))
+            if len(hits) >= limit:
+                break
+        hits.sort()
+        return [Match(doc_id, 1 + len(q) / n, True) for n, _, doc_id in hits[:limit]]
+
+    def _by_length(self, slot: int, gram: str) -> list:
+        """gram postings의 길이순 목록 (지금까지 교집합한 버킷분) + 남은 키 길이 — LRU, add/remove 시 비움"""
+        cache = self._length_order
+        entry = cache.get((slot, gram))
+        if entry is None:
+            entry = cache[(slot, gram)] = [[], sorted(self._lens[slot], reverse=True)]
+            if len(cache) > LENGTH_ORDER_CACHE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end((slot, gram))
+        return entry
+
+
+def _word_keys(name: str):
+    """단어 시작 위치마다 (위치, 자모 키, 초성 키): "3M 중앙" → (0, "3m중앙"), (1, "중앙")"""
+    words = name.lower().split()
+    for pos in range(min(len(words), PREFIX_WORDS)):
+        rest = "".join(words[pos:])
+        yield pos, decompose(rest), chosung(rest)
+
+
+class PrefixIndex:
+    """이름 자동완성 — 정렬 배열 + bisect (자모 키라 입력 중 글자 "벽며"도 "벽면"에 일치)
+
+    변경은 대기열에 모았다가 조회 시 반영 (초기 적재처럼 대량이면 한 번에 정렬).
+    최근 질의 캐시: 입력할 때마다 질의가 늘어나므로("ㅂ" → "벽" → "벽면") 앞 질의의 일치 목록이
+    전부 담겨 있으면 인덱스 대신 그 목록을 좁혀 답한다. 변경 시 version으로 무효화.
+    watch 스레드(add/remove)와 핸들러(complete)가 함께 쓰므로 자체 lock 사용.
+    """
+
+    def __init__(self):
+        self._names: dict[str, str] = {}
+        self._arrays: tuple[list, list] = ([], [])  # (자모, 초성) — (키, 단어 위치, id) 정렬
+        self._pending: list[tuple[bool, str, str]] = []  # (추가 여부, id, 이름)
+        self._recent: OrderedDict = OrderedDict()  # (slot, 질의 키) → [version, 일치 항목, 전부 여부, 순위]
+        self._lock = threading.Lock()
+        self.version = 0
+
+        self.hits = 0       # 같은 질의 재사용
+        self.narrowed = 0   # 앞 질의 결과를 좁혀 응답
+        self.scans = 0      # 정렬 배열 탐색
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, doc_id: str, name: str):
+        with self._lock:
+            old = self._names.get(doc_id)
+            if old == name:
+                return
+            if old is not None:
+                self._pending.append((False, doc_id, old))
+            self._names[doc_id] = name
+            self._pending.append((True, doc_id, name))
+            self.version += 1
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            old = self._names.pop(doc_id, None)
+            if old is None:
+                return
+            self._pending.append((False, doc_id, old))
+            self.version += 1
+
+    def flush(self):
+        """대기 변경 반영 (적재 직후 미리 호출하면 첫 질의가 정렬 비용을 치르지 않음)"""
+        with self._lock:
+            self._flush()
+
+    def complete(self, query: str, limit: int = 10) -> list[tuple[str, str]]:
+        """(id, 이름) 상위 limit건 (최대 PREFIX_TOP) — 이름 맨 앞 일치 우선, 짧은 이름 우선"""
+        norm = normalize(query)
+        if not norm:
+            return []
+        slot = 1 if is_chosung_query(norm) else 0
+        q = norm if slot else decompose(norm)
+
+        with self._lock:
+            self._flush()
+            entry = self._from_recent(slot, q)
+            if entry is None:
+                entry = self._remember(slot, q, *self._scan(slot, q))
+            if entry[3] is None:
+                entry[3] = self._rank(entry[1])
+            names = self._names
+            return [(d, names[d]) for d in entry[3][:limit]]
+
+    def _rank(self, matches: list) -> list[str]:
+        best = {}
+        for _, pos, doc_id in matches:
+            if pos < best.get(doc_id, PREFIX_WORDS):
+                best[doc_id] = pos
+        names = self._names
+        return heapq.nsmallest(PREFIX_TOP, best, key=lambda d: (best[d] > 0, len(names[d]), names[d]))
+
+    def _flush(self):
+        if not self._pending:
+            return
+        if len(self._pending) > PREFIX_REBUILD:
+            arrays = ([], [])
+            for doc_id, name in self._names.items():
+                for pos, *keys in _word_keys(name):
+                    for arr, key in zip(arrays, keys):
+                        arr.append((key, pos, doc_id))
+            for arr in arrays:
+                arr.sort()
+            self._arrays = arrays
+        else:
+            for added, doc_id, name in self._pending:
+                for pos, *keys in _word_keys(name):
+                    for arr, key in zip(self._arrays, keys):
+                        entry = (key, pos, doc_id)
+                        if added:
+                            insort(arr, entry)
+                            continue
+                        i = bisect_left(arr, entry)
+                        if i < len(arr) and arr[i] == entry:
+                            del arr[i]
+        self._pending.clear()
+
+    def _scan(self, slot: int, q: str) -> tuple[list, bool]:
+        """접두 범위 순회 → (일치 항목, 범위를 끝까지 봤는지)"""
+        self.scans += 1
+        arr = self._arrays[slot]
+        start = bisect_left(arr, (q,))
+        end = min(start + PREFIX_SCAN, len(arr))
+        for i in range(start, end):
+            if not arr[i][0].startswith(q):
+                return arr[start:i], True
+        return arr[start:end], end == len(arr)
+
+    def _from_recent(self, slot: int, q: str) -> list | None:
+        """[version, 일치 항목, 전부 여부, 순위 결과] — 같은 질의 재사용 또는 앞 질의 결과 좁히기"""
+        entry = self._recent.get((slot, q))
+        if entry and entry[0] == self.version:
+            self._recent.move_to_end((slot, q))
+            self.hits += 1
+            return entry
+        for n in range(len(q) - 1, 0, -1):
+            entry = self._recent.get((slot, q[:n]))
+            if entry and entry[0] == self.version and entry[2]:
+                self.narrowed += 1
+                return self._remember(slot, q, [m for m in entry[1] if m[0].startswith(q)], True)
+        return None
+
+    def _remember(self, slot: int, q: str, matches: list, complete: bool) -> list:
+        entry = [self.version, matches, complete, None]
+        self._recent[(slot, q)] = entry
+        self._recent.move_to_end((slot, q))
+        while len(self._recent) > PREFIX_RECENT:
+            self._recent.popitem(last=False)
+        return entry
+
+    def stats(self) -> dict:
+        return {
+            "names": len(self._names),
+            "entries": len(self._arrays[0]),
+            "hits": self.hits,
+            "narrowed": self.narrowed,
+            "scans": self.scans,
+        }
@@ -0,0 +1,99 @@
+"""
+기동 프로파일 (BOT_PROFILE_STARTUP=1)
+
+- 모듈 import 시간: builtins.__import__를 감싸 최초 import만 측정 (메인 스레드, 누적/자기 시간)
+- 초기화 구간: phase("firebase") 등 — 프로파일 비활성이어도 기록은 남김 (비용 무시 가능)
+report()가 프로세스 시작 기준 경과와 함께 로그로 출력한다.
+"""
+import builtins
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+PROFILE = os.getenv("BOT_PROFILE_STARTUP") == "1"
+REPORT_TOP = int(os.getenv("BOT_PROFILE_TOP", "15"))
+
+_T0 = time.perf_counter()
+_phases: list[tuple[str, float, float]] = []   # (이름, 시작 오프셋 ms, 소요 ms)
+_imports: dict[str, list[float]] = {}          # 모듈 → [누적 ms, 자기 ms]
+_stack: list[float] = []
+_main_thread = threading.main_thread()
+_orig_import = builtins.__import__
+
+
+def _elapsed_ms(since: float = _T0) -> float:
+    return (time.perf_counter() - since) * 1000
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if threading.current_thread() is not _main_thread:
+        return _orig_import(name, globals, locals, fromlist, level)
+    key = name
+    if level:
+        try:
+            key = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+        except (ImportError, ValueError):
+            key = None
+    if key is None or key in sys.modules:
+        return _orig_import(name, globals, locals, fromlist, level)
+
+    start = time.perf_counter()
+    _stack.append(0.0)
+    try:
+        return _orig_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = _elapsed_ms(start)
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        entry = _imports.setdefault(key, [0.0, 0.0])
+        entry[0] += elapsed
+        entry[1] += elapsed - children
+
+
+def install():
+    """import 시간 측정 시작 — 무거운 import보다 먼저 호출 (프로파일 비활성이면 무시)"""
+    if PROFILE and builtins.__import__ is _orig_import:
+        builtins.__import__ = _timed_import
+
+
+def uninstall():
+    builtins.__import__ = _orig_import
+
+
+@contextmanager
+def phase(name: str):
+    """초기화 구간 기록 (firebase 초기화, 레플리카 적재 등)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, (start - _T0) * 1000, _elapsed_ms(start)))
+
+
+def report(title: str):
+    if not PROFILE:
+        return
+    lines = [f"[startup] {title} — 시작 후 {_elapsed_ms():.0f}ms"]
+    if _imports:
+        by_package: dict[str, float] = {}
+        for module, (_, self_ms) in _imports.items():
+            top = module.split(".")[0]
+            by_package[top] = by_package.get(top, 0.0) + self_ms
+        lines.append(f"  import 상위 {REPORT_TOP} (패키지별 합계 ms)")
+        for top, ms in sorted(by_package.items(), key=lambda kv: -kv[1])[:REPORT_TOP]:
+            lines.append(f"    {ms:8.1f}  {top}")
+        lines.append(f"  import 상위 {REPORT_TOP} (모듈 누적 / 자기 ms)")
+        for module, (cum, self_ms) in sorted(_imports.items(), key=lambda kv: -kv[1][0])[:REPORT_TOP]:
+            lines.append(f"    {cum:8.1f} / {self_ms:7.1f}  {module}")
+    if _phases:
+        lines.append("  초기화 구간 (시작 시점 +ms, 소요 ms)")
+        for name, offset, ms in _phases:
+            lines.append(f"    +{offset:7.0f}  {ms:8.1f}  {name}")
+    logger.info("\n".join(lines))
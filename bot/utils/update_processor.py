@@ -0,0 +1,139 @@
+"""
+업데이트 동시 처리 — 채팅별 순서 보장 + 전역 동시 실행 상한 + 대체된 요청 취소
+
+PTB 기본값은 업데이트를 하나씩 처리해 느린 /c 뒤의 /s가 기다린다.
+- 채팅(없으면 보낸 사용자)마다 도착 순서대로 직렬 실행, 서로 다른 채팅은 병렬
+- 실행 중 핸들러 수 상한 UPDATE_CONCURRENCY (대기 중 업데이트 상한은 UPDATE_QUEUE_LIMIT —
+  PTB BaseUpdateProcessor 세마포어가 담당)
+- 같은 채팅에서 같은 명령이 새로 오면 아직 끝나지 않은 이전 요청 취소 (UPDATE_CANCEL_SUPERSEDED)
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", "16"))
+UPDATE_QUEUE_LIMIT = int(os.getenv("UPDATE_QUEUE_LIMIT", "256"))
+UPDATE_CANCEL_SUPERSEDED = os.getenv("UPDATE_CANCEL_SUPERSEDED", "1") == "1"
+
+
+def chat_key(update: object):
+    """순서 보장 단위 — 채팅, 채팅이 없는 업데이트(인라인 질의 등)는 사용자, 그 외 None (순서 무관)"""
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat:
+        return ("chat", update.effective_chat.id)
+    if update.effective_user:
+        return ("user", update.effective_user.id)
+    return None
+
+
+def command_of(update: object) -> str | None:
+    """대체 판단 기준: "/s@bot 벽면" → "/s", 인라인 질의 → "inline", 일반 메시지 → None"""
+    if not isinstance(update, Update):
+        return None
+    if update.inline_query:
+        return "inline"
+    text = update.effective_message.text if update.effective_message else None
+    if not text or not text.startswith("/"):
+        return None
+    return text.split(maxsplit=1)[0].split("@", 1)[0].lower()
+
+
+@dataclass(eq=False)
+class _Pending:
+    command: str | None
+    arrived: float = field(default_factory=time.perf_counter)
+    task: asyncio.Task | None = None
+    cancelled: bool = False
+
+
+class ChatOrderedProcessor(BaseUpdateProcessor):
+    def __init__(self, concurrency: int = UPDATE_CONCURRENCY, queue_limit: int = UPDATE_QUEUE_LIMIT,
+                 cancel_superseded: bool = UPDATE_CANCEL_SUPERSEDED):
+        super().__init__(max(queue_limit, concurrency))
+        self.concurrency = concurrency
+        self.cancel_superseded = cancel_superseded
+        self._running: asyncio.Semaphore | None = None
+        self._tails: dict = {}                     # chat → 마지막 업데이트 완료 future
+        self._pending: dict = {}                   # chat → [_Pending] (도착 순)
+        self.processed = 0
+        self.superseded = 0
+
+    async def initialize(self):
+        self._running = asyncio.Semaphore(self.concurrency)
+
+    async def shutdown(self):
+        pass
+
+    async def do_process_update(self, update, coroutine):
+        key = chat_key(update)
+        entry = _Pending(command_of(update))
+        loop = asyncio.get_running_loop()
+
+        # 체인 연결은 await 전에 → 도착 순서 = 실행 순서
+        prev = self._tails.get(key) if key is not None else None
+        done = loop.create_future()
+        if key is not None:
+            self._tails[key] = done
+            entries = self._pending.setdefault(key, [])
+            if self.cancel_superseded and entry.command:
+                for old in entries:
+                    if old.command == entry.command and not old.cancelled:
+                        self._cancel(old)
+            entries.append(entry)
+
+        try:
+            if prev is not None:
+                await asyncio.wait([prev])  # 앞 업데이트 완료 대기 (취소돼도 prev는 건드리지 않음)
+            if entry.cancelled:
+                coroutine.close()
+                return
+            async with self._running:
+                if entry.cancelled:
+                    coroutine.close()
+                    return
+                metrics.observe("update_wait_ms", (time.perf_counter() - entry.arrived) * 1000)
+                entry.task = asyncio.ensure_future(coroutine)
+                try:
+                    await entry.task
+                except asyncio.CancelledError:
+                    if not entry.cancelled or asyncio.current_task().cancelling():
+                        raise  # 종료 등 외부 취소
+                else:
+                    self.processed += 1
+        finally:
+            done.set_result(None)
+            if key is not None:
+                if self._tails.get(key) is done:
+                    del self._tails[key]
+                entries = self._pending.get(key)
+                if entries:
+                    entries.remove(entry)
+                    if not entries:
+                        del self._pending[key]
+
+    def _cancel(self, entry: _Pending):
+        entry.cancelled = True
+        self.superseded += 1
+        metrics.inc("updates_superseded_total", command=entry.command or "?")
+        if entry.task and not entry.task.done():
+            entry.task.cancel()
+            logger.info(f"[updates] 새 요청으로 대체 → 실행 중 {entry.command} 취소")
+
+    def stats(self) -> dict:
+        return {
+            "chats": len(self._pending),
+            "pending": sum(len(v) for v in self._pending.values()),
+            "processed": self.processed,
+            "superseded": self.superseded,
+            "concurrency": self.concurrency,
+        }
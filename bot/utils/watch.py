@@ -0,0 +1,64 @@
+"""
+on_snapshot 감시 유지 (끊긴 watch 자동 재구독)
+
+Firestore Watch는 일시적 오류는 내부에서 재시도하지만, 복구 불가 오류로
+닫히면 다시 열리지 않는다. 감시 스레드가 주기적으로 is_active를 확인해
+지수 backoff로 재구독한다. subscribe()는 매번 새 쿼리로 watch를 만들므로
+워터마크 등 재개 지점을 반영할 수 있다.
+"""
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+WATCH_CHECK_INTERVAL = float(os.getenv("WATCH_CHECK_INTERVAL", "10"))  # 초
+WATCH_MAX_BACKOFF = float(os.getenv("WATCH_MAX_BACKOFF", "300"))       # 초
+
+
+class SupervisedWatch:
+    def __init__(self, name: str, subscribe, check_interval: float = WATCH_CHECK_INTERVAL,
+                 max_backoff: float = WATCH_MAX_BACKOFF):
+        self.name = name
+        self._subscribe = subscribe  # () → Watch
+        self.check_interval = check_interval
+        self.max_backoff = max_backoff
+        self._watch = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.resubscribes = 0
+
+    def start(self):
+        self._watch = self._subscribe()
+        self._thread = threading.Thread(target=self._supervise, name=f"watch-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    @property
+    def is_active(self) -> bool:
+        return self._watch is not None and self._watch.is_active
+
+    def _supervise(self):
+        backoff = 1.0
+        while not self._stop.wait(self.check_interval):
+            if self.is_active:
+                backoff = 1.0
+                continue
+            logger.warning(f"[watch:{self.name}] 연결 끊김 → {backoff:.0f}s 후 재구독")
+            if self._stop.wait(backoff):
+                break
+            try:
+                if self._watch is not None:
+                    self._watch.unsubscribe()
+                self._watch = self._subscribe()
+                self.resubscribes += 1
+                logger.info(f"[watch:{self.name}] 재구독 완료 ({self.resubscribes}회)")
+            except Exception:
+                logger.exception(f"[watch:{self.name}] 재구독 실패")
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def unsubscribe(self):
+        self._stop.set()
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
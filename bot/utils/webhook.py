@@ -0,0 +1,180 @@
+"""
+웹훅 수신 모드 (python main.py --webhook)
+
+Telegram → POST {WEBHOOK_PATH} (JSON Update) → 시크릿 토큰 헤더 확인 → app.update_queue.
+폴링 대기/재요청 없이 업데이트가 도착 즉시 처리된다. TLS는 앞단 리버스 프록시가 종단하고
+이 서버는 로컬 포트만 연다 (PTB run_webhook의 tornado 의존 없이 표준 asyncio 스트림 사용).
+
+- WEBHOOK_URL 설정 시 시작할 때 setWebhook(url, secret_token) 등록
+- WEBHOOK_SECRET 미설정이면 기동마다 임의 생성 (WEBHOOK_URL 필수)
+- 폴링 모드로 돌아가면 PTB start_polling이 웹훅을 해제한다
+"""
+import asyncio
+import hmac
+import json
+import logging
+import os
+import secrets
+import signal
+
+from telegram import Update
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")        # 외부 공개 URL (예: https://bot.example.com/telegram)
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")  # X-Telegram-Bot-Api-Secret-Token (1~256자, A-Z a-z 0-9 _ -)
+
+SECRET_HEADER = "x-telegram-bot-api-secret-token"
+MAX_BODY = 1024 * 1024
+_STATUS = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+# ── 최소 HTTP/1.1 서버 (keep-alive, Content-Length 본문만) ──
+
+class HttpServer:
+    """asyncio 서버 + 열린 연결 태스크 — close()는 keep-alive/롱폴링 중인 연결까지 끊고 기다림"""
+
+    def __init__(self, server: asyncio.AbstractServer, connections: set):
+        self._server = server
+        self._connections = connections
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self._server.close()
+        for task in self._connections:
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+
+async def serve_http(handler, host: str, port: int) -> HttpServer:
+    """handler(method, path, headers, body) → (status, body bytes, content-type)"""
+    connections = set()
+
+    async def on_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", "0"))
+                if length > MAX_BODY:
+                    status, body, ctype = 413, b"", "text/plain"
+                    keep_alive = False
+                else:
+                    payload = await reader.readexactly(length) if length else b""
+                    status, body, ctype = await handler(method, path, headers, payload)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+
+                writer.write((f"HTTP/1.1 {status} {_STATUS.get(status, '')}\r\n"
+                              f"Content-Type: {ctype}\r\nContent-Length: {len(body)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            pass  # close() — 연결만 끊음 (취소된 채로 끝나면 3.11 start_server 콜백이 트레이스백 출력)
+        finally:
+            connections.discard(task)
+            writer.close()
+
+    return HttpServer(await asyncio.start_server(on_connection, host, port), connections)
+
+
+class WebhookServer:
+    def __init__(self, app, secret: str, path: str = WEBHOOK_PATH,
+                 listen: str = WEBHOOK_LISTEN, port: int = WEBHOOK_PORT):
+        self.app = app
+        self.secret = secret
+        self.path = path
+        self.listen = listen
+        self.port = port
+        self._server = None
+        self.received = 0
+        self.rejected = 0
+
+    async def start(self):
+        self._server = await serve_http(self._handle, self.listen, self.port)
+        if not self.port:
+            self.port = self._server.port
+        logger.info(f"웹훅 수신: http://{self.listen}:{self.port}{self.path}")
+
+    async def stop(self):
+        if self._server:
+            await self._server.close()
+            self._server = None
+
+    async def _handle(self, method, path, headers, body):
+        if path.split("?")[0] != self.path:
+            return 404, b"", "text/plain"
+        if method != "POST":
+            return 405, b"", "text/plain"
+        # 바이트로 비교 — str끼리는 비ASCII 헤더 값에서 TypeError
+        if not hmac.compare_digest(headers.get(SECRET_HEADER, "").encode("utf-8"), self.secret.encode("utf-8")):
+            self.rejected += 1
+            return 403, b"", "text/plain"
+        try:
+            update = Update.de_json(json.loads(body), self.app.bot)
+        except (ValueError, TypeError, KeyError):
+            return 400, b"", "text/plain"
+        self.received += 1
+        await self.app.update_queue.put(update)
+        return 200, b"ok", "text/plain"
+
+    def stats(self) -> dict:
+        return {"received": self.received, "rejected": self.rejected}
+
+
+async def serve_webhook(app, server: WebhookServer, url: str | None = WEBHOOK_URL, stop: asyncio.Event | None = None):
+    """Application 수명주기 (run_polling 대응) — stop 이벤트 또는 SIGINT/SIGTERM까지 실행"""
+    stop = stop or asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    async with app:
+        if app.post_init:
+            await app.post_init(app)
+        await app.start()
+        await server.start()
+        # 수신 준비가 끝난 뒤 등록 → 등록 직후 도착하는 업데이트 유실 없음
+        if url:
+            await app.bot.set_webhook(url, secret_token=server.secret, allowed_updates=Update.ALL_TYPES)
+            logger.info(f"setWebhook 등록: {url}")
+        try:
+            await stop.wait()
+        finally:
+            await server.stop()
+            await app.stop()
+            if app.post_stop:
+                await app.post_stop(app)
+    if app.post_shutdown:
+        await app.post_shutdown(app)
+
+
+def webhook_secret() -> str:
+    if WEBHOOK_SECRET:
+        return WEBHOOK_SECRET
+    if not WEBHOOK_URL:
+        raise SystemExit("웹훅 모드: WEBHOOK_URL 또는 WEBHOOK_SECRET 설정 필요")
+    return secrets.token_urlsafe(32)
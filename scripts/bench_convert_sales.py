@@ -0,0 +1,92 @@
+"""
+매출 Excel 변환 벤치마크 — 합성 통합문서로 workers 수별 변환 시간 비교
+
+연도별 통합문서(월별 시트 12개, 헤더 5행)를 임시 디렉터리에 생성 →
+convert_sales_excel.convert()를 workers 1, 2, 4, ... CPU 수로 실행, 결과가 모두 같은지 확인.
+
+사용법:
+  python scripts/bench_convert_sales.py [--years 3] [--rows 2000] [--workers 1,2,4]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from convert_sales_excel import MONTH_SHEETS, HEADER_ROW, convert  # noqa: E402
+
+VENDORS = ["대성금속", "한국과학", "서울대학교", "미래바이오", "케미칼랩", "대한병원"]
+ITEMS = ["주석 분말 5~7um 1kg", "PVA 2000 500g", "비커 500ml", "피펫 팁 1000ul", "라텍스 장갑 M", "흄후드 필터"]
+
+
+def arg(name, default):
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def make_workbook(path, year, rows, rng, write_only=True):
+    """write_only=True: 인라인 문자열로 저장 (빠름) / False: 엑셀처럼 공유 문자열 표로 저장"""
+    wb = openpyxl.Workbook(write_only=write_only)
+    if not write_only:
+        wb.remove(wb.active)
+    for month, sheet_name in enumerate(MONTH_SHEETS, 1):
+        ws = wb.create_sheet(sheet_name)
+        for _ in range(HEADER_ROW - 1):
+            ws.append([])
+        ws.append(["Date", "발주처", "업종", "PO No.", "END USER", "진행업체", "Item", "Q'ty",
+                   "단가", "발주총액", "지출", "이익금"])
+        start = datetime(year, month, 1)
+        for i in range(rows):
+            if rng.random() < 0.05:
+                ws.append([])  # 빈 행
+                continue
+            qty = rng.randint(1, 20)
+            price = rng.randrange(10_000, 2_000_000, 100)
+            cost = int(price * rng.uniform(0.5, 0.9))
+            ws.append([start + timedelta(days=i % 28), "고랩", "제조", f"PO-{year}{month:02d}-{i}",
+                       rng.choice(VENDORS), "고랩컴퍼니", rng.choice(ITEMS), qty, price,
+                       qty * price, qty * cost, qty * (price - cost)])
+    wb.save(path)
+
+
+def main():
+    years = arg("--years", 3)
+    rows = arg("--rows", 2000)
+    cpu = os.cpu_count() or 1
+    workers_list = [int(w) for w in arg("--workers", ",".join(str(w) for w in sorted({1, 2, 4, cpu}))).split(",")]
+    rng = random.Random(7)
+
+    tmp = tempfile.mkdtemp(prefix="golab-sales-bench-")
+    t0 = time.perf_counter()
+    paths = []
+    for year in range(2025 - years + 1, 2026):
+        path = os.path.join(tmp, f"GLC 수익정리({year})프로그램용.xlsx")
+        make_workbook(path, year, rows, rng)
+        paths.append(path)
+    print(f"합성 통합문서 {years}개 × 시트 12 × {rows:,}행 생성 {time.perf_counter() - t0:.1f}s ({tmp})")
+    print(f"CPU {cpu}개\n")
+
+    baseline = None
+    reference = None
+    print(f"{'workers':>7} {'경과(s)':>8} {'시트 합계(s)':>11} {'가속':>6} {'레코드':>8}")
+    for workers in workers_list:
+        t = time.perf_counter()
+        records, skipped, timings, _, _ = convert(paths, workers)
+        wall = time.perf_counter() - t
+        baseline = baseline or wall
+        if reference is None:
+            reference = records
+        assert records == reference, f"workers={workers} 결과 불일치"
+        print(f"{workers:>7} {wall:>8.2f} {sum(x[3] for x in timings):>11.2f} "
+              f"{baseline / wall:>5.2f}x {len(records):>8,}")
+    print("\n[OK] 모든 workers 설정에서 결과 동일")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+정규화 벤치마크 — 셀 단위 일반 경로 vs 열 단위 고속 경로 (scripts/normalize.py)
+
+매출 시트와 같은 열 구성(날짜, PO No., 거래처, 진행업체, 품목, 수량, 단가, 금액 3개)의 합성 행을
+메모리에 만들어 정규화만 측정. 시나리오:
+  typed — 엑셀 서식대로 읽힌 값 (datetime 날짜, 정수 금액)
+  text  — 텍스트로 입력된 시트 ("2025.1.5" 날짜, "1,234,000" 금액, 일부 시리얼/기타 형식 섞임)
+경로:
+  셀 단위       NORMALIZERS를 셀마다 호출, 메모 없음 (기존 변환 스크립트와 같은 방식)
+  셀 단위+메모  NORMALIZERS를 셀마다 호출 (문자열 날짜/금액 LRU 메모)
+  열 단위       normalize_rows (열 형식 판별 → 열 전용 함수 map)
+세 경로 결과가 모두 같은지 확인.
+
+사용법:
+  python scripts/bench_normalize.py [--rows 50000] [--repeat 3]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import normalize  # noqa: E402
+from normalize import NORMALIZERS, normalize_rows  # noqa: E402
+
+VENDORS = ["대성금속", "한국과학", "서울대학교", "미래바이오", "케미칼랩", "대한병원"]
+ITEMS = ["주석 분말 5~7um 1kg", "PVA 2000 500g", "비커 500ml", "피펫 팁 1000ul", "라텍스 장갑 M", "흄후드 필터"]
+COLUMNS = [(0, "date"), (3, "str"), (4, "str"), (5, "str"), (6, "str"),
+           (7, "num"), (8, "num"), (9, "num"), (10, "num"), (11, "num")]
+
+
+def arg(name, default):
+    if name in sys.argv:
+        return type(default)(sys.argv[sys.argv.index(name) + 1])
+    return default
+
+
+def make_rows(n, text, rng):
+    rows = []
+    start = datetime(2025, 1, 1)
+    for i in range(n):
+        if rng.random() < 0.05:
+            rows.append((None,) * 12)  # 빈 행
+            continue
+        day = start + timedelta(days=i % 365)
+        qty = rng.randint(1, 20)
+        price = rng.randrange(10_000, 2_000_000, 100)
+        cost = int(price * rng.uniform(0.5, 0.9))
+        amounts = [qty, price, qty * price, qty * cost, qty * (price - cost)]
+        if text:
+            r = rng.random()
+            if r < 0.9:
+                sale_date = f"{day.year}.{day.month}.{day.day}"
+            elif r < 0.95:
+                sale_date = str((day - datetime(1899, 12, 30)).days)  # 시리얼
+            else:
+                sale_date = day.strftime("%Y-%m-%d 00:00:00")
+            amounts = [str(qty)] + [f"{a:,}" for a in amounts[1:]]
+        else:
+            sale_date = day
+        rows.append((sale_date, "고랩", "제조", f"PO-{i}", f" {rng.choice(VENDORS)}", "고랩컴퍼니",
+                     rng.choice(ITEMS), *amounts))
+    return rows
+
+
+def _uncached_date(v):
+    if v is None:
+        return ""
+    if isinstance(v, (datetime, date)):
+        return v.strftime("%Y-%m-%d")
+    return normalize._date_text.__wrapped__(str(v).strip())
+
+
+def _uncached_num(v):
+    if v is None:
+        return 0
+    if isinstance(v, (int, float)):
+        return v if v == v else 0
+    return normalize._num_text.__wrapped__(str(v))
+
+
+def per_cell(rows, memo):
+    fns = dict(NORMALIZERS) if memo else dict(NORMALIZERS, date=_uncached_date, num=_uncached_num)
+    columns = [(i, fns[kind]) for i, kind in COLUMNS]
+    return [tuple(fn(row[i]) for i, fn in columns) for row in rows]
+
+
+def by_column(rows):
+    return [values for _, values in normalize_rows(rows, COLUMNS)]
+
+
+def measure(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        normalize._date_text.cache_clear()
+        normalize._num_text.cache_clear()
+        t = time.perf_counter()
+        result = fn()
+        wall = time.perf_counter() - t
+        best = wall if best is None else min(best, wall)
+    return best, result
+
+
+def main():
+    n = arg("--rows", 50000)
+    repeat = arg("--repeat", 3)
+    rng = random.Random(7)
+    print(f"행 {n:,} × 정규화 열 {len(COLUMNS)}개, 최솟값 / {repeat}회\n")
+    print(f"{'시나리오':<8} {'경로':<12} {'시간(s)':>8} {'행당(us)':>9} {'가속':>6}")
+    for scenario in ("typed", "text"):
+        rows = make_rows(n, scenario == "text", rng)
+        baseline = reference = None
+        for label, fn in (("셀 단위", lambda: per_cell(rows, memo=False)),
+                          ("셀 단위+메모", lambda: per_cell(rows, memo=True)),
+                          ("열 단위", lambda: by_column(rows))):
+            wall, result = measure(fn, repeat)
+            baseline = baseline or wall
+            if reference is None:
+                reference = result
+            assert result == reference, f"{scenario}/{label} 결과 불일치"
+            print(f"{scenario:<8} {label:<12} {wall:>8.3f} {wall / n * 1e6:>9.2f} {baseline / wall:>5.1f}x")
+    print("\n[OK] 모든 경로 결과 동일")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+XLSX 읽기 엔진 벤치마크 — openpyxl(read_only) vs fast(xlsx_reader.py iterparse)
+
+합성 통합문서(월별 시트 12개 × --rows행, 기본 12만 행)를 만들고 엔진별로
+  1) 셀 읽기만: iter_rows(min_row=DATA_START, max_col=MAX_COL) 전 시트
+  2) 전체 변환: convert_sales_excel.convert(workers=1)
+를 각각 새 프로세스에서 실행해 시간·최대 RSS를 비교하고, 읽은 값/레코드가 같은지 확인.
+--inline: 인라인 문자열로 저장 (openpyxl write_only 기본값, 엑셀 저장 파일은 공유 문자열)
+
+사용법:
+  python scripts/bench_xlsx_reader.py [--rows 10000] [--repeat 3] [--inline]
+"""
+import hashlib
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource  # Unix 전용 — Windows에서는 RSS 열을 "-"로 표시
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_convert_sales import arg, make_workbook  # noqa: E402
+from convert_sales_excel import DATA_START, MAX_COL, MONTH_SHEETS, convert, row_hash  # noqa: E402
+from xlsx_reader import ENGINES, open_workbook  # noqa: E402
+
+
+def read_cells(path, engine):
+    """→ (초, 행 수, 값 다이제스트, 최대 RSS MB)"""
+    t = time.perf_counter()
+    digest = hashlib.sha256()
+    n = 0
+    wb = open_workbook(path, engine)
+    for name in MONTH_SHEETS:
+        for row in wb[name].iter_rows(min_row=DATA_START, max_col=MAX_COL, values_only=True):
+            digest.update(repr(row).encode("utf-8"))
+            n += 1
+    wb.close()
+    return time.perf_counter() - t, n, digest.hexdigest(), _maxrss_mb()
+
+
+def convert_all(path, engine):
+    t = time.perf_counter()
+    records = convert([path], workers=1, engine=engine)[0]
+    digest = hashlib.sha256("".join(row_hash(r) for r in records).encode()).hexdigest()
+    return time.perf_counter() - t, len(records), digest, _maxrss_mb()
+
+
+def _maxrss_mb():
+    """최대 RSS (MB), 측정 불가면 None"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024  # macOS는 바이트, Linux는 KB
+
+
+def isolated(fn, *args):
+    """새 프로세스(spawn)에서 실행 (이전 측정·통합문서 생성의 메모리 영향 제거)"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(fn, *args).result()
+
+
+def main():
+    rows = arg("--rows", 10_000)
+    repeat = arg("--repeat", 3)
+    write_only = "--inline" in sys.argv
+
+    tmp = tempfile.mkdtemp(prefix="golab-xlsx-bench-")
+    path = os.path.join(tmp, "GLC 수익정리(2025)프로그램용.xlsx")
+    t0 = time.perf_counter()
+    # 생성도 별도 프로세스 (Linux ru_maxrss는 fork/exec 시 부모 값이 이어짐 → 부모를 작게 유지)
+    isolated(make_workbook, path, 2025, rows, random.Random(7), write_only)
+    print(f"합성 통합문서: 시트 12 × {rows:,}행 = {12 * rows:,}행, "
+          f"{os.path.getsize(path) / 1e6:.1f}MB ({'인라인' if write_only else '공유'} 문자열) "
+          f"생성 {time.perf_counter() - t0:.1f}s\n")
+
+    for label, fn in (("셀 읽기", read_cells), ("전체 변환", convert_all)):
+        print(f"[{label}] 최소/{repeat}회")
+        print(f"{'엔진':<9} {'시간(s)':>8} {'행/s':>10} {'RSS(MB)':>8} {'가속':>6}")
+        results = {}
+        for engine in ENGINES:
+            runs = [isolated(fn, path, engine) for _ in range(repeat)]
+            best = min(runs)
+            results[engine] = best
+            base = results[ENGINES[0]][0]
+            rss = f"{best[3]:>8.0f}" if best[3] is not None else f"{'-':>8}"
+            print(f"{engine:<9} {best[0]:>8.2f} {best[1] / best[0]:>10,.0f} {rss} "
+                  f"{base / best[0]:>5.2f}x")
+        digests = {r[2] for r in results.values()}
+        assert len(digests) == 1, f"{label}: 엔진별 결과 불일치"
+        print(f"[OK] 엔진별 결과 동일 ({results[ENGINES[0]][1]:,}건)\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,29 @@
 GoLab v1.6.1 — 매출 Excel → sales_import.json 변환
 
 입력: SALES/GLC 수익정리(2025)프로그램용.xlsx (월별 시트 1월~12월)
+      또는 디렉터리/글롭 (여러 연도 통합문서) — (통합문서, 시트) 단위로 프로세스 풀 분산
 출력: web/data/sales_import.json
 
+sourceRowId 접두는 파일명으로만 결정 (같이 변환하는 파일 수와 무관 → idempotencyKey 안정):
+  기본 입력(2025) 통합문서는 기존과 동일한 "1월!R6" — 이미 가져온 데이터의 idempotencyKey 유지
+  그 외 통합문서는 파일명 접두 "GLC 수익정리(2024)프로그램용:1월!R6"
+
+증분 변환 (manifest: web/data/sales_import.manifest.json):
+  시트 지문 = 공유 문자열·숫자 서식 인덱스를 값으로 치환한 시트 XML의 해시 (zip 파트만 읽음)
+  지문이 같은 시트는 건너뛰고 이전 출력의 레코드 재사용. 행 단위 해시(sourceRowId → 해시,
+  idempotencyKey)를 비교해 delta 출력 (web/data/sales_import.delta.json — 항목당
+  {"op": "add" | "change" | "remove", ...}). --full: 재사용 없이 전체 재변환
+  manifest는 형식과 무관하게 1개 — 마지막으로 쓴 출력 파일명과 그 내용 해시를 기록해, 지금 쓸
+  출력이 그 파일 그대로일 때만 시트 재사용. delta는 항상 직전 실행의 manifest 기준
+  (출력 파일이 없거나 --full이어도 → 형식을 바꿔 돌려도 변경/삭제 누락 없음)
+
+출력 형식 (scripts/record_io.py): 레코드를 만드는 즉시 기록 → 레코드는 시트 1개분만 메모리에
+  (manifest 행 해시·중복 검사용 키만 행 수에 비례)
+  --format json (기본, 기존과 같은 들여쓰기 배열) | ndjson (한 줄 1건, 약 80% 크기)
+  --compress none | gzip | zstd → sales_import.ndjson.gz 등 (gzip 약 6%, delta도 같은 형식)
+
+시트 읽기 엔진: --engine openpyxl (기본) | fast (scripts/xlsx_reader.py — 시트 XML iterparse, 결과 동일)
+
 컬럼 매핑 (Row 5 헤더 기준):
   Col 0: Date       → saleDate
   Col 4: END USER   → vendor (고객)
@@ -18,13 +39,22 @@ GoLab v1.6.1 — 매출 Excel → sales_import.json 변환
 """
 import sys
 import os
-import io
+import glob
 import json
+import contextlib
+import functools
 import hashlib
+import itertools
 import re
-from datetime import datetime, date
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+from normalize import norm_num, norm_str, normalize_rows
+from record_io import RecordWriter, iter_records, output_args, output_path
+from xlsx_reader import ENGINES, open_workbook, sheet_parts
 
 # ── 경로 계산 (크로스 플랫폼) ──
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -32,6 +62,14 @@ BASE_DIR = os.path.dirname(SCRIPT_DIR)
 DEFAULT_INPUT = os.path.join(BASE_DIR, "SALES", "GLC 수익정리(2025)프로그램용.xlsx")
 OUTPUT_DIR = os.path.join(BASE_DIR, "web", "data")
 OUTPUT = os.path.join(OUTPUT_DIR, "sales_import.json")
+MANIFEST = os.path.join(OUTPUT_DIR, "sales_import.manifest.json")
+DELTA = os.path.join(OUTPUT_DIR, "sales_import.delta.json")
+
+# 접두 없는 기존 sourceRowId("1월!R6")를 쓰는 통합문서 (파일명)
+LEGACY_WORKBOOKS = {os.path.basename(DEFAULT_INPUT)}
+
+# process_sheet 변환 규칙이 바뀌면 올릴 것 → 기존 manifest 무효 (전체 재변환)
+MANIFEST_VERSION = 1
 
 # 월별 시트명 (데이터 시트만)
 MONTH_SHEETS = ["1월", "2월", "3월", "4월", "5월", "6월",
@@ -40,69 +78,25 @@ MONTH_SHEETS = ["1월", "2월", "3월", "4월", "5월", "6월",
 
 HEADER_ROW = 5   # 1-indexed: Date, 발주처, 업종, PO No., END USER, ...
 DATA_START = 6   # 데이터 시작 행
+MAX_COL = 12     # Col 0~11만 사용 (fast 엔진은 그 뒤 셀 값 변환 생략)
+
+# 열 정규화 (열 인덱스, 종류) — process_sheet에서 이 순서로 풀어 씀 (짧은 행은 빈 칸으로)
+COLUMNS = [(0, "date"),    # Date → saleDate
+           (3, "str"),     # PO No.
+           (4, "str"),     # END USER (고객)
+           (5, "str"),     # 진행업체
+           (6, "str"),     # Item
+           (7, "num"),     # Q'ty
+           (8, "num"),     # 단가 (매출 단가)
+           (9, "num"),     # 발주총액 (검증용)
+           (10, "num"),    # 지출
+           (11, "num")]    # 이익금
 
 
 # ═══════════════════════════════════════════
-# 정규화 함수 (convert_trade_excel.py 참조)
+# idempotency 키 (정규화 규칙은 scripts/normalize.py)
 # ═══════════════════════════════════════════
 
-def norm_str(v):
-    """문자열 정규화: None → "", strip"""
-    if v is None:
-        return ""
-    return str(v).strip()
-
-
-def norm_upper(v):
-    """대문자 정규화 (품번용)"""
-    return norm_str(v).upper()
-
-
-def norm_num(v):
-    """숫자 정규화: 콤마/₩/공백 제거, 파싱 실패 → 0"""
-    if v is None:
-        return 0
-    if isinstance(v, (int, float)):
-        return v if v == v else 0  # NaN 체크
-    s = str(v).replace(",", "").replace("₩", "").replace(" ", "").strip()
-    try:
-        return float(s) if "." in s else int(s)
-    except (ValueError, TypeError):
-        return 0
-
-
-def norm_date(v):
-    """날짜 정규화 → YYYY-MM-DD"""
-    if v is None:
-        return ""
-    if isinstance(v, datetime):
-        return v.strftime("%Y-%m-%d")
-    if isinstance(v, date):
-        return v.strftime("%Y-%m-%d")
-    s = str(v).strip()
-    # 엑셀 시리얼 넘버 (숫자)
-    try:
-        num = float(s)
-        if 40000 < num < 50000:
-            from datetime import timedelta
-            base = datetime(1899, 12, 30)
-            return (base + timedelta(days=int(num))).strftime("%Y-%m-%d")
-    except (ValueError, TypeError):
-        pass
-    # YYYY-MM-DD, YYYY/MM/DD, YYYY.MM.DD
-    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"):
-        try:
-            return datetime.strptime(s[:10], fmt).strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    # datetime 문자열 "2025-01-02 00:00:00"
-    try:
-        return datetime.strptime(s[:19], "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d")
-    except ValueError:
-        pass
-    return s[:10] if len(s) >= 10 else ""
-
-
 def make_idempotency_key(rec, sheet_name, row_num):
     """결정적 idempotency 키: sourceRowId 우선, hash fallback"""
     src = "|".join([
@@ -129,24 +123,10 @@ def process_sheet(ws, sheet_name):
     skipped = 0
     global_row = 0
 
-    for row_idx, row in enumerate(ws.iter_rows(min_row=DATA_START, values_only=True), DATA_START):
+    rows = ws.iter_rows(min_row=DATA_START, max_col=MAX_COL, values_only=True)
+    for row_idx, (_, values) in enumerate(normalize_rows(rows, COLUMNS), DATA_START):
         global_row = row_idx
-        cells = list(row) if row else []
-
-        # 최소 9개 컬럼 필요 (Date ~ 발주총액)
-        if len(cells) < 10:
-            cells.extend([None] * (10 - len(cells)))
-
-        sale_date = norm_date(cells[0])
-        vendor = norm_str(cells[4])        # END USER (고객)
-        agent = norm_str(cells[5])         # 진행업체
-        item_name = norm_str(cells[6])     # Item
-        qty = norm_num(cells[7])
-        unit_price = norm_num(cells[8])    # 매출 단가
-        order_total = norm_num(cells[9])   # 발주총액 (검증용)
-        cost = norm_num(cells[10]) if len(cells) > 10 else 0  # 지출
-        profit = norm_num(cells[11]) if len(cells) > 11 else 0  # 이익금
-        doc_no = norm_str(cells[3])        # PO No.
+        sale_date, doc_no, vendor, agent, item_name, qty, unit_price, order_total, cost, profit = values
 
         # 빈 행 건너뛰기: 날짜 없거나 (vendor + itemName) 모두 비어있으면 스킵
         if not sale_date or (not vendor and not item_name):
@@ -187,89 +167,464 @@ def process_sheet(ws, sheet_name):
     return records, skipped
 
 
-def main():
-    import openpyxl
+# ═══════════════════════════════════════════
+# 시트 지문 / manifest (증분 변환)
+# ═══════════════════════════════════════════
 
-    input_path = DEFAULT_INPUT
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_CELL = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_SST_REF = re.compile(rb't="s"[^>]*>\s*<v>(\d+)</v>')  # 리터럴로 시작 → 빠른 탐색
+_STYLE_ATTR = re.compile(rb' s="(\d+)"')
+_VALUE = re.compile(rb'<v>(\d+)</v>')
+
+
+def _shared_strings(zf):
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    root = ET.fromstring(zf.read("xl/sharedStrings.xml"))
+    return ["".join(t.text or "" for t in si.iter(_NS + "t")) for si in root.iter(_NS + "si")]
+
+
+def _number_formats(zf):
+    """cellXfs 인덱스 → 서식 (날짜/숫자 판별에 영향)"""
+    if "xl/styles.xml" not in zf.namelist():
+        return []
+    root = ET.fromstring(zf.read("xl/styles.xml"))
+    codes = {f.get("numFmtId"): f.get("formatCode", "") for f in root.iter(_NS + "numFmt")}
+    xfs = root.find(_NS + "cellXfs")
+    return [f"{xf.get('numFmtId', '0')}:{codes.get(xf.get('numFmtId'), '')}"
+            for xf in (xfs if xfs is not None else [])]
+
+
+def sheet_fingerprints(path, sheet_names, known=None):
+    """시트명 → (빠른 지문, 정규화 지문)
+
+    빠른 지문: 시트 XML 원본 + 참조 공유 문자열·숫자 서식 (정규식 findall만 — 대부분의 재실행은 여기서 끝)
+    정규화 지문: 인덱스를 실제 문자열·서식으로 치환한 XML — 다른 시트 편집으로 엑셀이 공유 문자열을
+    재번호해도 그대로. known(이전 값)의 빠른 지문과 같으면 계산 생략.
+    """
+    known = known or {}
+    with zipfile.ZipFile(path) as zf:
+        parts = sheet_parts(zf)
+        strings = [t.encode("utf-8") for t in _shared_strings(zf)]
+        formats = [f.encode("utf-8") for f in _number_formats(zf)]
+
+        def lookup(table, i):
+            i = int(i)
+            return table[i] if i < len(table) else b"?"
+
+        def canonical(m):
+            attrs = _STYLE_ATTR.sub(lambda s: b' s="' + lookup(formats, s.group(1)) + b'"', m.group(1))
+            body = m.group(2) or b""
+            if b't="s"' in attrs:
+                body = _VALUE.sub(lambda v: b"<v>" + lookup(strings, v.group(1)) + b"</v>", body)
+            return b"<c" + attrs + b">" + body + b"</c>"
+
+        prints = {}
+        for name in sheet_names:
+            xml = zf.read(parts[name])
+            h = hashlib.sha256(xml)
+            for i in sorted(set(_SST_REF.findall(xml)), key=int):
+                h.update(b"\0s" + i + b"=" + lookup(strings, i))
+            for i in sorted(set(_STYLE_ATTR.findall(xml)), key=int):
+                h.update(b"\0f" + i + b"=" + lookup(formats, i))
+            quick = h.hexdigest()[:32]
+            if name in known and known[name][0] == quick:
+                prints[name] = known[name]
+            else:
+                prints[name] = (quick, hashlib.sha256(_CELL.sub(canonical, xml)).hexdigest()[:32])
+    return prints
+
+
+def row_hash(rec):
+    """레코드 전체 내용 해시 (memo 등 idempotencyKey에 없는 필드 변경도 감지)"""
+    return hashlib.sha256(json.dumps(rec, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def sheet_of(source_row_id):
+    return source_row_id.rsplit("!R", 1)[0]
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
 
-    # CLI 인자 처리
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--help":
-            print("사용법: python convert_sales_excel.py [--file <경로>] [--test]")
-            print(f"  기본 입력: {DEFAULT_INPUT}")
-            print(f"  출력: {OUTPUT}")
-            return
-        if sys.argv[1] == "--file" and len(sys.argv) > 2:
-            input_path = sys.argv[2]
 
-    test_mode = "--test" in sys.argv
+def output_digest(path):
+    """출력 파일 내용 해시 (없으면 None) — manifest가 가리키는 출력인지 확인용"""
+    h = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
 
-    # 입력 파일 확인
-    if not os.path.isfile(input_path):
-        print(f"[FATAL] 입력 파일 없음: {input_path}")
-        sys.exit(1)
 
-    print(f"=== GoLab 매출 Excel → JSON 변환 ===")
-    print(f"입력: {input_path}")
-    print(f"출력: {OUTPUT}\n")
+def manifest_output(path):
+    return {"path": os.path.basename(path), "digest": output_digest(path)}
 
-    wb = openpyxl.load_workbook(input_path, read_only=True, data_only=True)
 
-    all_records = []
-    total_skipped = 0
+def manifest_rows(manifest):
+    """manifest → {sourceRowId: [행 해시, idempotencyKey]} (전 시트)"""
+    rows = {}
+    for sheet in (manifest or {}).get("sheets", {}).values():
+        rows.update(sheet["rows"])
+    return rows
 
-    for sheet_name in MONTH_SHEETS:
-        # 시트명 공백 처리 (10월 뒤 공백 등)
-        actual_name = None
-        for sn in wb.sheetnames:
-            if sn.strip() == sheet_name.strip():
-                actual_name = sn
-                break
 
-        if not actual_name:
-            print(f"  [SKIP] 시트 '{sheet_name}' 없음")
-            continue
+def delta_entry(old_rows, new_manifest, rec):
+    """레코드 1건 → 추가/변경 delta 항목 (변경 없으면 None, 변경은 이전 idempotencyKey 포함)"""
+    rid = rec["sourceRowId"]
+    old = old_rows.get(rid)
+    if old is None:
+        return {"op": "add", "record": rec}
+    if old[0] != new_manifest["sheets"][sheet_of(rid)]["rows"][rid][0]:
+        return {"op": "change", "previousKey": old[1], "record": rec}
+    return None
+
 
-        ws = wb[actual_name]
-        records, skipped = process_sheet(ws, actual_name.strip())
+def removed_entries(old_rows, new_manifest):
+    sheets = new_manifest["sheets"]
+    for rid, old in old_rows.items():
+        if rid not in sheets.get(sheet_of(rid), {}).get("rows", {}):
+            yield {"op": "remove", "sourceRowId": rid, "idempotencyKey": old[1]}
 
-        if records:
-            print(f"  [{actual_name.strip():>3}] {len(records):>3}건 추출 (skip {skipped}건)")
-            all_records.extend(records)
+
+# ═══════════════════════════════════════════
+# 병렬 변환: (통합문서, 시트) 단위 작업
+# ═══════════════════════════════════════════
+
+_open_workbooks = {}  # 작업 프로세스별 열린 통합문서 (같은 파일의 다음 시트 재사용)
+
+
+def _open_workbook(path, engine="openpyxl"):
+    key = (path, engine, os.path.getmtime(path), os.path.getsize(path))  # 파일이 바뀌면 다시 열기
+    wb = _open_workbooks.get(key)
+    if wb is None:
+        _close_workbooks()
+        wb = _open_workbooks[key] = open_workbook(path, engine)
+    return wb
+
+
+def _close_workbooks():
+    for wb in _open_workbooks.values():
+        wb.close()
+    _open_workbooks.clear()
+
+
+def resolve_inputs(spec):
+    """파일 / 디렉터리(*.xlsx) / 글롭 → 정렬된 통합문서 경로 (엑셀 임시파일 ~$ 제외)"""
+    if os.path.isdir(spec):
+        paths = glob.glob(os.path.join(spec, "*.xlsx"))
+    elif os.path.isfile(spec):
+        paths = [spec]
+    else:
+        paths = glob.glob(spec)
+    return sorted(p for p in paths if not os.path.basename(p).startswith("~$"))
+
+
+def source_prefix(path):
+    """sourceRowId 접두 — 파일명만으로 결정 (단독 변환이든 디렉터리 변환이든 같은 키)"""
+    name = os.path.basename(path)
+    return "" if name in LEGACY_WORKBOOKS else os.path.splitext(name)[0] + ":"
+
+
+def plan_jobs(paths):
+    """→ [(경로, 실제 시트명, sourceRowId 접두 시트명)], 없는 시트 목록
+
+    시트 순서 = 경로 순 → MONTH_SHEETS 순 (결과 병합 순서와 동일)
+    """
+    jobs, missing = [], []
+    for path in paths:
+        prefix = source_prefix(path)
+        # 시트 목록만 필요 → workbook.xml만 읽음 (openpyxl은 열 때 공유 문자열 전체를 적재)
+        with zipfile.ZipFile(path) as zf:
+            names = {sn.strip(): sn for sn in sheet_parts(zf)}  # 시트명 공백 처리 (10월 뒤 공백 등)
+        for sheet_name in MONTH_SHEETS:
+            actual_name = names.get(sheet_name.strip())
+            if actual_name is None:
+                missing.append(f"{prefix}{sheet_name.strip()}")
+            else:
+                jobs.append((path, actual_name, prefix + actual_name.strip()))
+    return jobs, missing
+
+
+def run_sheet_job(job, engine="openpyxl"):
+    """작업 1개 (프로세스 풀에서 실행) → (레코드, 스킵 수, 소요 초)"""
+    path, actual_name, sheet_id = job
+    t0 = time.perf_counter()
+    records, skipped = process_sheet(_open_workbook(path, engine)[actual_name], sheet_id)
+    return records, skipped, time.perf_counter() - t0
+
+
+class Conversion:
+    """통합문서 목록 스트리밍 변환 — records()는 작업 순서대로 레코드를 내보내며 시트 1개분만 보유
+
+    sourceRowId 기준 중복 제거 (먼저 나온 행 유지) → 실행마다 동일.
+    manifest + previous(이전 출력 파일 경로)를 주면 지문이 같은 시트는 파싱하지 않고 이전 출력에서
+    읽어 재사용. workers=1 이면 프로세스 풀 없이 현재 프로세스에서 순차 실행.
+    engine: 시트 읽기 엔진 ("openpyxl" | "fast", xlsx_reader.py) — 결과는 같음.
+    records() 소비 후: skipped, dropped, timings [(시트, 건수, 스킵, 초, 재사용)], manifest
+    """
+
+    def __init__(self, paths, workers=None, manifest=None, previous=None, engine="openpyxl"):
+        self.jobs, self.missing = plan_jobs(paths)
+        self.workers = workers or os.cpu_count() or 1
+        self.engine = engine
+        self.previous = previous
+        self.old_sheets = (manifest or {}).get("sheets", {})
+        self.prints = []
+        for path in dict.fromkeys(job[0] for job in self.jobs):
+            path_jobs = [job for job in self.jobs if job[0] == path]
+            known = {name: (self.old_sheets[sid]["quick"], self.old_sheets[sid]["hash"])
+                     for _, name, sid in path_jobs if sid in self.old_sheets}
+            by_name = sheet_fingerprints(path, [name for _, name, _ in path_jobs], known)
+            self.prints.extend(by_name[name] for _, name, _ in path_jobs)
+        self.reused = self._reusable() if manifest and previous else set()
+
+        self.skipped = 0
+        self.dropped = 0
+        self.timings = []
+        self.manifest = {"version": MANIFEST_VERSION, "sheets": {}}
+
+    @property
+    def unchanged(self):
+        """모든 시트 재사용 + 시트 구성 동일 → 이전 출력과 같은 내용"""
+        return self.previous is not None and len(self.reused) == len(self.jobs) and self.reused == set(self.old_sheets)
+
+    def _reusable(self):
+        """지문 일치 + 이전 출력의 시트 행이 manifest와 같고 작업 순서대로 놓인 시트 (--test 출력 등 방지)
+
+        이전 출력을 한 번 훑어 시트별 sourceRowId만 비교 (시트 1개분만 메모리에)
+        """
+        candidates = {sid for (_, _, sid), fingerprint in zip(self.jobs, self.prints)
+                      if sid in self.old_sheets and self.old_sheets[sid]["hash"] == fingerprint[1]}
+        if not candidates:
+            return set()
+        order = {job[2]: i for i, job in enumerate(self.jobs)}
+        verified, seen, last = set(), set(), -1
+        try:
+            for sheet_id, group in itertools.groupby(iter_records(self.previous),
+                                                     key=lambda r: sheet_of(r["sourceRowId"])):
+                if sheet_id in seen:
+                    return set()  # 시트 행이 흩어져 있음 → 재사용 불가
+                seen.add(sheet_id)
+                ids = [rec["sourceRowId"] for rec in group]
+                if sheet_id in candidates and ids == list(self.old_sheets[sheet_id]["rows"]):
+                    if order[sheet_id] < last:
+                        return set()
+                    last = order[sheet_id]
+                    verified.add(sheet_id)
+        except (OSError, ValueError, KeyError, TypeError):
+            return set()
+        # 남은 행이 없던 시트는 출력에 나타나지 않음
+        verified.update(sid for sid in candidates if sid not in seen and not self.old_sheets[sid]["rows"])
+        return verified
+
+    def _parsed(self, todo):
+        """파싱할 시트 → (레코드, 스킵 수, 소요 초) 작업 순서대로"""
+        run = functools.partial(run_sheet_job, engine=self.engine)
+        if self.workers == 1 or len(todo) <= 1:
+            try:
+                for job in todo:
+                    yield run(job)
+            finally:
+                _close_workbooks()
         else:
-            print(f"  [{actual_name.strip():>3}]   0건 (skip {skipped}건)")
+            # 시트별 크기 편차가 커서 작업을 1개씩 배분 (chunksize=1)
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(todo))) as pool:
+                yield from pool.map(run, todo, chunksize=1)
+
+    def _previous_groups(self):
+        """이전 출력 → 재사용 시트의 (시트, 레코드 목록) — 작업 순서와 같은 순서 (_reusable에서 확인)"""
+        for sheet_id, group in itertools.groupby(iter_records(self.previous),
+                                                 key=lambda r: sheet_of(r["sourceRowId"])):
+            if sheet_id in self.reused:
+                yield sheet_id, list(group)
+
+    def records(self):
+        parsed = self._parsed([job for job in self.jobs if job[2] not in self.reused])
+        previous = self._previous_groups()  # 재사용 시트가 없으면 파일을 열지 않음
+        seen = set()
+        try:
+            for (path, actual_name, sheet_id), fingerprint in zip(self.jobs, self.prints):
+                reused = sheet_id in self.reused
+                if reused:
+                    old = self.old_sheets[sheet_id]
+                    records = next(previous)[1] if old["rows"] else []
+                    skipped, elapsed, old_rows = old["skipped"], 0.0, old["rows"]
+                else:
+                    (records, skipped, elapsed), old_rows = next(parsed), {}
+                rows = {}
+                self.manifest["sheets"][sheet_id] = {
+                    "workbook": os.path.basename(path), "sheet": actual_name,
+                    "quick": fingerprint[0], "hash": fingerprint[1], "skipped": skipped, "rows": rows,
+                }
+                for rec in records:
+                    rid = rec["sourceRowId"]
+                    if rid in seen:
+                        self.dropped += 1
+                        continue
+                    seen.add(rid)
+                    # 재사용 시트는 이전 행 해시 그대로 (레코드가 같으므로 재계산 불필요)
+                    rows[rid] = old_rows.get(rid) or [row_hash(rec), rec["idempotencyKey"]]
+                    yield rec
+                self.skipped += skipped
+                self.timings.append((sheet_id, len(records), skipped, elapsed, reused))
+        finally:
+            parsed.close()
+            previous.close()
+
+
+def convert(paths, workers=None, manifest=None, previous=None, engine="openpyxl"):
+    """통합문서 목록 변환 → (레코드, 스킵 수, [(시트, 건수, 스킵, 초, 재사용)], 없는 시트, 새 manifest)
+
+    전체 레코드 목록이 필요할 때 (벤치마크 등). 출력 파일은 main()이 Conversion으로 스트리밍 기록.
+    """
+    conversion = Conversion(paths, workers, manifest, previous, engine)
+    records = list(conversion.records())
+    return records, conversion.skipped, conversion.timings, conversion.missing, conversion.manifest
 
-        total_skipped += skipped
 
-    wb.close()
+def main():
+    # 콘솔 인코딩과 무관하게 한글 출력 (모듈 import 시에는 건드리지 않음 — 벤치/테스트에서 import)
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+    input_spec = DEFAULT_INPUT
+    workers = None
+    engine = "openpyxl"
 
-    # 테스트 모드: 최초 10건만
-    if test_mode and len(all_records) > 10:
-        all_records = all_records[:10]
-        print(f"\n[TEST MODE] 10건만 출력")
+    # CLI 인자 처리
+    if len(sys.argv) > 1 and sys.argv[1] == "--help":
+        print("사용법: python convert_sales_excel.py [--file <경로|디렉터리|글롭>] [--workers N] [--full] [--test]")
+        print("                                      [--format json|ndjson] [--compress none|gzip|zstd]")
+        print("                                      [--engine openpyxl|fast]")
+        print(f"  기본 입력: {DEFAULT_INPUT}")
+        print(f"  출력: {OUTPUT} (형식/압축에 따라 확장자 변경: sales_import.ndjson.gz 등)")
+        print(f"  증분: {MANIFEST} → 변경분 {DELTA} (--full: 전체 재변환)")
+        print(f"  --workers: 프로세스 수 (기본 CPU 수 {os.cpu_count()}, 1 = 순차)")
+        print(f"  --engine: 시트 읽기 엔진 (기본 openpyxl, fast = xlsx_reader.py iterparse — 결과 동일)")
+        return
+    if "--file" in sys.argv and sys.argv.index("--file") + 1 < len(sys.argv):
+        input_spec = sys.argv[sys.argv.index("--file") + 1]
+    if "--workers" in sys.argv and sys.argv.index("--workers") + 1 < len(sys.argv):
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+    if "--engine" in sys.argv and sys.argv.index("--engine") + 1 < len(sys.argv):
+        engine = sys.argv[sys.argv.index("--engine") + 1]
+        if engine not in ENGINES:
+            print(f"[FATAL] 지원하지 않는 엔진: {engine} ({', '.join(ENGINES)})")
+            sys.exit(1)
+    try:
+        fmt, compress = output_args(sys.argv)
+        output, delta_path = output_path(OUTPUT, fmt, compress), output_path(DELTA, fmt, compress)
+    except ValueError as e:
+        print(f"[FATAL] {e}")
+        sys.exit(1)
+
+    test_mode = "--test" in sys.argv
+    # 테스트 출력(10건)은 manifest와 맞지 않으므로 증분 비활성
+    incremental = not test_mode and "--full" not in sys.argv
+
+    # 입력 파일 확인
+    paths = resolve_inputs(input_spec)
+    if not paths:
+        print(f"[FATAL] 입력 파일 없음: {input_spec}")
+        sys.exit(1)
 
-    # 출력
+    print(f"=== GoLab 매출 Excel → JSON 변환 ===")
+    for path in paths:
+        print(f"입력: {path}")
+    print(f"출력: {output}\n")
+
+    # delta 기준은 항상 직전 manifest. 시트 재사용은 manifest가 기록한 출력(파일명 + 내용 해시)이
+    # 지금 출력과 같을 때만 — 다른 형식으로 돌린 뒤이거나 출력이 바뀌었으면 전체 재변환
+    manifest = None if test_mode else load_manifest(MANIFEST)
+    reuse = incremental and manifest is not None and manifest.get("output") == manifest_output(output)
+
+    t0 = time.perf_counter()
+    conversion = Conversion(paths, workers, manifest if reuse else None, output if reuse else None, engine)
+    rewrite = test_mode or not conversion.unchanged
+    old_rows = manifest_rows(manifest)
+    delta_counts = {"add": 0, "change": 0, "remove": 0}
+
+    # 레코드를 받는 즉시 기록 + 요약 통계도 누적 (전체 목록을 만들지 않음)
+    total = 0
+    vendors, keys = set(), set()
+    total_amount = 0
+    first_date = last_date = None
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    with open(OUTPUT, "w", encoding="utf-8") as f:
-        json.dump(all_records, f, ensure_ascii=False, indent=2)
+    with contextlib.ExitStack() as stack:
+        out = stack.enter_context(RecordWriter(output)) if rewrite else None
+        delta = None if test_mode else stack.enter_context(RecordWriter(delta_path))
+        for rec in conversion.records():
+            # 테스트 모드: 최초 10건만
+            if out and not (test_mode and out.count >= 10):
+                out.write(rec)
+            if delta:
+                entry = delta_entry(old_rows, conversion.manifest, rec)
+                if entry:
+                    delta.write(entry)
+                    delta_counts[entry["op"]] += 1
+            total += 1
+            if rec["vendor"]:
+                vendors.add(rec["vendor"])
+            total_amount += rec["unitPrice"] * rec["qty"]
+            if rec["saleDate"]:
+                first_date = min(first_date or rec["saleDate"], rec["saleDate"])
+                last_date = max(last_date or rec["saleDate"], rec["saleDate"])
+            keys.add(rec["idempotencyKey"])
+        if delta:
+            for entry in removed_entries(old_rows, conversion.manifest):
+                delta.write(entry)
+                delta_counts["remove"] += 1
+    wall = time.perf_counter() - t0
+
+    for sheet_id in conversion.missing:
+        print(f"  [SKIP] 시트 '{sheet_id}' 없음")
+    for sheet_id, count, skipped, elapsed, reused in conversion.timings:
+        status = "변경 없음 (재사용)" if reused else f"{elapsed:.2f}s"
+        print(f"  [{sheet_id:>3}] {count:>3}건 추출 (skip {skipped}건) {status}")
+
+    if conversion.dropped:
+        print(f"  [WARN] sourceRowId 중복 {conversion.dropped}건 제외 (먼저 나온 행 유지)")
+
+    timings = conversion.timings
+    sheet_total = sum(t[3] for t in timings)
+    n_parsed = sum(1 for t in timings if not t[4])
+    print(f"\n시트 {len(timings)}개 (파싱 {n_parsed} · 재사용 {len(timings) - n_parsed}) · "
+          f"시트 처리 합계 {sheet_total:.2f}s · 경과 {wall:.2f}s "
+          f"(workers {workers or os.cpu_count()}, 엔진 {engine}, 병렬 효율 {sheet_total / wall if wall else 0:.1f}x)")
+
+    if test_mode and total > 10:
+        print(f"\n[TEST MODE] 10건만 출력")
+    if not test_mode:
+        print(f"\ndelta: 추가 {delta_counts['add']} · 변경 {delta_counts['change']} · "
+              f"삭제 {delta_counts['remove']} → {delta_path}")
+        conversion.manifest["generatedAt"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        conversion.manifest["output"] = manifest_output(output)
+        with open(MANIFEST, "w", encoding="utf-8") as f:
+            f.write(json.dumps(conversion.manifest, ensure_ascii=False))  # dumps = C 인코더 (dump는 순수 파이썬)
+    if not rewrite:
+        print(f"출력 변경 없음 — {output} 유지")
 
     print(f"\n{'='*50}")
-    print(f"총 {len(all_records)}건 변환 완료 → {OUTPUT}")
-    print(f"스킵 {total_skipped}건 (빈 행/날짜 없음)")
+    print(f"총 {total}건 변환 완료 → {output} ({os.path.getsize(output):,} bytes)")
+    print(f"스킵 {conversion.skipped}건 (빈 행/날짜 없음)")
     print(f"{'='*50}")
 
     # 요약 통계
-    if all_records:
-        vendors = set(r["vendor"] for r in all_records if r["vendor"])
-        total_amount = sum(r["unitPrice"] * r["qty"] for r in all_records)
-        dates = sorted(set(r["saleDate"] for r in all_records if r["saleDate"]))
+    if total:
         print(f"\n거래처: {len(vendors)}개")
-        print(f"기간: {dates[0]} ~ {dates[-1]}")
+        print(f"기간: {first_date} ~ {last_date}")
         print(f"총 매출액: {total_amount:,.0f}원")
 
         # idempotencyKey 중복 체크
-        keys = [r["idempotencyKey"] for r in all_records]
-        dupes = len(keys) - len(set(keys))
+        dupes = total - len(keys)
         if dupes > 0:
             print(f"\n[WARN] idempotencyKey 중복: {dupes}건 — sourceRowId 확인 필요")
         else:
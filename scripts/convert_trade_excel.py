@@ -3,96 +3,53 @@
 
 데이터 모델: 구매 원장 (Purchase Ledger) v1
 - 판매가/소비자가 제거, 구매 원가 중심
-- 정규화: trim, partNo uppercase, 숫자 콤마 제거, 날짜 통일
+- 정규화: trim, partNo uppercase, 숫자 콤마 제거, 날짜 통일 (scripts/normalize.py — 매출 변환과 같은 규칙,
+  단 숫자 날짜 셀은 범위 제한 없는 엑셀 시리얼)
 - 빈 문자열 허용 (null 대신)
 
 사용법:
-  python convert_trade_excel.py
-
-출력:
-  golab/web/trade_import.json
+  python convert_trade_excel.py [--file <xlsx>] [--output <json>] [--full] [--test]
+                                [--format json|ndjson] [--compress none|gzip|zstd]
+                                [--engine openpyxl|fast]
+
+출력 (기본: golab/web/trade_import.json, 형식/압축에 따라 trade_import.ndjson.gz 등):
+  레코드를 만드는 즉시 기록 (scripts/record_io.py) → 행 수와 무관하게 메모리 일정
+
+결정적 출력 — 같은 엑셀이면 몇 번을 돌려도 같은 바이트:
+  id = 구매 라인 내용(itemId + 날짜 + 수량 + 구매가 + 납품/판매처/비고/출처)의 djb2 해시
+       "line-xxxxxxxx" (itemId와 같은 방식, 완전히 같은 행이 또 나오면 "-2", "-3" ... 순번)
+       → 행이 끼어들거나 순서가 바뀌어도 id 유지 (납품처만 다른 두 행을 맞바꿔도 그대로).
+       수량/구매가/비고 등을 고치면 새 라인(삭제+추가)
+  createdAt/updatedAt = manifest(trade_import.manifest.json)에 기록된 라인별 값 유지,
+       새 라인은 실행 시각, 레코드 규칙 변경 등으로 내용만 바뀐 라인은 updatedAt만 실행 시각
+delta (trade_import.delta.json, 출력과 같은 형식): 이전 실행 대비
+  {"op": "add" | "change", "record": ...} / {"op": "remove", "id": ...}
+  → 새로 들어온 구매 라인만 다시 가져오면 됨. --full: manifest 무시 (전체가 add)
 """
-import openpyxl
-import json
-import uuid
+import contextlib
 import hashlib
-from datetime import datetime
-
+import json
+import os
 import sys
+from datetime import datetime, timezone
 
-INPUT = r"D:\GOLAB\golab\SALES\고랩 납품실적.xlsx"
-OUTPUT = r"D:\GOLAB\golab\web\trade_import.json"
-OUTPUT_TEST = r"D:\GOLAB\golab\web\trade_import_test.json"
-TEST_MODE = "--test" in sys.argv
-TEST_COUNT = 15
-
-
-def norm_str(v):
-    """문자열 정규화: None -> '', strip"""
-    if v is None:
-        return ""
-    return str(v).strip()
-
-
-def norm_upper(v):
-    """품번 정규화: uppercase + trim"""
-    return norm_str(v).upper()
-
-
-def norm_num(v):
-    """숫자 정규화: 콤마/원화 기호 제거, 실패 시 0"""
-    if v is None:
-        return 0
-    if isinstance(v, (int, float)):
-        return v if v == v else 0  # NaN check
-    cleaned = str(v).replace(",", "").replace("\u20a9", "").replace(" ", "").strip()
-    try:
-        return float(cleaned)
-    except (ValueError, TypeError):
-        return 0
-
-
-def norm_date(v):
-    """날짜 정규화: datetime/Excel serial/문자열 -> YYYY-MM-DD
-    Handles: datetime objects, Excel serial numbers, YYYY.MM.DD, YYYY/MM/DD, YYYY-MM-DD
-    """
-    import re
-    from datetime import timedelta
-
-    if v is None:
-        return ""
-    if isinstance(v, datetime):
-        return v.strftime("%Y-%m-%d")
-    if isinstance(v, (int, float)):
-        # Excel serial date (days since 1899-12-30, Excel's epoch with leap year bug)
-        try:
-            d = datetime(1899, 12, 30) + timedelta(days=int(v))
-            return d.strftime("%Y-%m-%d")
-        except Exception:
-            return ""
-    s = str(v).strip()
-    # Handle YYYY.MM.DD and YYYY/MM/DD
-    m = re.match(r'^(\d{4})[./](\d{1,2})[./](\d{1,2})', s)
-    if m:
-        return f"{m.group(1)}-{int(m.group(2)):02d}-{int(m.group(3)):02d}"
-    if len(s) >= 10:
-        return s[:10]
-    return s
-
-
-def deterministic_item_id(vendor, part_no, item_name):
-    """결정적 itemId: vendor+partNo+itemName 해시 -> 같은 품목 = 같은 ID"""
-    src = "|".join([norm_str(vendor).lower(), norm_upper(part_no).lower(), norm_str(item_name).lower()])
-    # djb2 hash (JS 구현과 동일)
-    h = 5381
-    for ch in src:
-        h = ((h << 5) + h) + ord(ch)
-        h &= 0xFFFFFFFF  # 32-bit unsigned
-    return f"item-{h:08x}"
+from normalize import norm_str, norm_upper, normalize_rows
+from record_io import RecordWriter, output_args, output_path
+from xlsx_reader import ENGINES, open_workbook
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPT_DIR)
+DEFAULT_INPUT = os.path.join(BASE_DIR, "SALES", "고랩 납품실적.xlsx")
+OUTPUT = os.path.join(BASE_DIR, "web", "trade_import.json")
+SHEET = "구매"
+TEST_COUNT = 15
+MAX_COL = 16  # Col 0~15만 사용
+# 열 정규화 (열 인덱스, 종류) — 아래 Col layout 참고, 행 루프에서 이 순서로 풀어 씀
+COLUMNS = [(0, "serial_date"), (1, "str"), (2, "upper"), (3, "str"), (4, "num"),
+           (9, "num"), (12, "str"), (13, "str"), (14, "str"), (15, "str")]
 
-wb = openpyxl.load_workbook(INPUT, read_only=True, data_only=True)
-ws = wb["구매"]
+# line id / 레코드 규칙이 바뀌면 올릴 것 → 기존 manifest 무효 (전체가 add)
+MANIFEST_VERSION = 3  # 2: 숫자 날짜 셀은 범위 제한 없이 엑셀 시리얼, 3: line id에 memo 원천 필드
 
 # Col layout (row 1 = header):
 #   0: 날짜       -> purchaseDate
@@ -112,95 +69,259 @@ ws = wb["구매"]
 #  14: 비고       -> memo
 #  15: 출처       -> memo에 병합
 
-records = []
-skipped = 0
-
-for row in ws.iter_rows(min_row=2, values_only=True):
-    # Skip empty rows
-    if all(c is None for c in row[:6]):
-        skipped += 1
-        continue
-
-    item_name = norm_str(row[3])
-    buy_vendor = norm_str(row[13])  # 내구매처 = 실제 구매처
-    sell_target = norm_str(row[1])  # 업체명 = 판매 대상
-
-    # Skip if both item and vendor are empty
-    if not item_name and not buy_vendor and not sell_target:
-        skipped += 1
-        continue
-
-    # Build memo: 기존 비고 + 판매처 + 출처 (있으면)
-    memo_parts = []
-    note = norm_str(row[14])
-    if note:
-        memo_parts.append(note)
-    sell_channel = norm_str(row[12])
-    if sell_channel:
-        memo_parts.append("판매처:" + sell_channel)
-    if sell_target:
-        memo_parts.append("납품:" + sell_target)
-    source = norm_str(row[15]) if len(row) > 15 else ""
-    if source:
-        memo_parts.append("출처:" + source)
-
-    rec = {
-        "id": str(uuid.uuid4()),
-        "purchaseDate": norm_date(row[0]),
-        "vendor": buy_vendor,           # 구매처 (내가 산 곳)
-        "docNo": "",                     # 엑셀에 없음
-        "itemId": deterministic_item_id(buy_vendor, row[2], item_name),
-        "partNo": norm_upper(row[2]),    # 품번 (uppercase)
-        "itemName": item_name,
-        "qty": norm_num(row[4]),
-        "unit": "ea",                    # 엑셀에 단위 없음, 기본값
-        "buyUnitPrice": norm_num(row[9]),
-        "memo": " / ".join(memo_parts) if memo_parts else "",
-        "createdAt": datetime.now().isoformat(),
-        "updatedAt": datetime.now().isoformat()
-    }
-    records.append(rec)
-
-wb.close()
-
-# Select output mode
-if TEST_MODE:
-    # Test mode: first TEST_COUNT records + evenly spaced samples
-    test_records = records[:TEST_COUNT]
-    out_path = OUTPUT_TEST
-    out_data = test_records
-    print(f"=== TEST MODE: {TEST_COUNT} records ===")
-else:
-    out_path = OUTPUT
-    out_data = records
-
-# Save JSON
-with open(out_path, "w", encoding="utf-8") as f:
-    json.dump(out_data, f, ensure_ascii=False, indent=2)
-
-# Verification (ASCII-safe output for Windows terminal)
-vendors = set(r["vendor"] for r in out_data if r["vendor"])
-total_buy = sum(r["buyUnitPrice"] * r["qty"] for r in out_data)
-
-# Check for duplicate itemIds (same product should share itemId)
-item_id_map = {}
-for r in out_data:
-    key = r["itemId"]
-    if key not in item_id_map:
-        item_id_map[key] = []
-    item_id_map[key].append(r["itemName"])
-shared_items = sum(1 for v in item_id_map.values() if len(v) > 1)
-
-print(f"Records: {len(out_data)}")
-print(f"Skipped: {skipped}")
-print(f"Vendors: {len(vendors)}")
-print(f"Unique itemIds: {len(item_id_map)}")
-print(f"Shared itemIds (same product, multiple purchases): {shared_items}")
-print(f"Total buy amount: {total_buy:,.0f}")
-print(f"Output: {out_path}")
-
-# Sample check
-if out_data:
-    print(f"\nFirst record keys: {list(out_data[0].keys())}")
-    print(f"Date range: {out_data[0].get('purchaseDate','')} ~ {out_data[-1].get('purchaseDate','')}")
-    print(f"Sample itemId: {out_data[0].get('itemId','')}")
+
+def djb2(src):
+    """djb2 hash (JS 구현과 동일, 32-bit unsigned)"""
+    h = 5381
+    for ch in src:
+        h = ((h << 5) + h) + ord(ch)
+        h &= 0xFFFFFFFF
+    return h
+
+
+def deterministic_item_id(vendor, part_no, item_name):
+    """결정적 itemId: vendor+partNo+itemName 해시 -> 같은 품목 = 같은 ID"""
+    src = "|".join([norm_str(vendor).lower(), norm_upper(part_no).lower(), norm_str(item_name).lower()])
+    return f"item-{djb2(src):08x}"
+
+
+def deterministic_line_id(item_id, purchase_date, qty, buy_unit_price,
+                          sell_target="", sell_channel="", note="", source=""):
+    """결정적 라인 id: 품목 + 구매일 + 수량 + 구매가 + memo 원천 필드 해시
+    (완전히 같은 반복 라인은 호출 측에서 순번)"""
+    src = "|".join([item_id, purchase_date, str(qty), str(buy_unit_price),
+                    sell_target, sell_channel, note, source])
+    return f"line-{djb2(src):08x}"
+
+
+def content_hash(rec):
+    """createdAt/updatedAt을 뺀 레코드 내용 해시 (id에 안 들어가는 필드·레코드 규칙 변경 감지)"""
+    body = {k: v for k, v in rec.items() if k not in ("createdAt", "updatedAt")}
+    return hashlib.sha256(json.dumps(body, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def sidecar_path(output, kind):
+    """trade_import.ndjson.gz → trade_import.{kind}.json (manifest) — 형식/압축과 무관하게 같은 이름"""
+    base, name = os.path.split(output)
+    return os.path.join(base, f"{name.split('.', 1)[0]}.{kind}.json")
+
+
+class TradeConversion:
+    """구매 시트 → 레코드 스트림 (records()는 행 순서대로 1건씩)
+
+    old_lines: 이전 manifest의 {id: [내용 해시, createdAt, updatedAt]} — 타임스탬프 유지/delta 판정용.
+    now: 새/변경 라인에 찍을 실행 시각 (실행당 1개).
+    records() 소비 후: skipped, lines (새 manifest용), delta는 delta_entry / removed_entries로.
+    """
+
+    def __init__(self, path, engine="openpyxl", old_lines=None, now=None):
+        self.path = path
+        self.engine = engine
+        self.old_lines = old_lines or {}
+        self.now = now or datetime.now().isoformat()
+        self.skipped = 0
+        self.lines = {}
+
+    def records(self):
+        wb = open_workbook(self.path, self.engine)
+        try:
+            rows = wb[SHEET].iter_rows(min_row=2, max_col=MAX_COL, values_only=True)
+            yield from self._records(rows)
+        finally:
+            wb.close()
+
+    def _records(self, rows):
+        occurrences = {}  # 라인 id → 지금까지 나온 횟수 (완전히 같은 행 반복)
+        for row, values in normalize_rows(rows, COLUMNS):
+            # Skip empty rows
+            if all(c is None for c in row[:6]):
+                self.skipped += 1
+                continue
+
+            (purchase_date, sell_target, part_no, item_name, qty, buy_unit_price,
+             sell_channel, buy_vendor, note, source) = values
+            # buy_vendor: 내구매처 = 실제 구매처 / sell_target: 업체명 = 판매 대상
+
+            # Skip if both item and vendor are empty
+            if not item_name and not buy_vendor and not sell_target:
+                self.skipped += 1
+                continue
+
+            # Build memo: 기존 비고 + 판매처 + 출처 (있으면)
+            memo_parts = []
+            if note:
+                memo_parts.append(note)
+            if sell_channel:
+                memo_parts.append("판매처:" + sell_channel)
+            if sell_target:
+                memo_parts.append("납품:" + sell_target)
+            if source:
+                memo_parts.append("출처:" + source)
+
+            item_id = deterministic_item_id(buy_vendor, part_no, item_name)
+            line_id = deterministic_line_id(item_id, purchase_date, qty, buy_unit_price,
+                                            sell_target, sell_channel, note, source)
+            n = occurrences[line_id] = occurrences.get(line_id, 0) + 1
+            if n > 1:
+                line_id = f"{line_id}-{n}"
+
+            rec = {
+                "id": line_id,
+                "purchaseDate": purchase_date,
+                "vendor": buy_vendor,           # 구매처 (내가 산 곳)
+                "docNo": "",                     # 엑셀에 없음
+                "itemId": item_id,
+                "partNo": part_no,               # 품번 (uppercase)
+                "itemName": item_name,
+                "qty": qty,
+                "unit": "ea",                    # 엑셀에 단위 없음, 기본값
+                "buyUnitPrice": buy_unit_price,
+                "memo": " / ".join(memo_parts) if memo_parts else "",
+                "createdAt": "",
+                "updatedAt": ""
+            }
+            digest = content_hash(rec)
+            old = self.old_lines.get(line_id)
+            if old is None:
+                rec["createdAt"] = rec["updatedAt"] = self.now
+            else:
+                rec["createdAt"] = old[1]
+                rec["updatedAt"] = old[2] if old[0] == digest else self.now
+            self.lines[line_id] = [digest, rec["createdAt"], rec["updatedAt"]]
+            yield rec
+
+    def delta_entry(self, rec):
+        """레코드 1건 → 추가/변경 delta 항목 (변경 없으면 None)"""
+        old = self.old_lines.get(rec["id"])
+        if old is None:
+            return {"op": "add", "record": rec}
+        if old[0] != self.lines[rec["id"]][0]:
+            return {"op": "change", "record": rec}
+        return None
+
+    def removed_entries(self):
+        for line_id in self.old_lines:
+            if line_id not in self.lines:
+                yield {"op": "remove", "id": line_id}
+
+
+def main():
+    input_path = DEFAULT_INPUT
+    output = OUTPUT
+    engine = "openpyxl"
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--help":
+        print("Usage: python convert_trade_excel.py [--file <xlsx>] [--output <json>] [--full] [--test]")
+        print("                                     [--format json|ndjson] [--compress none|gzip|zstd]")
+        print("                                     [--engine openpyxl|fast]")
+        print(f"  default input:  {DEFAULT_INPUT}")
+        print(f"  default output: {OUTPUT} (+ .manifest.json / .delta.json next to it)")
+        print("  --full: ignore manifest (all lines reported as add, timestamps reset)")
+        print(f"  --test: first {TEST_COUNT} records -> *_test.json, no manifest/delta")
+        return
+    if "--file" in sys.argv and sys.argv.index("--file") + 1 < len(sys.argv):
+        input_path = sys.argv[sys.argv.index("--file") + 1]
+    if "--output" in sys.argv and sys.argv.index("--output") + 1 < len(sys.argv):
+        output = sys.argv[sys.argv.index("--output") + 1]
+    if "--engine" in sys.argv and sys.argv.index("--engine") + 1 < len(sys.argv):
+        engine = sys.argv[sys.argv.index("--engine") + 1]
+        if engine not in ENGINES:
+            print(f"[FATAL] unsupported engine: {engine} ({', '.join(ENGINES)})")
+            sys.exit(1)
+    test_mode = "--test" in sys.argv
+    incremental = not test_mode and "--full" not in sys.argv
+    if not os.path.exists(input_path):
+        print(f"[FATAL] input not found: {input_path}")
+        sys.exit(1)
+
+    manifest_path = sidecar_path(output, "manifest")
+    fmt, compress = output_args(sys.argv)
+    try:
+        if test_mode:
+            # Test mode: first TEST_COUNT records
+            base = output[:-len(".json")] if output.endswith(".json") else output
+            out_path = output_path(base + "_test.json", fmt, compress)
+            print(f"=== TEST MODE: {TEST_COUNT} records ===")
+        else:
+            out_path = output_path(output, fmt, compress)
+        delta_path = output_path(sidecar_path(output, "delta"), fmt, compress)
+    except ValueError as e:
+        print(f"[FATAL] {e}")
+        sys.exit(1)
+
+    manifest = load_manifest(manifest_path) if incremental else None
+    conversion = TradeConversion(input_path, engine, (manifest or {}).get("lines"))
+    delta_counts = {"add": 0, "change": 0, "remove": 0}
+
+    # Verification stats (기록하면서 누적)
+    total = 0
+    vendors = set()
+    total_buy = 0
+    item_id_counts = {}  # itemId -> 건수 (같은 품목 반복 구매 확인)
+    first_rec = last_rec = None
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        out = stack.enter_context(RecordWriter(out_path))
+        delta = None if test_mode else stack.enter_context(RecordWriter(delta_path))
+        for rec in conversion.records():
+            total += 1
+            if delta:
+                entry = conversion.delta_entry(rec)
+                if entry:
+                    delta.write(entry)
+                    delta_counts[entry["op"]] += 1
+            if test_mode and out.count >= TEST_COUNT:
+                continue
+            out.write(rec)
+
+            if rec["vendor"]:
+                vendors.add(rec["vendor"])
+            total_buy += rec["buyUnitPrice"] * rec["qty"]
+            item_id_counts[rec["itemId"]] = item_id_counts.get(rec["itemId"], 0) + 1
+            first_rec = first_rec or rec
+            last_rec = rec
+        if delta:
+            for entry in conversion.removed_entries():
+                delta.write(entry)
+                delta_counts["remove"] += 1
+
+    if not test_mode:
+        manifest = {"version": MANIFEST_VERSION,
+                    "generatedAt": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "lines": conversion.lines}
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(manifest, ensure_ascii=False))
+
+    # Verification (ASCII-safe output for Windows terminal)
+    shared_items = sum(1 for n in item_id_counts.values() if n > 1)
+
+    print(f"Records: {out.count}" + (f" (of {total})" if test_mode else ""))
+    print(f"Skipped: {conversion.skipped}")
+    print(f"Vendors: {len(vendors)}")
+    print(f"Unique itemIds: {len(item_id_counts)}")
+    print(f"Shared itemIds (same product, multiple purchases): {shared_items}")
+    print(f"Total buy amount: {total_buy:,.0f}")
+    print(f"Output: {out_path}")
+    if not test_mode:
+        print(f"Delta: add {delta_counts['add']} / change {delta_counts['change']} / "
+              f"remove {delta_counts['remove']} -> {delta_path}")
+
+    # Sample check
+    if first_rec:
+        print(f"\nFirst record keys: {list(first_rec.keys())}")
+        print(f"Date range: {first_rec.get('purchaseDate','')} ~ {last_rec.get('purchaseDate','')}")
+        print(f"Sample itemId: {first_rec.get('itemId','')}")
+
+
+if __name__ == "__main__":
+    main()
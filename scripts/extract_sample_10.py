@@ -3,7 +3,8 @@ GoLab v1.6.1 — 샘플 10건 추출 스크립트
 trade_import.json에서 "기존 7건 + 신규 3건" 구성의 테스트 샘플 생성
 
 사용법:
-  python scripts/extract_sample_10.py
+  python scripts/extract_sample_10.py [--file <trade_import.json|.ndjson|.json.gz|.ndjson.zst ...>]
+  (--file 없으면 web/의 trade_import.* 중 있는 것 — convert_trade_excel.py --format/--compress 출력)
 
 출력:
   web/data/trade_import_sample_10.json
@@ -11,6 +12,9 @@ trade_import.json에서 "기존 7건 + 신규 3건" 구성의 테스트 샘플 
 
 import json
 import os
+import sys
+
+from record_io import COMPRESSIONS, FORMATS, iter_records, output_path
 
 # ── 경로 설정 ──
 BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -47,17 +51,31 @@ NEW_ITEM_IDS = [
 ALL_TARGET_IDS = set(EXISTING_ITEM_IDS + NEW_ITEM_IDS)
 
 
+def find_source():
+    """--file 또는 기본 출력 경로의 형식/압축 변형 중 존재하는 파일"""
+    if "--file" in sys.argv and sys.argv.index("--file") + 1 < len(sys.argv):
+        return sys.argv[sys.argv.index("--file") + 1]
+    for fmt in FORMATS:
+        for compress in COMPRESSIONS:
+            path = output_path(SRC, fmt, compress)
+            if os.path.exists(path):
+                return path
+    return SRC
+
+
 def main():
-    # ── 원본 로드 ──
-    with open(SRC, "r", encoding="utf-8") as f:
-        full = json.load(f)
-    print(f"원본 로드: {len(full)}건")
+    src = find_source()
+    if not os.path.exists(src):
+        print(f"[FATAL] input not found: {src}")
+        sys.exit(1)
 
-    # ── 대상 레코드 추출 ──
+    # ── 대상 레코드 추출 (한 건씩 읽음 — 형식/압축 무관) ──
     selected = []
     seen_ids = set()  # 같은 itemId 중복 허용 (이동평균 테스트)
+    total = 0
 
-    for idx, rec in enumerate(full):
+    for idx, rec in enumerate(iter_records(src)):
+        total += 1
         item_id = rec.get("itemId", "")
         if item_id in ALL_TARGET_IDS:
             # _meta 필드 추가 (import 로직에서 해시용으로만 사용)
@@ -69,6 +87,7 @@ def main():
                 rec["_group"] = "existing"
             selected.append(rec)
 
+    print(f"원본: {src} ({total}건)")
     print(f"추출: {len(selected)}건")
 
     # ── 정확히 10건 맞추기: 기존 7건 + 신규 3건 ──
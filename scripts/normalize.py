@@ -0,0 +1,253 @@
+"""
+변환 스크립트 공용 정규화 (convert_sales_excel.py / convert_trade_excel.py)
+
+규칙 (두 스크립트 공통 — 매출 idempotencyKey가 값에 의존하므로 매출 스크립트 기존 규칙 기준):
+  norm_str    None → "", 그 외 str(v).strip()
+  norm_upper  norm_str + 대문자 (품번)
+  norm_num    숫자는 그대로 (NaN → 0), 문자열은 콤마/₩/공백 제거 후 소수점 있으면 float,
+              없으면 int, 실패 → 0
+  norm_date   → YYYY-MM-DD. datetime/date, 엑셀 시리얼 40000~50000 (숫자/문자열),
+              YYYY-MM-DD · YYYY/MM/DD · YYYY.MM.DD (월/일 1~2자리), "YYYY-MM-DD HH:MM:SS",
+              뒤에 시각/요일이 붙은 "2025.1.5 10:00" · "2025.1.5(화)" (앞부분 날짜),
+              그 외 10자 이상이면 앞 10자, 아니면 ""
+  norm_serial_date  norm_date + 숫자 셀은 범위와 무관하게 엑셀 시리얼 (구매 원장 — 2009년 이전 날짜)
+
+열 단위 고속 경로 — normalize_rows(rows, columns):
+  앞 SAMPLE_ROWS행으로 열마다 주 형식(datetime 객체 / 구분자별 날짜 문자열 / 정수 / 문자열 ...)을
+  한 번 판별해 그 형식만 빠르게 처리하는 열 전용 함수를 만들고(column), 청크 단위로 열 전체에
+  map. 주 형식이 아닌 값은 위 일반 규칙으로 → 결과는 항상 일반 규칙과 같음.
+  문자열 날짜·금액 파싱은 LRU 메모 (같은 날짜/금액 문자열이 시트 안에서 수백 번 반복) — 텍스트
+  날짜 열은 메모가 빗나가도 strptime 최대 5회 대신 판별된 형식의 정규식 1회.
+  거래처명 등 일반 문자열은 메모하지 않음 — 공유 문자열 표에서 온 같은 객체라 strip 자체가
+  메모 조회보다 쌈.
+"""
+import functools
+import itertools
+import re
+from datetime import date, datetime, timedelta
+
+SAMPLE_ROWS = 200    # 열 형식 판별 표본
+CHUNK_ROWS = 2000    # 열 단위 map 청크 (메모리는 청크 1개분)
+MEMO_SIZE = 8192     # 날짜/금액 문자열 LRU 크기
+
+_SERIAL_BASE = datetime(1899, 12, 30)
+# strptime("%Y?%m?%d")가 받아들이는 형태 그대로 (ASCII 숫자만 — 그 외는 일반 경로)
+_DATE_TEXT = {sep: re.compile(r"([0-9]{4})%s(1[0-2]|0[1-9]|[1-9])%s(3[01]|[12][0-9]|0[1-9]|[1-9])"
+                              % (re.escape(sep), re.escape(sep)))
+              for sep in "-/."}
+# 날짜 뒤에 시각/요일 등이 붙은 문자열의 앞부분 (구분자 혼용 허용)
+_DATE_PREFIX = re.compile(r"([0-9]{4})[-./]([0-9]{1,2})[-./]([0-9]{1,2})(?![0-9])")
+
+
+def norm_str(v):
+    """문자열 정규화: None → "", strip"""
+    if v is None:
+        return ""
+    return str(v).strip()
+
+
+def norm_upper(v):
+    """대문자 정규화 (품번용)"""
+    return norm_str(v).upper()
+
+
+def norm_num(v):
+    """숫자 정규화: 콤마/₩/공백 제거, 파싱 실패 → 0"""
+    if v is None:
+        return 0
+    if isinstance(v, (int, float)):
+        return v if v == v else 0  # NaN 체크
+    return _num_text(str(v))
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _num_text(s):
+    s = s.replace(",", "").replace("₩", "").replace(" ", "").strip()
+    try:
+        return float(s) if "." in s else int(s)
+    except (ValueError, TypeError):
+        return 0
+
+
+def norm_date(v):
+    """날짜 정규화 → YYYY-MM-DD"""
+    if v is None:
+        return ""
+    if isinstance(v, (datetime, date)):
+        return v.strftime("%Y-%m-%d")
+    return _date_text(str(v).strip())
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def _date_text(s):
+    # 엑셀 시리얼 넘버 (숫자)
+    try:
+        num = float(s)
+        if 40000 < num < 50000:
+            return (_SERIAL_BASE + timedelta(days=int(num))).strftime("%Y-%m-%d")
+    except (ValueError, TypeError):
+        pass
+    # YYYY-MM-DD, YYYY/MM/DD, YYYY.MM.DD
+    for fmt in ("%Y-%m-%d", "%Y/%m/%d", "%Y.%m.%d"):
+        try:
+            return datetime.strptime(s[:10], fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    # datetime 문자열 "2025-01-02 00:00:00"
+    try:
+        return datetime.strptime(s[:19], "%Y-%m-%d %H:%M:%S").strftime("%Y-%m-%d")
+    except ValueError:
+        pass
+    # "2025.1.5 10:00", "2025.1.5(화)", "2025/3/7 오후"
+    m = _DATE_PREFIX.match(s)
+    if m and _valid(int(m[1]), int(m[2]), int(m[3])):
+        return f"{m[1]}-{int(m[2]):02d}-{int(m[3]):02d}"
+    return s[:10] if len(s) >= 10 else ""
+
+
+def norm_serial_date(v):
+    """날짜 정규화, 숫자 셀(int/float)은 범위 제한 없이 엑셀 시리얼 → YYYY-MM-DD (변환 불가 → "")"""
+    if type(v) in (int, float):
+        return _serial_date(v)
+    return norm_date(v)
+
+
+def _serial_date(v):
+    try:
+        return (_SERIAL_BASE + timedelta(days=int(v))).strftime("%Y-%m-%d")
+    except (ValueError, OverflowError):  # NaN / inf / 범위 밖
+        return ""
+
+
+NORMALIZERS = {"str": norm_str, "upper": norm_upper, "num": norm_num, "date": norm_date,
+               "serial_date": norm_serial_date}
+
+
+# ═══════════════════════════════════════════
+# 열 단위 고속 경로
+# ═══════════════════════════════════════════
+
+def _dominant(values, key):
+    counts = {}
+    for v in values:
+        if v is not None:
+            k = key(v)
+            counts[k] = counts.get(k, 0) + 1
+    return max(counts, key=counts.get) if counts else None
+
+
+def _date_layout(v):
+    """표본 값의 날짜 형식: "datetime" | "text:<구분자>" | 그 외 타입명"""
+    if type(v) is datetime:
+        return "datetime"
+    if type(v) is str:
+        for sep, pattern in _DATE_TEXT.items():
+            if pattern.fullmatch(v.strip()[:10]):
+                return "text:" + sep
+    return type(v).__name__
+
+
+def _date_column(sample):
+    layout = _dominant(sample, _date_layout)
+    if layout == "datetime":
+        def fast(v):
+            if type(v) is datetime and v.year >= 1000:  # strftime("%Y")는 1000년 미만을 채우지 않음
+                return f"{v.year}-{v.month:02d}-{v.day:02d}"
+            return norm_date(v)
+        return fast
+    if layout and layout.startswith("text:"):
+        match = _DATE_TEXT[layout[5:]].fullmatch
+
+        @functools.lru_cache(maxsize=MEMO_SIZE)
+        def parse(s):
+            m = match(s[:10])
+            if m:
+                y, mo, d = int(m[1]), int(m[2]), int(m[3])
+                if d <= 28 or _valid(y, mo, d):  # 2/30 등은 일반 경로 (다음 형식 시도)
+                    return f"{y}-{mo:02d}-{d:02d}"
+            return _date_text(s)
+
+        def fast(v):
+            return parse(v.strip()) if type(v) is str else norm_date(v)
+        return fast
+    return norm_date
+
+
+def _valid(y, mo, d):
+    try:
+        date(y, mo, d)
+    except ValueError:
+        return False
+    return True
+
+
+def _num_column(sample):
+    if _dominant(sample, type) is str:
+        # 금액처럼 거의 매번 다른 문자열이면 메모는 빗나가기만 함 → 바로 파싱
+        texts = [v for v in sample if type(v) is str]
+        parse = _num_text if len(set(texts)) <= len(texts) // 2 else _num_text.__wrapped__
+
+        def fast(v):
+            return parse(v) if type(v) is str else norm_num(v)
+        return fast
+
+    def fast(v):
+        if type(v) is int:
+            return v
+        if type(v) is float:
+            return v if v == v else 0
+        return norm_num(v)
+    return fast
+
+
+def _str_column(sample, upper=False):
+    if upper:
+        def fast(v):
+            return v.strip().upper() if type(v) is str else norm_upper(v)
+    else:
+        def fast(v):
+            return v.strip() if type(v) is str else norm_str(v)
+    return fast
+
+
+def _serial_date_column(sample):
+    date_fn = _date_column(sample)
+
+    def fast(v):
+        return _serial_date(v) if type(v) in (int, float) else date_fn(v)
+    return fast
+
+
+def column(kind, sample):
+    """열 종류(NORMALIZERS 키) + 표본 값 → 열 전용 정규화 함수 (결과는 NORMALIZERS와 동일)"""
+    if kind == "date":
+        return _date_column(sample)
+    if kind == "serial_date":
+        return _serial_date_column(sample)
+    if kind == "num":
+        return _num_column(sample)
+    if kind in ("str", "upper"):
+        return _str_column(sample, upper=kind == "upper")
+    raise ValueError(f"알 수 없는 열 종류: {kind} ({', '.join(NORMALIZERS)})")
+
+
+def normalize_rows(rows, columns, sample_size=SAMPLE_ROWS, chunk_size=CHUNK_ROWS):
+    """값 튜플 행 → (원본 행, 정규화 값 튜플)
+
+    columns: [(열 인덱스, 종류)] — 정규화 값은 이 순서. 행이 짧으면 빈 칸(None)으로 취급.
+    청크(chunk_size행)마다 열로 전치해 열 전용 함수를 map → 청크 1개분만 메모리에.
+    """
+    width = max(i for i, _ in columns) + 1
+    rows = iter(rows)
+    fns = None
+    while True:
+        chunk = [r if len(r) >= width else tuple(r) + (None,) * (width - len(r))
+                 for r in itertools.islice(rows, chunk_size)]
+        if not chunk:
+            return
+        if fns is None:
+            head = chunk[:sample_size]
+            fns = [column(kind, [r[i] for r in head]) for i, kind in columns]
+        by_column = list(zip(*chunk))
+        normalized = [list(map(fn, by_column[i])) for (i, _), fn in zip(columns, fns)]
+        yield from zip(chunk, zip(*normalized))
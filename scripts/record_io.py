@@ -0,0 +1,195 @@
+"""
+변환 결과 레코드 스트리밍 입출력 (convert_sales_excel.py / convert_trade_excel.py 공용)
+
+형식은 확장자로 결정:
+  .json    — 들여쓰기 JSON 배열 (기존 형식, json.dump(indent=2)와 같은 바이트)
+  .ndjson  — 한 줄에 레코드 1건 (공백 없는 구분자)
+  뒤에 .gz (gzip) / .zst (zstd, zstandard 패키지 필요) 를 붙이면 압축
+
+RecordWriter는 레코드를 받는 즉시 기록 → 전체 목록을 메모리에 두지 않음.
+임시 파일(.tmp)에 쓰고 close 시 교체 → 중간에 실패해도 기존 출력 유지.
+gzip 헤더 mtime=0 → 같은 입력이면 같은 바이트 (변경 감지/캐시용).
+
+iter_records는 위 형식을 모두 한 건씩 읽음 (압축은 매직 바이트로 판별, JSON 배열도
+청크 단위 증분 파싱 → 파일 크기와 무관하게 메모리 일정).
+
+사용 예:
+  with RecordWriter("out.ndjson.gz") as out:
+      for rec in records:
+          out.write(rec)
+  for rec in iter_records("out.ndjson.gz"):
+      ...
+"""
+import gzip
+import io
+import itertools
+import json
+import os
+import re
+
+FORMATS = ("json", "ndjson")
+COMPRESSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_CHUNK = 1 << 16
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def output_path(path, fmt="json", compress="none"):
+    """기본 경로(.json)의 확장자를 형식/압축에 맞게 변경: x.json → x.ndjson.gz"""
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} ({', '.join(FORMATS)})")
+    if compress not in COMPRESSIONS:
+        raise ValueError(f"지원하지 않는 압축: {compress} ({', '.join(COMPRESSIONS)})")
+    base = path[:-len(".json")] if path.endswith(".json") else path
+    return f"{base}.{fmt}{COMPRESSIONS[compress]}"
+
+
+def output_args(argv):
+    """CLI 공통 옵션: --format json|ndjson, --compress none|gzip|zstd → (형식, 압축)"""
+    def value(name, default):
+        if name in argv and argv.index(name) + 1 < len(argv):
+            return argv[argv.index(name) + 1]
+        return default
+    return value("--format", "json"), value("--compress", "none")
+
+
+def _split_ext(path):
+    """→ (형식, 압축)"""
+    compress = "none"
+    for name, ext in COMPRESSIONS.items():
+        if ext and path.endswith(ext):
+            compress, path = name, path[:-len(ext)]
+    return ("ndjson" if path.endswith(".ndjson") else "json"), compress
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd 압축에는 zstandard 패키지 필요: pip install zstandard "
+                           "(또는 --compress gzip)") from None
+    return zstandard
+
+
+def _open_text_writer(path, compress):
+    zstandard = _zstandard() if compress == "zstd" else None  # 파일 만들기 전에 확인
+    raw = open(path, "wb")
+    if compress == "gzip":
+        stream = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+    elif compress == "zstd":
+        stream = zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+    else:
+        stream = raw
+    # GzipFile.close()는 fileobj를 닫지 않음 → close()에서 raw도 닫기
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="\n"), raw
+
+
+class RecordWriter:
+    """레코드 1건씩 기록 (형식/압축은 경로 확장자로 결정)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.format, self.compress = _split_ext(path)
+        self.count = 0
+        self._tmp = path + ".tmp"
+        self._f, self._raw = _open_text_writer(self._tmp, self.compress)
+        if self.format == "json":
+            self._f.write("[")
+
+    def write(self, rec):
+        if self.format == "json":
+            text = json.dumps(rec, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            self._f.write(("," if self.count else "") + "\n  " + text)
+        else:
+            self._f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self.format == "json":
+            self._f.write("\n]" if self.count else "]")
+        self._f.close()
+        self._raw.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        """기록 중단 → 임시 파일 삭제 (기존 출력 유지)"""
+        try:
+            self._f.close()
+            self._raw.close()
+        finally:
+            if os.path.exists(self._tmp):
+                os.remove(self._tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _open_text_reader(path):
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    zstandard = _zstandard() if magic == _ZSTD_MAGIC else None
+    raw = open(path, "rb")
+    if magic.startswith(_GZIP_MAGIC):
+        stream = gzip.GzipFile(fileobj=raw, mode="rb")
+    elif zstandard:
+        stream = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    else:
+        stream = raw
+    return io.TextIOWrapper(stream, encoding="utf-8-sig"), raw
+
+
+def _iter_json_array(f, buf):
+    """'[' 뒤부터 배열 원소를 하나씩 디코드 (버퍼에는 미처리 부분만 유지)"""
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if pos == len(buf):
+            more = f.read(_CHUNK)
+            if not more:
+                raise ValueError("JSON 배열이 ']' 없이 끝남")
+            buf, pos = more, 0
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # 원소가 청크 경계에 걸림 → 더 읽고 재시도 (원소는 객체라 '}'로 끝나므로 잘린 채 성공하지 않음)
+            more = f.read(_CHUNK)
+            if not more:
+                raise
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield obj
+        pos = end
+
+
+def iter_records(path):
+    """JSON 배열 / NDJSON (gzip·zstd 포함) → 레코드 1건씩"""
+    f, raw = _open_text_reader(path)
+    try:
+        head = f.read(_CHUNK)
+        stripped = head.lstrip()
+        if stripped.startswith("["):
+            yield from _iter_json_array(f, stripped[1:])
+            return
+        # 첫 청크 끝의 잘린 줄을 마저 읽은 뒤 줄 단위 (splitlines는 U+2028도 나누므로 "\n"만)
+        lines = itertools.chain((head + f.readline()).split("\n"), f)
+        for lineno, line in enumerate(lines, 1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{lineno}: NDJSON 파싱 실패 — {e}") from None
+    finally:
+        f.close()
+        raw.close()
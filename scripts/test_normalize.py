@@ -0,0 +1,70 @@
+import math
+import random
+from datetime import date, datetime
+
+import pytest
+
+from normalize import NORMALIZERS, norm_date, norm_serial_date, normalize_rows
+
+KINDS = list(NORMALIZERS)
+
+
+def per_cell(rows, columns):
+    width = max(i for i, _ in columns) + 1
+    for row in rows:
+        row = tuple(row) + (None,) * (width - len(row))
+        yield tuple(NORMALIZERS[kind](row[i]) for i, kind in columns)
+
+
+def mixed_values(rng):
+    """열 주 형식(datetime / 날짜 문자열 / 숫자 / 문자열) + 섞여 드는 예외 값"""
+    texts = ["2025-01-05", "2025/3/7", "2025.1.5", "2025.1.5 10:00", "2025.1.5(화)", "2025/3/7 오후",
+             "2025-02-30", "2025.13.01", "2025-01-02 00:00:00", "45000", "38000", "1,234", "₩ 5,000",
+             "12.5", " 품목 ", "", "abc", "２０２５-01-05", "nan"]
+    others = [None, 0, 1, -3, 38000, 45000, 45000.7, 12.5, math.nan, math.inf, True,
+              datetime(2025, 1, 5, 9, 30), datetime(999, 1, 1), date(2025, 3, 7)]
+    return texts + others + [f"{rng.randint(2000, 2030)}{rng.choice('-/.')}{rng.randint(1, 12)}"
+                             f"{rng.choice('-/.')}{rng.randint(1, 31)}{rng.choice(['', ' 10:00', '(월)'])}"
+                             for _ in range(50)]
+
+
+@pytest.mark.parametrize("dominant", ["datetime", "text", "int", "str"])
+def test_normalize_rows_matches_per_cell(dominant):
+    """열 고속 경로 == 셀별 NORMALIZERS (주 형식 판별이 어떻든)"""
+    rng = random.Random(dominant)
+    extras = mixed_values(rng)
+    base = {"datetime": lambda: datetime(2025, rng.randint(1, 12), rng.randint(1, 28)),
+            "text": lambda: f"2025.{rng.randint(1, 12)}.{rng.randint(1, 28)}",
+            "int": lambda: rng.randint(38000, 46000),
+            "str": lambda: f" 품목{rng.randint(1, 50)} "}[dominant]
+    rows = [tuple(base() if rng.random() < 0.8 else rng.choice(extras) for _ in KINDS)
+            for _ in range(600)]
+    rows.append(())  # 짧은 행
+    columns = list(enumerate(KINDS))
+    fast = [values for _, values in normalize_rows(rows, columns, sample_size=50, chunk_size=128)]
+    assert [tuple(map(repr, v)) for v in fast] == [tuple(map(repr, v)) for v in per_cell(rows, columns)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2025.1.5 10:00", "2025-01-05"),
+    ("2025.1.5(화)", "2025-01-05"),
+    ("2025/3/7 오후", "2025-03-07"),
+    ("2025-01-02 00:00:00", "2025-01-02"),
+    ("2025.1.5", "2025-01-05"),
+    ("45000", "2023-03-15"),
+    ("2025-02-30 비고", "2025-02-30"),  # 없는 날짜는 앞 10자 그대로
+    ("2025.1.130", "2025.1.130"),  # 일 뒤에 숫자가 더 붙으면 날짜로 보지 않음
+    ("1/5", ""),
+])
+def test_norm_date_text(text, expected):
+    assert norm_date(text) == expected
+
+
+def test_serial_date_outside_sales_range():
+    """구매 원장 날짜 열: 숫자 셀은 40000~50000 밖이어도 엑셀 시리얼"""
+    assert norm_serial_date(38000) == "2004-01-14"
+    assert norm_serial_date(38000.5) == "2004-01-14"
+    assert norm_serial_date(45000) == norm_date(45000) == "2023-03-15"
+    assert norm_serial_date(math.nan) == ""
+    assert norm_date(38000) == ""  # 매출 규칙은 그대로 (40000~50000만 시리얼)
+    assert norm_serial_date("2025.1.5 10:00") == "2025-01-05"
@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from bench_convert_sales import make_workbook  # noqa: E402
+from convert_sales_excel import DEFAULT_INPUT, convert, plan_jobs, source_prefix  # noqa: E402
+
+LEGACY_NAME = DEFAULT_INPUT.replace("\\", "/").rsplit("/", 1)[-1]
+OTHER_NAME = "GLC 수익정리(2024)프로그램용.xlsx"
+
+
+@pytest.fixture(scope="module")
+def workbooks(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("sales")
+    rng = random.Random(7)
+    legacy, other = str(tmp / LEGACY_NAME), str(tmp / OTHER_NAME)
+    make_workbook(legacy, 2025, 20, rng)
+    make_workbook(other, 2024, 20, rng)
+    return legacy, other
+
+
+def test_source_prefix_depends_on_file_name_only():
+    """기본(2025) 통합문서는 기존 "1월!R6" 형식, 그 외는 파일명 접두"""
+    assert source_prefix(LEGACY_NAME) == ""
+    assert source_prefix("/data/" + OTHER_NAME) == "GLC 수익정리(2024)프로그램용:"
+
+
+def test_sheet_ids_same_alone_and_in_directory_run(workbooks):
+    legacy, other = workbooks
+    alone, _ = plan_jobs([legacy])
+    together, _ = plan_jobs([other, legacy])
+    assert [sid for _, _, sid in alone] == [sid for p, _, sid in together if p == legacy]
+    assert all(sid.startswith("GLC 수익정리(2024)프로그램용:") for p, _, sid in together if p == other)
+
+
+def test_idempotency_keys_stable_across_runs(workbooks):
+    """단독 변환과 여러 통합문서 변환에서 같은 행 = 같은 idempotencyKey"""
+    legacy, other = workbooks
+    alone = convert([legacy], workers=1)[0]
+    together = convert([other, legacy], workers=1)[0]
+    keys_alone = {r["sourceRowId"]: r["idempotencyKey"] for r in alone}
+    keys_together = {r["sourceRowId"]: r["idempotencyKey"] for r in together}
+    assert keys_alone
+    assert all(keys_together.get(rid) == key for rid, key in keys_alone.items())
+    assert all("!R" in rid and ":" not in rid for rid in keys_alone)
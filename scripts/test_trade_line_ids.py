@@ -0,0 +1,31 @@
+from convert_trade_excel import TradeConversion
+
+
+def row(sell_target="", note="", source="", sell_channel="", qty=1):
+    # 0 날짜, 1 업체명, 2 품번, 3 상품명, 4 수량, 9 구매가, 12 판매처, 13 내구매처, 14 비고, 15 출처
+    return ("2025-01-05", sell_target, "p-1", "품목", qty, None, None, None, None, 1000,
+            None, None, sell_channel, "구매처", note, source)
+
+
+def convert(rows, old_lines=None):
+    conversion = TradeConversion("unused.xlsx", old_lines=old_lines, now="2025-01-01T00:00:00")
+    records = list(conversion._records(rows))
+    return conversion, records
+
+
+def test_suffix_only_for_identical_rows():
+    _, records = convert([row("고객A"), row("고객B"), row("고객A"), row("고객A", note="반품")])
+    ids = [r["id"] for r in records]
+    assert len(set(ids)) == 4
+    assert ids[2] == ids[0] + "-2"
+    assert all("-" not in i[len("line-"):] for i in (ids[1], ids[3]))
+
+
+def test_reordering_rows_gives_empty_delta():
+    """납품처/비고/출처만 다른 행을 맞바꿔도 id·delta 그대로"""
+    rows = [row("고객A"), row("고객B"), row(source="견적"), row(sell_channel="쿠팡"), row("고객A")]
+    first, _ = convert(rows)
+    second, records = convert(list(reversed(rows)), first.lines)
+    assert [second.delta_entry(r) for r in records] == [None] * len(rows)
+    assert list(second.removed_entries()) == []
+    assert second.lines == first.lines
@@ -0,0 +1,245 @@
+"""
+경량 XLSX 셀 리더 — openpyxl read_only 대체 엔진 (변환 스크립트 --engine fast)
+
+openpyxl은 셀마다 파서 dict·셀 객체·디스크립터 검증을 거쳐 행 단위 처리가 느림.
+여기서는 zip 안의 시트 XML을 ElementTree 풀 파서(iterparse, C expat)로 훑으면서 행이 끝날 때마다
+값 튜플만 만든다. 공유 문자열은 통합문서당 1회 적재, 날짜 서식 스타일은 styles.xml에서 판별.
+
+openpyxl(read_only=True, data_only=True)과 같은 결과가 나오도록 맞춘 규칙:
+  - 행 범위: <dimension> 기준 (중간에 빠진 행은 None 행으로 채움, dimension 밖 행은 버림)
+  - 행 폭: max_col 또는 dimension 열 수 (없으면 행의 마지막 셀까지)
+  - 값: 숫자 int/float, 날짜 서식 숫자 → datetime/time/timedelta (1900/1904 기준일),
+        공유/인라인 문자열, bool, 오류 문자열 ("#N/A"), 수식은 캐시된 값
+  - 날짜 서식 판별·시리얼 변환은 openpyxl 함수 그대로 사용
+max_col 밖의 셀은 값 변환(공유 문자열 조회·날짜 변환)을 하지 않음.
+
+사용:
+  wb = open_workbook(path, engine="fast")   # 또는 "openpyxl"
+  for row in wb["1월"].iter_rows(min_row=6, max_col=12, values_only=True): ...
+  wb.close()
+"""
+import zipfile
+import xml.etree.ElementTree as ET
+
+ENGINES = ("openpyxl", "fast")
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_ROW = _NS + "row"
+_CELL = _NS + "c"
+_VALUE = _NS + "v"
+_TEXT = _NS + "t"
+_RUN = _NS + "r"
+_INLINE = _NS + "is"
+_DIMENSION = _NS + "dimension"
+_SHARED = _NS + "si"
+_CHUNK = 1 << 16
+
+
+def open_workbook(path, engine="openpyxl"):
+    """엔진별 읽기 전용 통합문서 (둘 다 wb[시트명].iter_rows(values_only=True) / wb.close())"""
+    if engine == "fast":
+        return XlsxWorkbook(path)
+    if engine == "openpyxl":
+        import openpyxl
+        return openpyxl.load_workbook(path, read_only=True, data_only=True)
+    raise ValueError(f"지원하지 않는 엔진: {engine} ({', '.join(ENGINES)})")
+
+
+def sheet_parts(zf):
+    """시트명 → zip 내 XML 경로 (workbook.xml + rels)"""
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels:
+        target = rel.get("Target", "")
+        targets[rel.get("Id")] = target.lstrip("/") if target.startswith("/") else "xl/" + target
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    return {sheet.get("name"): targets.get(sheet.get(_REL_NS + "id"))
+            for sheet in workbook.iter(_NS + "sheet")}
+
+
+def _text(node):
+    """<si>/<is> 텍스트 = 직속 <t> + 서식 run의 <t> (윗주 rPh 제외, openpyxl Text.content와 동일)"""
+    parts = []
+    for child in node:
+        if child.tag == _TEXT:
+            parts.append(child.text or "")
+        elif child.tag == _RUN:
+            t = child.find(_TEXT)
+            if t is not None:
+                parts.append(t.text or "")
+    return "".join(parts)
+
+
+def _column_index(letters, _cache={}):
+    index = _cache.get(letters)
+    if index is None:
+        index = 0
+        for ch in letters:
+            index = index * 26 + ord(ch) - 64
+        _cache[letters] = index
+    return index
+
+
+def _boundaries(ref):
+    """"A1:L1505" → (min_col, min_row, max_col, max_row)"""
+    from openpyxl.utils.cell import range_boundaries
+    return range_boundaries(ref)
+
+
+def _cast_number(text):
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+class XlsxWorkbook:
+    def __init__(self, path):
+        self.path = path
+        self._zf = zipfile.ZipFile(path)
+        self._parts = sheet_parts(self._zf)
+        self.sheetnames = list(self._parts)
+        self._strings = None
+        self._load_styles()
+
+    def _load_styles(self):
+        from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+        from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+        workbook = ET.fromstring(self._zf.read("xl/workbook.xml"))
+        pr = workbook.find(_NS + "workbookPr")
+        date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        self.date_styles, self.timedelta_styles = set(), set()
+        if "xl/styles.xml" not in self._zf.namelist():
+            return
+        root = ET.fromstring(self._zf.read("xl/styles.xml"))
+        custom = {int(f.get("numFmtId")): f.get("formatCode", "") for f in root.iter(_NS + "numFmt")}
+        xfs = root.find(_NS + "cellXfs")
+        for idx, xf in enumerate(xfs if xfs is not None else []):
+            fmt_id = int(xf.get("numFmtId", 0))
+            fmt = custom[fmt_id] if fmt_id in custom else BUILTIN_FORMATS.get(fmt_id)
+            if is_date_format(fmt):
+                self.date_styles.add(idx)
+            if is_timedelta_format(fmt):
+                self.timedelta_styles.add(idx)
+
+    @property
+    def shared_strings(self):
+        if self._strings is None:
+            self._strings = []
+            if "xl/sharedStrings.xml" in self._zf.namelist():
+                with self._zf.open("xl/sharedStrings.xml") as src:
+                    for _, node in ET.iterparse(src):
+                        if node.tag == _SHARED:
+                            self._strings.append(_text(node).replace("x005F_", ""))
+                            node.clear()
+        return self._strings
+
+    def __getitem__(self, name):
+        if name not in self._parts:
+            raise KeyError(f"Worksheet {name} does not exist.")
+        return XlsxSheet(self, name, self._parts[name])
+
+    def close(self):
+        self._zf.close()
+
+
+class XlsxSheet:
+    def __init__(self, workbook, title, part):
+        self.parent = workbook
+        self.title = title
+        self._part = part
+
+    def _value(self, c):
+        kind = c.get("t", "n")
+        if kind == "inlineStr":
+            node = c.find(_INLINE)
+            return _text(node) if node is not None else None
+        text = c.findtext(_VALUE) or None
+        if text is None:
+            return None
+        if kind == "n":
+            value = _cast_number(text)
+            style = c.get("s")
+            if style and int(style) in self.parent.date_styles:
+                from openpyxl.utils.datetime import from_excel
+                try:
+                    return from_excel(value, self.parent.epoch,
+                                      timedelta=int(style) in self.parent.timedelta_styles)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if kind == "s":
+            return self.parent.shared_strings[int(text)]
+        if kind == "b":
+            return bool(int(text))
+        if kind == "d":
+            from openpyxl.utils.datetime import from_ISO8601
+            return from_ISO8601(text)
+        return text  # "str" (수식 문자열 결과), "e" (오류)
+
+    def iter_rows(self, min_row=1, max_row=None, max_col=None, values_only=True):
+        """openpyxl ReadOnlyWorksheet.iter_rows(values_only=True)와 같은 행/값 (min_col은 1 고정)"""
+        if not values_only:
+            raise ValueError("fast 엔진은 values_only=True만 지원")
+        strings = self.parent.shared_strings  # 첫 행 전에 적재 (행 처리 중 지연 없음)
+        empty_row = (None,) * max_col if max_col else ()
+        counter = min_row
+        row_idx = 0
+        # iterparse와 같은 end 이벤트 — XMLPullParser를 직접 돌려 이벤트당 generator 단계 1개 절약
+        parser = ET.XMLPullParser(("end",))
+        with self.parent._zf.open(self._part) as src:
+            while True:
+                chunk = src.read(_CHUNK)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                for _, el in parser.read_events():
+                    tag = el.tag
+                    if tag != _ROW:
+                        if tag == _DIMENSION:
+                            _, _, dim_col, dim_row = _boundaries(el.get("ref"))
+                            max_col = max_col or dim_col
+                            max_row = max_row or dim_row
+                            empty_row = (None,) * max_col if max_col else ()
+                        continue
+                    r = el.get("r")
+                    row_idx = int(float(r)) if r else row_idx + 1
+                    if max_row is not None and row_idx > max_row:
+                        return
+                    if row_idx < min_row:
+                        el.clear()
+                        continue
+                    while counter < row_idx:  # 빠진 행
+                        counter += 1
+                        yield empty_row
+                    counter += 1
+                    yield self._row(el, max_col, strings)
+                    el.clear()
+        # 마지막 행 뒤는 채우지 않음 (openpyxl read_only와 동일)
+
+    def _row(self, el, max_col, strings):
+        values = {}
+        col = 0
+        date_styles = self.parent.date_styles
+        for c in el:
+            ref = c.get("r")
+            col = _column_index(ref.rstrip("0123456789")) if ref else col + 1
+            if max_col and col > max_col:
+                break  # 셀은 열 순서 → 이후 셀도 범위 밖 (값 변환 생략)
+            # 가장 흔한 공유 문자열 / 일반 숫자는 바로 처리
+            kind = c.get("t")
+            if kind == "s":
+                text = c.findtext(_VALUE)
+                values[col] = strings[int(text)] if text else None
+            elif kind is None and not (c.get("s") and int(c.get("s")) in date_styles):
+                text = c.findtext(_VALUE)
+                values[col] = _cast_number(text) if text else None
+            else:
+                values[col] = self._value(c)
+        width = max_col or col
+        if not width:
+            return ()
+        return tuple(values.get(i) for i in range(1, width + 1))
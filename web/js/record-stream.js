@@ -0,0 +1,103 @@
+/**
+ * GoLab — 변환 결과 레코드 스트리밍 로더 (scripts/record_io.py 출력 형식과 짝)
+ *
+ * 지원 형식:
+ *   JSON 배열 (.json, 기존 형식)   — 전체 수신 후 JSON.parse
+ *   NDJSON (.ndjson)               — 한 줄에 1건, 수신하는 대로 파싱
+ *   gzip 압축 (.ndjson.gz 등)      — 매직 바이트(1f 8b)로 판별 → DecompressionStream
+ *     (서버가 Content-Encoding: gzip으로 보내 브라우저가 이미 풀었으면 그대로 처리)
+ *
+ * 사용:
+ *   await GoLabRecordStream.forEach(url, rec => { ... });   // 1건씩 콜백
+ *   const records = await GoLabRecordStream.load(url);     // 배열로
+ */
+window.GoLabRecordStream = (function () {
+  "use strict";
+
+  /** 첫 청크를 들여다본 뒤 그대로 이어지는 스트림 반환 → [첫 청크, 스트림] */
+  async function peek(body) {
+    var reader = body.getReader();
+    var first = await reader.read();
+    var stream = new ReadableStream({
+      start: function (controller) {
+        if (first.done) controller.close();
+        else controller.enqueue(first.value);
+      },
+      pull: async function (controller) {
+        var next = await reader.read();
+        if (next.done) controller.close();
+        else controller.enqueue(next.value);
+      },
+      cancel: function (reason) { return reader.cancel(reason); }
+    });
+    return [first.value || new Uint8Array(0), stream];
+  }
+
+  async function textStream(url) {
+    var res = await fetch(url);
+    if (!res.ok) throw new Error(url + " HTTP " + res.status);
+    var peeked = await peek(res.body);
+    var head = peeked[0], stream = peeked[1];
+    if (head.length >= 2 && head[0] === 0x1f && head[1] === 0x8b) {
+      if (typeof DecompressionStream === "undefined") {
+        throw new Error("이 브라우저는 gzip 해제(DecompressionStream)를 지원하지 않음 — .json/.ndjson 사용");
+      }
+      stream = stream.pipeThrough(new DecompressionStream("gzip"));
+    }
+    return stream.pipeThrough(new TextDecoderStream("utf-8"));
+  }
+
+  /** 레코드 1건씩 fn(rec, index) 호출 → 총 건수 */
+  async function forEach(url, fn) {
+    var reader = (await textStream(url)).getReader();
+    var buf = "";
+    var count = 0;
+    var isArray = null;
+    var lineNo = 0;
+
+    function emitLine(line) {
+      lineNo++;
+      if (!line.trim()) return;
+      var rec;
+      try {
+        rec = JSON.parse(line);
+      } catch (e) {
+        throw new Error(url + ":" + lineNo + " NDJSON 파싱 실패 — " + e.message);
+      }
+      fn(rec, count++);
+    }
+
+    for (;;) {
+      var chunk = await reader.read();
+      if (chunk.done) break;
+      buf += chunk.value;
+      if (isArray === null) {
+        var trimmed = buf.replace(/^[\s﻿]+/, "");
+        if (!trimmed) continue;
+        isArray = trimmed[0] === "[";
+      }
+      if (isArray) continue;  // JSON 배열은 끝까지 받은 뒤 파싱
+      var nl = buf.lastIndexOf("\n");
+      if (nl < 0) continue;
+      buf.slice(0, nl).split("\n").forEach(emitLine);
+      buf = buf.slice(nl + 1);
+    }
+
+    if (isArray) {
+      var records = JSON.parse(buf.replace(/^﻿/, ""));
+      if (!Array.isArray(records)) throw new Error(url + ": JSON 배열이 아님");
+      records.forEach(function (rec) { fn(rec, count++); });
+    } else if (buf) {
+      emitLine(buf);
+    }
+    return count;
+  }
+
+  async function load(url) {
+    var records = [];
+    await forEach(url, function (rec) { records.push(rec); });
+    return records;
+  }
+
+  return { forEach: forEach, load: load };
+})();